@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the fetch stages (fetch_all_news, fetch_pypi_stats and
+the GitHub topic search)
+Runs each stage in a fresh process against the local replay server and reports
+per-source latency, stage wall time, CPU time and peak RSS.
+
+Usage:
+  python benchmarks/bench_fetch.py --sources 100 --packages 200 --latency 50 --jitter 20
+  python benchmarks/bench_fetch.py --budgets benchmarks/budgets.json   # exit 1 on regression
+"""
+import os
+import io
+import sys
+import json
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+import contextlib
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+SCRIPTS_DIR = BENCH_DIR.parent / "scripts"
+
+STAGES = ("news", "pypi", "github")
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _peak_rss_mb():
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _measure(run):
+    """Run a stage with its output silenced; returns (result, wall, cpu)"""
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = run()
+    return result, time.perf_counter() - wall_start, time.process_time() - cpu_start
+
+
+def run_news_stage(base_url, n_sources, workdir):
+    """Child process: fetch_all_news over n_sources stand-in sources"""
+    sources = [
+        {"name": "Hacker News", "type": "api", "url": f"{base_url}/hn?query=AI"},
+        {"name": "arXiv", "type": "arxiv", "limit": 100,
+         "url": f"{base_url}/arxiv?search_query=cat:cs.AI&sortBy=submittedDate"},
+    ]
+    sources += [
+        {"name": f"Feed {i}", "type": "rss", "url": f"{base_url}/rss/{i}"}
+        for i in range(max(0, n_sources - len(sources)))
+    ]
+    sources_file = Path(workdir) / "sources.json"
+    sources_file.write_text(json.dumps({
+        "sources": sources,
+        # The stand-in is one host; do not let politeness limits dominate the numbers
+        "hosts": {"127.0.0.1": {"rate": 10000, "burst": 10000}},
+    }))
+    os.environ["NEWS_SOURCES_FILE"] = str(sources_file)
+
+    import fetch_news
+
+    latencies = {}
+    for source_type, adapter in list(fetch_news.SOURCE_ADAPTERS.items()):
+        def timed(url, source_name, *args, _adapter=adapter, **kwargs):
+            start = time.perf_counter()
+            try:
+                return _adapter(url, source_name, *args, **kwargs)
+            finally:
+                latencies[source_name] = time.perf_counter() - start
+        fetch_news.SOURCE_ADAPTERS[source_type] = timed
+
+    articles, wall, cpu = _measure(fetch_news.fetch_all_news)
+    return {
+        "items": len(articles),
+        "sources": len(sources),
+        "completed_sources": len(latencies),
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "latency_p50_s": _percentile(list(latencies.values()), 0.5),
+        "latency_p95_s": _percentile(list(latencies.values()), 0.95),
+        "latency_max_s": max(latencies.values(), default=0.0),
+        "per_source_s": latencies,
+    }
+
+
+def run_pypi_stage(base_url, n_packages, workdir):
+    """Child process: fetch_pypi_stats over n_packages stand-in packages"""
+    os.environ["PYPI_API_BASE"] = f"{base_url}/pypi"
+    os.environ["PYPISTATS_API_BASE"] = f"{base_url}/pypistats/api"
+
+    import analyze_packages
+    from http_client import set_host_rate
+
+    set_host_rate("127.0.0.1", 10000, 10000)
+
+    latencies = []
+    original_get = analyze_packages.cached_get
+
+    def timed_get(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_get(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    analyze_packages.cached_get = timed_get
+
+    packages = [f"stand-in-package-{i}" for i in range(n_packages)]
+    result, wall, cpu = _measure(lambda: analyze_packages.fetch_pypi_stats(packages))
+    return {
+        "items": len(result),
+        "requests": len(latencies),
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "latency_p50_s": _percentile(latencies, 0.5),
+        "latency_p95_s": _percentile(latencies, 0.95),
+        "latency_max_s": max(latencies, default=0.0),
+    }
+
+
+def run_github_stage(base_url, workdir):
+    """Child process: paginated topic search against the stand-in search API"""
+    os.environ["GITHUB_API_BASE"] = f"{base_url}/github"
+    os.environ.setdefault("GITHUB_TOKEN", "bench-token")
+
+    import github_client
+    from http_client import set_host_rate
+
+    set_host_rate("127.0.0.1", 10000, 10000)
+
+    latencies = []
+    client = github_client.GitHubSearchClient()
+    original_page = client.search_page
+
+    def timed_page(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return original_page(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - start)
+
+    client.search_page = timed_page
+
+    queries = [f"topic:{topic} stars:>1000" for topic in github_client.GITHUB_SEARCH_TOPICS]
+    results, wall, cpu = _measure(lambda: github_client.merge_repositories(client.search(queries)))
+    return {
+        "items": len(results),
+        "requests": client.requests,
+        "not_modified": client.not_modified,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "latency_p50_s": _percentile(latencies, 0.5),
+        "latency_p95_s": _percentile(latencies, 0.95),
+        "latency_max_s": max(latencies, default=0.0),
+    }
+
+
+def child_main(args):
+    workdir = tempfile.mkdtemp(prefix="bench-fetch-")
+    os.chdir(workdir)
+    os.environ["ARTICLE_DB"] = str(Path(workdir) / "articles.db")
+    if not args.warm_cache:
+        os.environ["HTTP_CACHE"] = "off"
+    os.environ["HTTP_CACHE_DIR"] = str(Path(args.cache_dir or workdir) / "http_cache")
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+    rss_before = _peak_rss_mb()
+    if args.stage == "news":
+        result = run_news_stage(args.base_url, args.sources, workdir)
+    elif args.stage == "pypi":
+        result = run_pypi_stage(args.base_url, args.packages, workdir)
+    else:
+        result = run_github_stage(args.base_url, workdir)
+    result["peak_rss_mb"] = _peak_rss_mb()
+    result["peak_rss_delta_mb"] = result["peak_rss_mb"] - rss_before
+
+    print(json.dumps(result))
+
+
+def start_server(args):
+    """Launch the replay server in its own process so it does not skew CPU/RSS"""
+    command = [
+        sys.executable, str(BENCH_DIR / "feed_replay_server.py"), "serve", "--port", "0",
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--error-rate", str(args.error_rate), "--feed-size", str(args.feed_size),
+        "--releases", str(args.releases), "--seed", str(args.seed),
+    ]
+    if args.fixtures:
+        command += ["--fixtures", args.fixtures]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    banner = server.stdout.readline()
+    base_url = banner.strip().split()[-1]
+    return server, base_url
+
+
+def run_stage(stage, base_url, args, cache_dir=None):
+    command = [
+        sys.executable, __file__, "--child", "--stage", stage, "--base-url", base_url,
+        "--sources", str(args.sources), "--packages", str(args.packages),
+    ]
+    if args.warm_cache:
+        command += ["--warm-cache", "--cache-dir", cache_dir]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def check_budgets(results, budgets_file):
+    """Compare results with {"stage": {"metric": max_value}}; returns a list of violations"""
+    with open(budgets_file) as f:
+        budgets = json.load(f)
+
+    violations = []
+    for stage, limits in budgets.items():
+        for metric, limit in limits.items():
+            value = results.get(stage, {}).get(metric)
+            if value is not None and value > limit:
+                violations.append(f"{stage}.{metric} = {value:.3f} > {limit}")
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stage", choices=STAGES + ("all",), default="all")
+    parser.add_argument("--sources", type=int, default=100, help="News sources to fetch")
+    parser.add_argument("--packages", type=int, default=200, help="PyPI packages to fetch")
+    parser.add_argument("--latency", type=float, default=50, help="Mean server latency in ms")
+    parser.add_argument("--jitter", type=float, default=20, help="Latency jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--feed-size", type=int, default=20, help="Items per feed")
+    parser.add_argument("--releases", type=int, default=200, help="Release entries per PyPI payload")
+    parser.add_argument("--fixtures", default=None, help="Replay recorded payloads from this directory")
+    parser.add_argument("--warm-cache", action="store_true", help="Run each stage twice, reporting the revalidating rerun")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--budgets", help="JSON budgets file; exit 1 if any metric exceeds its budget")
+    # Internal: run one stage inside a fresh process
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    parser.add_argument("--cache-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args)
+        return
+
+    stages = STAGES if args.stage == "all" else (args.stage,)
+
+    print("=" * 70)
+    print("⏱️  Fetch Stage Benchmark (offline)")
+    print("=" * 70)
+    print(f"   Sources: {args.sources}, packages: {args.packages}")
+    print(f"   Latency: {args.latency}±{args.jitter} ms, errors: {args.error_rate:.0%}")
+
+    server, base_url = start_server(args)
+    results = {}
+    try:
+        for stage in stages:
+            if args.warm_cache:
+                cache_dir = tempfile.mkdtemp(prefix="bench-cache-")
+                run_stage(stage, base_url, args, cache_dir)
+                results[stage] = run_stage(stage, base_url, args, cache_dir)
+            else:
+                results[stage] = run_stage(stage, base_url, args)
+    finally:
+        server.terminate()
+        server.wait()
+
+    print("-" * 70)
+    print(f"{'stage':<8}{'items':>7}{'wall s':>9}{'cpu s':>8}{'p50 s':>8}{'p95 s':>8}{'max s':>8}{'rss MB':>9}")
+    for stage, r in results.items():
+        print(
+            f"{stage:<8}{r['items']:>7}{r['wall_s']:>9.2f}{r['cpu_s']:>8.2f}"
+            f"{r['latency_p50_s']:>8.3f}{r['latency_p95_s']:>8.3f}{r['latency_max_s']:>8.3f}"
+            f"{r['peak_rss_mb']:>9.1f}"
+        )
+    print("-" * 70)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+    if args.budgets:
+        violations = check_budgets(results, args.budgets)
+        if violations:
+            print("❌ Performance budget exceeded:")
+            for violation in violations:
+                print(f"   {violation}")
+            sys.exit(1)
+        print("✅ All metrics within budget")
+
+
+if __name__ == "__main__":
+    main()
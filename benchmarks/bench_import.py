@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark for the script stage
+Times importing llm_client / generate_script in fresh interpreters, against
+building the LLM eagerly (what importing llm_client used to cost).
+
+Usage:
+  python benchmarks/bench_import.py --runs 5
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+# Each case runs in its own interpreter and prints its timings as JSON
+CHILD = """
+import json, sys, time
+sys.path.insert(0, {scripts!r})
+start = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+timings = {{"import_s": imported - start, "crewai_loaded": "crewai" in sys.modules}}
+if {build}:
+    import llm_client
+    llm_client.get_llm()
+    built = time.perf_counter()
+    llm_client.get_llm()
+    timings["first_get_llm_s"] = built - imported
+    timings["second_get_llm_s"] = time.perf_counter() - built
+timings["total_s"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+CASES = {
+    "import llm_client": ("llm_client", False),
+    "import generate_script": ("generate_script", False),
+    "import + get_llm() (eager)": ("llm_client", True),
+}
+
+
+def run_case(module, build, runs, workdir):
+    code = CHILD.format(scripts=str(SCRIPTS_DIR), module=module, build=build)
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", code], cwd=workdir, capture_output=True, text=True, check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    summary = {key: statistics.median(s[key] for s in samples) for key in samples[0] if key != "crewai_loaded"}
+    summary["crewai_loaded"] = samples[0]["crewai_loaded"]
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per case (median reported)")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    os.environ.setdefault("NEWS_LLM_MODEL", "ollama/gemma:2b")
+    workdir = tempfile.mkdtemp(prefix="bench-import-")
+
+    print("=" * 70)
+    print(f"⏱️  Script stage cold start ({args.runs} runs per case, median)")
+    print("=" * 70)
+
+    results = {}
+    for name, (module, build) in CASES.items():
+        results[name] = r = run_case(module, build, args.runs, workdir)
+        line = f"   {name:<30} {r['total_s'] * 1000:>8.1f} ms"
+        if "second_get_llm_s" in r:
+            line += f"  (get_llm: {r['first_get_llm_s'] * 1000:.1f} ms, memoized: {r['second_get_llm_s'] * 1e6:.0f} µs)"
+        if not r["crewai_loaded"] and "first_get_llm_s" not in r:
+            line += "  crewai not imported"
+        print(line)
+
+    eager = results["import + get_llm() (eager)"]["total_s"]
+    lazy = results["import llm_client"]["total_s"]
+    if lazy:
+        print(f"   ⚡ Lazy import is {eager / lazy:.0f}x faster than the eager build")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the LLM router
+Runs the same calls against one stand-in provider and against the router over
+several stand-ins (one with tail latency, one steady, optionally one down),
+and reports latency percentiles and failed calls for each.
+
+Usage:
+  python benchmarks/bench_llm_router.py --calls 40 --slow-rate 0.1
+  python benchmarks/bench_llm_router.py --outage   # primary provider returns 503s
+"""
+import sys
+import time
+import argparse
+import threading
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent / "scripts"))
+
+from llm_stub_server import make_server
+
+
+def _percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def start_stub(**options):
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def build_llm(name, base_url):
+    from crewai import LLM
+
+    # max_retries=0: failover is the router's job, not the SDK's
+    return LLM(model=f"openai/{name}", base_url=base_url, api_key="stub", max_retries=0, temperature=0.7)
+
+
+def run_calls(llm, calls):
+    latencies, failures = [], 0
+    for i in range(calls):
+        start = time.perf_counter()
+        try:
+            llm.call(f"Summarize story {i} for today's episode")
+        except Exception:
+            failures += 1
+            continue
+        latencies.append(time.perf_counter() - start)
+    return {
+        "calls": calls,
+        "failures": failures,
+        "p50_s": _percentile(latencies, 0.5),
+        "p95_s": _percentile(latencies, 0.95),
+        "max_s": max(latencies, default=0.0),
+        "total_s": sum(latencies),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=40)
+    parser.add_argument("--latency", type=float, default=300, help="Primary provider latency in ms")
+    parser.add_argument("--slow-rate", type=float, default=0.1, help="Fraction of primary calls hitting the tail")
+    parser.add_argument("--slow-latency", type=float, default=4000, help="Primary tail latency in ms")
+    parser.add_argument("--backup-latency", type=float, default=600, help="Backup provider latency in ms")
+    parser.add_argument("--outage", action="store_true", help="Primary answers every call with 503")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from llm_router import LLMRouter
+
+    _, primary_url = start_stub(
+        latency=args.latency, jitter=args.latency / 5, slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency, error_rate=1.0 if args.outage else 0.0, seed=args.seed,
+    )
+    _, backup_url = start_stub(latency=args.backup_latency, jitter=args.backup_latency / 5)
+
+    print("=" * 70)
+    print("🔀 LLM router benchmark (offline stand-ins)")
+    print("=" * 70)
+    print(f"   Primary: {args.latency:.0f} ms, {args.slow_rate:.0%} at {args.slow_latency:.0f} ms"
+          + (", DOWN" if args.outage else ""))
+    print(f"   Backup:  {args.backup_latency:.0f} ms")
+
+    results = {}
+    results["primary only"] = run_calls(build_llm("primary", primary_url), args.calls)
+
+    router = LLMRouter.over(
+        [build_llm("primary", primary_url), build_llm("backup", backup_url)],
+        hedge_after=args.latency * 3 / 1000,
+    )
+    results["router (hedged)"] = run_calls(router, args.calls)
+    # Let losing hedges finish so their latencies land in the report
+    router.executor.shutdown(wait=True)
+
+    print("-" * 70)
+    print(f"{'mode':<18}{'calls':>7}{'failed':>8}{'p50 s':>8}{'p95 s':>8}{'max s':>8}{'total s':>9}")
+    for mode, r in results.items():
+        print(f"{mode:<18}{r['calls']:>7}{r['failures']:>8}{r['p50_s']:>8.2f}{r['p95_s']:>8.2f}"
+              f"{r['max_s']:>8.2f}{r['total_s']:>9.1f}")
+    print("-" * 70)
+    for model, stats in router.report().items():
+        print(f"   {model}: {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for the script stage (generate_script.py)
+Runs the full crew in fresh processes against the LLM stand-in, replaying
+recorded completions when fixtures are given, and splits the crew's wall time
+into model time (when at least one LLM call was in flight) and orchestration
+overhead (CrewAI, agents, prompts, parsing, everything else).
+
+Record fixtures once against a real model:
+  NEWS_LLM_RECORD=fixtures/episode python scripts/generate_script.py --no-cache
+
+Usage:
+  python benchmarks/bench_script_stage.py --fixtures fixtures/episode --runs 3 --tokens-per-second 40
+  python benchmarks/bench_script_stage.py --latency 0 --tokens-per-second 100000   # overhead only
+  python benchmarks/bench_script_stage.py --fixtures fixtures/episode -- --variants full,short
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).parent
+SCRIPTS_DIR = BENCH_DIR.parent / "scripts"
+sys.path.insert(0, str(BENCH_DIR))
+
+from bench_fetch import check_budgets
+
+INPUT_FILES = ("latest_news.json", "trending_packages.json")
+
+
+def start_stub(args):
+    """Launch the LLM stand-in in its own process so it does not skew the measurements"""
+    command = [
+        sys.executable, str(BENCH_DIR / "llm_stub_server.py"), "--port", "0",
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--tokens-per-second", str(args.tokens_per_second), "--model", "stub",
+    ]
+    if args.fixtures:
+        command += ["--fixtures", args.fixtures]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, text=True)
+    base_url = server.stdout.readline().strip().split()[-1]
+    return server, base_url[:-3] if base_url.endswith("/v1") else base_url
+
+
+def stub_stats(base_url):
+    import urllib.request
+
+    with urllib.request.urlopen(f"{base_url}/stub/stats", timeout=5) as response:
+        return json.load(response)
+
+
+def model_busy_seconds(calls):
+    """Length of the union of LLM call intervals (parallel calls count once)"""
+    intervals = sorted(
+        (start, start + call["wall_s"])
+        for call in calls
+        for start in [datetime.fromisoformat(call["started_at"]).timestamp()]
+    )
+    busy, current_start, current_end = 0.0, None, None
+    for start, end in intervals:
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                busy += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        busy += current_end - current_start
+    return busy
+
+
+def run_once(base_url, data_dir, extra_args, timeout):
+    """One generate_script run in a scratch directory; returns its timings"""
+    workdir = Path(tempfile.mkdtemp(prefix="bench-script-"))
+    (workdir / "data").mkdir()
+    for name in INPUT_FILES:
+        if (data_dir / name).exists():
+            shutil.copy2(data_dir / name, workdir / "data" / name)
+
+    env = {
+        **os.environ,
+        "OLLAMA_HOST": base_url,
+        "NEWS_LLM_MODEL": "ollama/stub",
+        "NEWS_LLM_PROVIDERS": "",
+        "NEWS_LLM_RECORD": "",
+        # Every run must reach the model; the section store lives in the scratch dir
+        "NEWS_LLM_CACHE": "off",
+        "NEWS_LLM_METRICS": "on",
+        "CREWAI_TRACING_ENABLED": "false",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+    }
+    before = stub_stats(base_url)
+    start = time.perf_counter()
+    with open(workdir / "run.log", "w") as log:
+        completed = subprocess.run(
+            [sys.executable, str(SCRIPTS_DIR / "generate_script.py"), *extra_args],
+            cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT, timeout=timeout,
+        )
+    process_s = time.perf_counter() - start
+    if completed.returncode != 0:
+        raise RuntimeError(f"generate_script failed (exit {completed.returncode}); see {workdir / 'run.log'}")
+    after = stub_stats(base_url)
+
+    metadata = json.loads((workdir / "output" / "episode_metadata.json").read_text())
+    calls = json.loads((workdir / "output" / "llm_trace.json").read_text())["calls"]
+    crew_s = metadata["crew_seconds"]
+    model_s = model_busy_seconds(calls)
+    shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "process_s": process_s,
+        "crew_s": crew_s,
+        "model_s": model_s,
+        "orchestration_s": max(0.0, crew_s - model_s),
+        "outside_crew_s": process_s - crew_s,
+        "llm_calls": len(calls),
+        "model_call_s": sum(c["wall_s"] for c in calls),
+        "replay_hits": after["replay_hits"] - before["replay_hits"],
+        "replay_misses": after["replay_misses"] - before["replay_misses"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", default=None, help="Recording directory (NEWS_LLM_RECORD) to replay")
+    parser.add_argument("--data-dir", default=None, help="Input data directory (default: <fixtures>/data, else data)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0, help="Stand-in time to first token in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Latency jitter in ms")
+    parser.add_argument("--tokens-per-second", type=float, default=50, help="Stand-in streaming speed")
+    parser.add_argument("--timeout", type=float, default=900, help="Seconds allowed per run")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--budgets", help='JSON budgets file ({"script": {"orchestration_s": ...}}); exit 1 on regression')
+    parser.add_argument("script_args", nargs="*", help="Arguments for generate_script.py (after --)")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data_dir or (Path(args.fixtures) / "data" if args.fixtures else "data"))
+
+    print("=" * 70)
+    print("⏱️  Script Stage Benchmark (offline)")
+    print("=" * 70)
+    print(f"   Replay: {args.fixtures or 'canned stand-in text'}, inputs: {data_dir}")
+    print(f"   Model: {args.latency:.0f}±{args.jitter:.0f} ms to first token, {args.tokens_per_second:g} tok/s")
+
+    server, base_url = start_stub(args)
+    runs = []
+    try:
+        for i in range(args.runs):
+            runs.append(run_once(base_url, data_dir, args.script_args, args.timeout))
+            r = runs[-1]
+            print(f"   Run {i + 1}: crew {r['crew_s']:.2f}s = model {r['model_s']:.2f}s "
+                  f"+ orchestration {r['orchestration_s']:.2f}s ({r['llm_calls']} calls)")
+    finally:
+        server.terminate()
+        server.wait()
+
+    def median(metric):
+        values = sorted(r[metric] for r in runs)
+        return values[len(values) // 2]
+
+    result = {metric: median(metric) for metric in runs[0]}
+    result["orchestration_per_call_s"] = result["orchestration_s"] / max(result["llm_calls"], 1)
+
+    print("-" * 70)
+    print(f"{'median of ' + str(len(runs)) + ' runs':<24}{'seconds':>10}")
+    for label, metric in (
+        ("process wall", "process_s"),
+        ("  outside the crew", "outside_crew_s"),
+        ("  crew wall", "crew_s"),
+        ("    model busy", "model_s"),
+        ("    orchestration", "orchestration_s"),
+        ("    per LLM call", "orchestration_per_call_s"),
+    ):
+        print(f"{label:<24}{result[metric]:>10.2f}")
+    print(f"{'LLM calls':<24}{result['llm_calls']:>10}")
+    if args.fixtures:
+        print(f"{'replayed / missed':<24}{result['replay_hits']:>6} / {result['replay_misses']}")
+    print("-" * 70)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"script": result, "runs": runs}, f, indent=2)
+        print(f"💾 Results saved to: {args.output}")
+
+    if args.budgets:
+        violations = check_budgets({"script": result}, args.budgets)
+        if violations:
+            print("❌ Performance budget exceeded:")
+            for violation in violations:
+                print(f"   {violation}")
+            sys.exit(1)
+        print("✅ All metrics within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Local stand-in server for the fetch stages
+Replays recorded (or synthesized) HN, arXiv, RSS, PyPI and GitHub payloads with
+configurable latency, jitter, error rate and feed size, so benchmarks need no network.
+
+Usage:
+  python benchmarks/feed_replay_server.py serve --port 8765 --latency 50 --jitter 20
+  python benchmarks/feed_replay_server.py record --out benchmarks/fixtures
+"""
+import sys
+import json
+import time
+import zlib
+import random
+import threading
+import hashlib
+import argparse
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Synthetic timestamps are relative to server start so bodies (and ETags) are stable
+EPOCH = datetime.now(timezone.utc).replace(microsecond=0)
+
+# Live endpoints captured by the record command
+RECORD_URLS = {
+    "hn.json": "https://hn.algolia.com/api/v1/search?tags=story&query=AI&hitsPerPage=20",
+    "arxiv.xml": "http://export.arxiv.org/api/query?search_query=cat:cs.AI&sortBy=submittedDate&sortOrder=descending&start=0&max_results=50",
+    "rss.xml": "https://techcrunch.com/category/artificial-intelligence/feed/",
+    "pypi.json": "https://pypi.org/pypi/transformers/json",
+    "github.json": "https://api.github.com/search/repositories?q=topic:machine-learning+stars:>1000&sort=stars&order=desc&per_page=30",
+}
+
+WORDS = (
+    "model agent open source language inference training dataset benchmark "
+    "python release startup funding research paper robotics vision chip cloud "
+    "reasoning safety policy developer framework library gpu transformer"
+).split()
+
+
+def _sentence(rng, n):
+    return " ".join(rng.choice(WORDS) for _ in range(n)).capitalize()
+
+
+def synth_hn(rng, size):
+    return json.dumps({"hits": [
+        {
+            "title": _sentence(rng, 8),
+            "url": f"https://news.example.com/{rng.getrandbits(40):x}",
+            "story_text": "<p>" + _sentence(rng, 60) + "</p>" if i % 3 == 0 else None,
+            "created_at": (EPOCH - timedelta(hours=rng.uniform(0, 48))).isoformat(),
+            "points": rng.randint(1, 800),
+        }
+        for i in range(size)
+    ]}).encode()
+
+
+def synth_arxiv(rng, start, count, total):
+    count = max(0, min(count, total - start))
+    entries = "".join(
+        f"<entry><id>http://arxiv.org/abs/2410.{start + i:05d}v1</id>"
+        f"<published>{(EPOCH - timedelta(hours=rng.uniform(0, 72))).strftime('%Y-%m-%dT%H:%M:%SZ')}</published>"
+        f"<title>{_sentence(rng, 10)}</title>"
+        f"<summary>{_sentence(rng, 180)}</summary></entry>"
+        for i in range(count)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<feed xmlns="http://www.w3.org/2005/Atom">'
+        f"<title>arXiv stand-in</title>{entries}</feed>"
+    ).encode()
+
+
+def synth_rss(rng, size):
+    items = "".join(
+        f"<item><title>{_sentence(rng, 9)}</title>"
+        f"<link>https://blog.example.com/{rng.getrandbits(40):x}?utm_source=rss</link>"
+        f"<pubDate>{(EPOCH - timedelta(hours=rng.uniform(0, 48))).strftime('%a, %d %b %Y %H:%M:%S +0000')}</pubDate>"
+        f"<description>&lt;div&gt;&lt;p&gt;{_sentence(rng, 120)}&lt;/p&gt;"
+        f"&lt;p&gt;{_sentence(rng, 120)}&lt;/p&gt;&lt;/div&gt;</description></item>"
+        for _ in range(size)
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Feed stand-in</title>{items}</channel></rss>"
+    ).encode()
+
+
+def synth_pypi(rng, name, releases):
+    return json.dumps({
+        "info": {
+            "name": name,
+            "version": f"{rng.randint(0, 5)}.{rng.randint(0, 30)}.{rng.randint(0, 9)}",
+            "summary": _sentence(rng, 10),
+            "author": "Stand-in Author",
+            "home_page": f"https://example.com/{name}",
+            "project_urls": {"Source": f"https://github.com/example/{name}"},
+            "requires_python": ">=3.9",
+            "license": "MIT",
+        },
+        # Real PyPI payloads are dominated by the release history
+        "releases": {
+            f"0.{i}.0": [{"filename": f"{name}-0.{i}.0.tar.gz", "size": rng.randint(1000, 10 ** 6),
+                          "digests": {"sha256": hashlib.sha256(f"{name}{i}".encode()).hexdigest()}}]
+            for i in range(releases)
+        },
+    }).encode()
+
+
+def synth_github(rng, query, page, per_page, total):
+    start = (page - 1) * per_page
+    count = max(0, min(per_page, total - start))
+    # Every third repo is shared by all queries, the rest are query-specific
+    owner = f"org{zlib.crc32(query.encode()) % 1000}"
+    return json.dumps({"total_count": total, "items": [
+        {
+            "name": f"repo-{start + i}",
+            "full_name": f"{'example' if (start + i) % 3 == 0 else owner}/repo-{start + i}",
+            "description": _sentence(rng, 12),
+            "stargazers_count": rng.randint(1000, 200000),
+            "html_url": f"https://github.com/{'example' if (start + i) % 3 == 0 else owner}/repo-{start + i}",
+            "language": "Python",
+            "topics": ["machine-learning", "artificial-intelligence"],
+        }
+        for i in range(count)
+    ]}).encode()
+
+
+class GitHubRateLimit:
+    """Fixed one-minute window like the search API; 304 responses are free"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.reset = int(time.time()) + 60
+        self._lock = threading.Lock()
+
+    def take(self, charge=True):
+        """Return (allowed, headers) for one request"""
+        with self._lock:
+            now = time.time()
+            if now >= self.reset:
+                self.used = 0
+                self.reset = int(now) + 60
+            allowed = self.used < self.limit
+            if allowed and charge:
+                self.used += 1
+            return allowed, {
+                "X-RateLimit-Limit": str(self.limit),
+                "X-RateLimit-Remaining": str(self.limit - self.used),
+                "X-RateLimit-Reset": str(self.reset),
+                "X-RateLimit-Resource": "search",
+            }
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    Routes: /hn, /arxiv, /rss/<name>, /pypi/<package>/json,
+    /pypistats/api/packages/<package>/recent, /github/search/repositories
+    """
+
+    protocol_version = "HTTP/1.1"
+    config = None  # set by make_server
+
+    def log_message(self, *args):
+        pass
+
+    def _fixture(self, name):
+        if self.config.fixtures is None:
+            return None
+        path = Path(self.config.fixtures) / name
+        return path.read_bytes() if path.exists() else None
+
+    def _send(self, status, body, content_type, extra_headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        config = self.config
+        parts = urlsplit(self.path)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        rng = random.Random(f"{config.seed}:{self.path}")
+
+        delay = max(0.0, config.latency + random.uniform(-config.jitter, config.jitter)) / 1000
+        time.sleep(delay)
+
+        if random.random() < config.error_rate:
+            self._send(503, b"stand-in error", "text/plain")
+            return
+
+        path = parts.path
+        if path.startswith("/hn"):
+            body = self._fixture("hn.json") or synth_hn(rng, config.feed_size)
+            content_type = "application/json"
+        elif path.startswith("/arxiv"):
+            body = self._fixture("arxiv.xml") or synth_arxiv(
+                rng, int(query.get("start", 0)), int(query.get("max_results", 10)), config.arxiv_total
+            )
+            content_type = "application/atom+xml"
+        elif path.startswith("/rss/"):
+            body = self._fixture("rss.xml") or synth_rss(rng, config.feed_size)
+            content_type = "application/rss+xml"
+        elif path.startswith("/pypi/") and path.endswith("/json"):
+            name = path.split("/")[2]
+            body = self._fixture("pypi.json") or synth_pypi(rng, name, config.releases)
+            content_type = "application/json"
+        elif path.startswith("/pypistats/api/packages/") and path.endswith("/recent"):
+            body = json.dumps({"data": {
+                "last_day": rng.randint(10 ** 3, 10 ** 6),
+                "last_week": rng.randint(10 ** 4, 10 ** 7),
+                "last_month": rng.randint(10 ** 5, 10 ** 8),
+            }}).encode()
+            content_type = "application/json"
+        elif path.startswith("/github/search/repositories"):
+            body = self._fixture("github.json") or synth_github(
+                rng, query.get("q", ""), int(query.get("page", 1)), int(query.get("per_page", 30)),
+                config.github_total,
+            )
+            content_type = "application/json"
+        else:
+            self._send(404, b"not found", "text/plain")
+            return
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        headers = {"ETag": etag} if config.etags else {}
+        not_modified = config.etags and self.headers.get("If-None-Match") == etag
+        if path.startswith("/github"):
+            allowed, limit_headers = config.github_limit.take(charge=not not_modified)
+            headers.update(limit_headers)
+            if not allowed:
+                self._send(403, b'{"message": "API rate limit exceeded"}', "application/json", limit_headers)
+                return
+        if not_modified:
+            self._send(304, b"", content_type, headers)
+            return
+        self._send(200, body, content_type, headers)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early (streamed PyPI info) just hang up
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+def make_server(port=0, latency=0.0, jitter=0.0, error_rate=0.0, feed_size=20,
+                arxiv_total=200, releases=200, github_total=300, github_rate_limit=30,
+                etags=True, fixtures=None, seed=0):
+    """Build a ThreadingHTTPServer replaying stand-in payloads (port 0 picks a free port)"""
+    config = argparse.Namespace(
+        latency=latency, jitter=jitter, error_rate=error_rate, feed_size=feed_size,
+        arxiv_total=arxiv_total, releases=releases, github_total=github_total,
+        github_limit=GitHubRateLimit(github_rate_limit),
+        etags=etags, fixtures=fixtures, seed=seed,
+    )
+    handler = type("ConfiguredReplayHandler", (ReplayHandler,), {"config": config})
+    server = ReplayServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def record(out_dir):
+    """Capture live payloads into fixture files for later replay"""
+    import requests
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, url in RECORD_URLS.items():
+        try:
+            response = requests.get(url, timeout=20)
+            response.raise_for_status()
+            (out_dir / name).write_bytes(response.content)
+            print(f"   ✅ {name}: {len(response.content)} bytes")
+        except Exception as e:
+            print(f"   ❌ {name}: {e}")
+
+
+def add_server_arguments(parser):
+    parser.add_argument("--latency", type=float, default=50, help="Mean response latency in ms")
+    parser.add_argument("--jitter", type=float, default=20, help="Uniform latency jitter in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--feed-size", type=int, default=20, help="Items per HN/RSS feed")
+    parser.add_argument("--arxiv-total", type=int, default=200, help="Total papers the arXiv query pages through")
+    parser.add_argument("--releases", type=int, default=200, help="Release entries per PyPI payload")
+    parser.add_argument("--github-total", type=int, default=300, help="Total repos the GitHub search pages through")
+    parser.add_argument("--github-rate-limit", type=int, default=30, help="GitHub search requests per minute")
+    parser.add_argument("--no-etags", action="store_true", help="Disable ETag/304 support")
+    parser.add_argument("--fixtures", default=None, help="Directory of recorded payloads to replay")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def server_from_args(args, port=0):
+    return make_server(
+        port=port, latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        feed_size=args.feed_size, arxiv_total=args.arxiv_total, releases=args.releases,
+        github_total=args.github_total, github_rate_limit=args.github_rate_limit,
+        etags=not args.no_etags, fixtures=args.fixtures,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Run the stand-in server")
+    serve.add_argument("--port", type=int, default=8765)
+    add_server_arguments(serve)
+
+    rec = commands.add_parser("record", help="Record live payloads as fixtures")
+    rec.add_argument("--out", default=str(FIXTURES_DIR))
+
+    args = parser.parse_args()
+    if args.command == "record":
+        record(args.out)
+        return
+
+    server = server_from_args(args, port=args.port)
+    print(f"🛰️  Replay server on http://127.0.0.1:{server.server_address[1]}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
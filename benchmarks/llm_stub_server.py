@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for an LLM provider
+Speaks the OpenAI-compatible chat completions API (what crewai uses for
+Ollama and OpenAI models) and the native Ollama /api/generate, /api/ps and
+/api/tags routes, with configurable latency, tail latency, error rate and
+model load time, so routing, warm-up and instrumentation can be exercised
+offline. With --fixtures it replays completions recorded with
+NEWS_LLM_RECORD (see scripts/llm_replay.py) instead of canned text.
+
+Usage:
+  python benchmarks/llm_stub_server.py --port 8770 --latency 800 --slow-rate 0.1 --slow-latency 5000
+  python benchmarks/llm_stub_server.py --fixtures fixtures/episode --latency 0 --tokens-per-second 40
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Dates in prompts ("episode 2026-10-17") change daily; replay ignores them
+DATE = re.compile(r"\d{4}-\d{2}-\d{2}(?:T[\d:.]+)?")
+
+
+def stub_completion(messages):
+    """Deterministic answer in the Thought / Final Answer shape CrewAI agents parse"""
+    prompt = json.dumps(messages, sort_keys=True)
+    digest = hashlib.sha1(prompt.encode()).hexdigest()[:8]
+    return (
+        "Thought: I now know the final answer\n"
+        f"Final Answer: Stand-in response {digest}. "
+        + "The story matters because open models keep getting faster. " * 4
+    ).strip()
+
+
+def replay_key(messages):
+    """Match key for a request: roles and contents, whitespace and dates normalized"""
+    normalized = [
+        (m.get("role"), DATE.sub("<date>", " ".join(str(m.get("content") or "").split())))
+        for m in messages
+    ]
+    return hashlib.sha256(json.dumps(normalized).encode()).hexdigest()
+
+
+class Fixtures:
+    """Recorded completions by replay key; repeated prompts cycle through their recordings"""
+
+    def __init__(self, fixture_dir):
+        self.responses = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        with open(Path(fixture_dir) / "calls.jsonl") as f:
+            for line in f:
+                if line.strip():
+                    call = json.loads(line)
+                    self.responses.setdefault(replay_key(call["messages"]), []).append(call["response"])
+        self._next = {key: 0 for key in self.responses}
+
+    def lookup(self, messages):
+        key = replay_key(messages)
+        with self._lock:
+            recorded = self.responses.get(key)
+            if not recorded:
+                self.misses += 1
+                return None
+            self.hits += 1
+            response = recorded[self._next[key] % len(recorded)]
+            self._next[key] += 1
+            return response
+
+
+def count_tokens(text):
+    # Rough stand-in tokenizer: ~4 characters per token
+    return max(1, len(text) // 4)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """
+    Routes: POST /v1/chat/completions, GET /v1/models,
+    POST /api/generate, GET /api/ps, GET /api/tags, GET /stub/stats
+    """
+
+    protocol_version = "HTTP/1.1"
+    config = None  # set by make_server
+
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _delay(self):
+        config = self.config
+        if random.random() < config.slow_rate:
+            latency = config.slow_latency
+        else:
+            latency = config.latency + random.uniform(-config.jitter, config.jitter)
+        time.sleep(max(0.0, latency) / 1000)
+
+    def _ensure_loaded(self, keep_alive=None):
+        """Pay the model load time unless the model is resident; returns seconds spent loading"""
+        config = self.config
+        with config.lock:
+            now = time.time()
+            load_s = 0.0
+            if now >= config.loaded_until:
+                load_s = config.load_time / 1000
+                time.sleep(load_s)
+                config.loads += 1
+            config.loaded_until = time.time() + parse_keep_alive(keep_alive, config.keep_alive)
+            return load_s
+
+    def do_GET(self):
+        if self.path.startswith("/stub/stats"):
+            fixtures = self.config.fixtures
+            self._send_json(200, {
+                "requests": self.config.requests,
+                "replay_hits": fixtures.hits if fixtures else 0,
+                "replay_misses": fixtures.misses if fixtures else 0,
+            })
+            return
+        if self.path.startswith("/api/tags"):
+            self._send_json(200, {"models": [{"name": self.config.model, "model": self.config.model}]})
+            return
+        if self.path.startswith("/api/ps"):
+            resident = time.time() < self.config.loaded_until
+            self._send_json(200, {"models": [{"name": self.config.model, "model": self.config.model}] if resident else []})
+            return
+        if self.path.startswith("/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": self.config.model, "object": "model"}]})
+            return
+        self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        config = self.config
+        config.requests += 1
+        if self.path.startswith("/api/generate"):
+            self._generate(self._read_json())
+            return
+        if not self.path.startswith("/v1/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        request = self._read_json()
+        self._ensure_loaded()
+        self._delay()
+        if random.random() < config.error_rate:
+            self._send_json(503, {"error": {"message": "stand-in overloaded", "type": "server_error"}})
+            return
+
+        messages = request.get("messages", [])
+        content = config.fixtures.lookup(messages) if config.fixtures else None
+        if content is None:
+            content = stub_completion(messages)
+        prompt_tokens = sum(count_tokens(str(m.get("content", ""))) for m in messages)
+        completion_tokens = count_tokens(content)
+        created = int(time.time())
+        model = request.get("model", config.model)
+
+        if request.get("stream"):
+            self._stream(content, model, created, prompt_tokens, completion_tokens)
+            return
+
+        self._send_json(200, {
+            "id": f"chatcmpl-stub-{created}",
+            "object": "chat.completion",
+            "created": created,
+            "model": model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+
+    def _stream(self, content, model, created, prompt_tokens, completion_tokens):
+        """Server-sent events, one chunk per word at tokens_per_second"""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+
+        def event(payload):
+            self.wfile.write(b"data: " + json.dumps(payload).encode() + b"\n\n")
+            self.wfile.flush()
+
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            event({
+                "id": f"chatcmpl-stub-{created}", "object": "chat.completion.chunk",
+                "created": created, "model": model,
+                "choices": [{"index": 0, "delta": {"content": word if i == 0 else " " + word},
+                             "finish_reason": None}],
+            })
+            time.sleep(1 / self.config.tokens_per_second)
+        event({
+            "id": f"chatcmpl-stub-{created}", "object": "chat.completion.chunk",
+            "created": created, "model": model,
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        })
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _generate(self, request):
+        """Native Ollama generate: an empty prompt only loads the model"""
+        load_s = self._ensure_loaded(request.get("keep_alive"))
+        prompt = request.get("prompt", "")
+        if not prompt:
+            self._send_json(200, {"model": request.get("model"), "response": "", "done": True,
+                                  "load_duration": int(load_s * 1e9)})
+            return
+
+        self._delay()
+        words = stub_completion([{"content": prompt}]).split(" ")
+        words = words[: request.get("options", {}).get("num_predict", len(words))]
+        eval_s = len(words) / self.config.tokens_per_second
+        final = {"model": request.get("model"), "response": "", "done": True,
+                 "load_duration": int(load_s * 1e9), "prompt_eval_count": count_tokens(prompt),
+                 "eval_count": len(words), "eval_duration": int(eval_s * 1e9)}
+
+        if not request.get("stream", True):
+            time.sleep(eval_s)
+            self._send_json(200, {**final, "response": " ".join(words)})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for i, word in enumerate(words):
+            chunk = {"model": request.get("model"), "response": word if i == 0 else " " + word, "done": False}
+            self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            self.wfile.flush()
+            time.sleep(1 / self.config.tokens_per_second)
+        self.wfile.write(json.dumps(final).encode() + b"\n")
+        self.wfile.flush()
+
+
+def parse_keep_alive(value, default):
+    """Seconds for an Ollama keep_alive ("5m", "2h", 300, -1 = forever)"""
+    if value is None:
+        value = default
+    if isinstance(value, (int, float)):
+        return float("inf") if value < 0 else float(value)
+    value = str(value).strip()
+    if value.startswith("-"):
+        return float("inf")
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+def make_server(port=0, latency=500.0, jitter=100.0, slow_rate=0.0, slow_latency=5000.0,
+                error_rate=0.0, tokens_per_second=200.0, model="stub", load_time=0.0,
+                keep_alive="5m", seed=None, fixtures=None):
+    """Build a stand-in provider (port 0 picks a free port; ``fixtures`` is a recording directory)"""
+    if seed is not None:
+        random.seed(seed)
+    config = argparse.Namespace(
+        latency=latency, jitter=jitter, slow_rate=slow_rate, slow_latency=slow_latency,
+        error_rate=error_rate, tokens_per_second=tokens_per_second, model=model, requests=0,
+        load_time=load_time, keep_alive=keep_alive, loaded_until=0.0, loads=0,
+        lock=threading.Lock(), fixtures=Fixtures(fixtures) if fixtures else None,
+    )
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    server.config = config
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8770)
+    parser.add_argument("--latency", type=float, default=500, help="Mean response latency in ms")
+    parser.add_argument("--jitter", type=float, default=100, help="Uniform latency jitter in ms")
+    parser.add_argument("--slow-rate", type=float, default=0.0, help="Fraction of responses that take --slow-latency")
+    parser.add_argument("--slow-latency", type=float, default=5000, help="Tail latency in ms")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--tokens-per-second", type=float, default=200, help="Streaming speed")
+    parser.add_argument("--model", default="stub")
+    parser.add_argument("--load-time", type=float, default=0, help="Model load time in ms when not resident")
+    parser.add_argument("--keep-alive", default="5m", help="Default keep_alive after each request")
+    parser.add_argument("--fixtures", default=None, help="Replay completions recorded with NEWS_LLM_RECORD")
+    args = parser.parse_args()
+
+    server = make_server(
+        port=args.port, latency=args.latency, jitter=args.jitter, slow_rate=args.slow_rate,
+        slow_latency=args.slow_latency, error_rate=args.error_rate,
+        tokens_per_second=args.tokens_per_second, model=args.model,
+        load_time=args.load_time, keep_alive=args.keep_alive, fixtures=args.fixtures,
+    )
+    print(f"🧪 LLM stand-in on http://127.0.0.1:{server.server_address[1]}/v1", flush=True)
+    if server.config.fixtures:
+        print(f"   📼 Replaying {sum(map(len, server.config.fixtures.responses.values()))} recorded calls "
+              f"from {args.fixtures}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
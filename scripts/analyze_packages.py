@@ -3,74 +3,198 @@
 Analyze trending Python packages and AI tools
 """
 import os
+import re
 import json
 import sys
 from datetime import datetime
 from pathlib import Path
-import requests
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from http_client import cached_get, fetch_concurrently, set_host_rate
+from github_client import search_trending_repositories
+from package_trends import PackageTrendStore, compute_trending_scores, upsert_trending_scores
 
 # Output directories
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
 
-def fetch_pypi_stats():
+# API endpoints (overridable to point at a local stand-in server)
+PYPI_API_BASE = os.environ.get("PYPI_API_BASE", "https://pypi.org/pypi")
+PYPISTATS_API_BASE = os.environ.get("PYPISTATS_API_BASE", "https://pypistats.org/api")
+
+# Concurrent PyPI requests; pypi.org is CDN-backed and tolerates a brisk rate
+PYPI_MAX_WORKERS = int(os.environ.get("PYPI_MAX_WORKERS", "16"))
+PACKAGE_HOST_LIMITS = {
+    "pypi.org": {"rate": 20, "burst": 20},
+    "pypistats.org": {"rate": 1, "burst": 2},
+}
+
+# Weekly downloads from pypistats.org (feeds download velocity); it is
+# strictly rate limited, so it gets its own small pass and can be turned off
+PYPI_DOWNLOAD_STATS = os.environ.get("PYPI_DOWNLOAD_STATS", "on").lower() not in ("0", "off", "false", "no")
+PYPISTATS_MAX_WORKERS = 2
+
+PYPI_INFO_KEY = re.compile(r'\s*\{\s*"info"\s*:\s*')
+PYPI_INFO_KEY_BYTES = re.compile(rb'\s*\{\s*"info"\s*:\s*\{')
+JSON_STRUCTURE = re.compile(rb'[{}"\\]')
+JSON_DECODER = json.JSONDecoder()
+
+# Popular AI/ML packages to track
+TRACKED_PACKAGES = [
+    "langchain",
+    "crewai",
+    "ollama",
+    "transformers",
+    "torch",
+    "tensorflow",
+    "scikit-learn",
+    "pandas",
+    "numpy",
+    "matplotlib",
+    "openai",
+    "anthropic",
+    "gradio",
+    "streamlit",
+    "fastapi",
+    "pydantic",
+    "sqlalchemy",
+    "pytest",
+    "black",
+    "ruff"
+]
+
+
+class PypiInfoEnd:
+    """
+    Stream scanner for ``cached_get(until=...)``: finds where the leading
+    ``info`` object of a PyPI JSON payload ends, so the (often much larger)
+    release history is never downloaded. Reads to the end if the payload
+    does not start with ``{"info": {``.
+    """
+
+    def __init__(self):
+        self.head = b""
+        self.checked = False
+        self.depth = 0
+        self.in_string = False
+        self.skip = 0  # bytes of the next chunk escaped by a trailing backslash
+
+    def __call__(self, chunk):
+        start = 0
+        if not self.checked:
+            self.head += chunk
+            if len(self.head) < 64 and len(chunk):
+                return None
+            self.checked = True
+            if not PYPI_INFO_KEY_BYTES.match(self.head):
+                self.depth = None
+            chunk, start = self.head, len(self.head) - len(chunk)
+        if self.depth is None:
+            return None
+
+        position = self.skip
+        for match in JSON_STRUCTURE.finditer(chunk, self.skip):
+            i = match.start()
+            if i < position:
+                continue
+            char = chunk[i:i + 1]
+            if self.in_string:
+                if char == b"\\":
+                    position = i + 2
+                elif char == b'"':
+                    self.in_string = False
+            elif char == b'"':
+                self.in_string = True
+            elif char == b"{":
+                self.depth += 1
+            elif char == b"}":
+                self.depth -= 1
+                if self.depth == 1:
+                    return max(0, i + 1 - start)
+        self.skip = max(0, position - len(chunk))
+        return None
+
+
+def parse_pypi_info(content):
+    """
+    Return the ``info`` object of a PyPI JSON payload without decoding the rest.
+
+    ``info`` is the first key PyPI emits, so it is decoded in place; with
+    PypiInfoEnd the rest of the payload was never read. Falls back to a full
+    parse if the layout ever changes.
+    """
+    text = content.decode("utf-8")
+    match = PYPI_INFO_KEY.match(text)
+    if match:
+        try:
+            info, _ = JSON_DECODER.raw_decode(text, match.end())
+            return info
+        except ValueError:
+            pass
+    return json.loads(text).get('info', {})
+
+
+def fetch_pypi_downloads(pkg_name):
+    """Downloads over the last week from pypistats.org, or None if unavailable"""
+    try:
+        response = cached_get(f"{PYPISTATS_API_BASE}/packages/{pkg_name}/recent", timeout=5)
+        if response.status_code == 200:
+            return response.json().get('data', {}).get('last_week')
+    except Exception as e:
+        print(f"   ⚠️  No download stats for {pkg_name}: {e}")
+    return None
+
+
+def fetch_pypi_package(pkg_name):
+    """Fetch the fields we use for one package; None if PyPI does not know it"""
+    response = cached_get(f"{PYPI_API_BASE}/{pkg_name}/json", timeout=5, until=PypiInfoEnd())
+    if response.status_code != 200:
+        return None
+    
+    info = parse_pypi_info(response.content) or {}
+    print(f"   ✅ {pkg_name}")
+    return {
+        'name': pkg_name,
+        'version': info.get('version') or '',
+        'description': info.get('summary') or '',
+        'author': info.get('author') or '',
+        'home_page': info.get('home_page') or '',
+        'project_urls': info.get('project_urls') or {},
+        'requires_python': info.get('requires_python') or '',
+        'license': info.get('license') or '',
+        'downloads': None,
+    }
+
+
+def fetch_pypi_stats(packages=None):
     """Fetch trending packages from PyPI"""
     print("📦 Fetching trending packages from PyPI...")
     
-    # Popular AI/ML packages to track
-    packages = [
-        "langchain",
-        "crewai",
-        "ollama",
-        "transformers",
-        "torch",
-        "tensorflow",
-        "scikit-learn",
-        "pandas",
-        "numpy",
-        "matplotlib",
-        "openai",
-        "anthropic",
-        "gradio",
-        "streamlit",
-        "fastapi",
-        "pydantic",
-        "sqlalchemy",
-        "pytest",
-        "black",
-        "ruff"
+    packages = packages or TRACKED_PACKAGES
+    for host, limit in PACKAGE_HOST_LIMITS.items():
+        set_host_rate(host, limit["rate"], limit.get("burst"))
+    
+    # Bounded concurrency over the pooled session; failures are reported
+    # per package and simply left out
+    jobs = [
+        {"name": pkg_name, "func": fetch_pypi_package, "args": (pkg_name,)}
+        for pkg_name in packages
     ]
+    results = fetch_concurrently(jobs, max_workers=PYPI_MAX_WORKERS)
+    package_data = [data for _, data in results if data]
     
-    package_data = []
-    
-    for pkg_name in packages:
-        try:
-            # Get package info from PyPI API
-            response = requests.get(
-                f"https://pypi.org/pypi/{pkg_name}/json",
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                info = data.get('info', {})
-                
-                package_data.append({
-                    'name': pkg_name,
-                    'version': info.get('version', ''),
-                    'description': info.get('summary', ''),
-                    'author': info.get('author', ''),
-                    'home_page': info.get('home_page', ''),
-                    'project_urls': info.get('project_urls', {}),
-                    'requires_python': info.get('requires_python', ''),
-                    'license': info.get('license', ''),
-                })
-                print(f"   ✅ {pkg_name}")
-            
-        except Exception as e:
-            print(f"   ❌ Error fetching {pkg_name}: {e}")
-            continue
+    if PYPI_DOWNLOAD_STATS and package_data:
+        print(f"   📥 Fetching download stats for {len(package_data)} packages...")
+        jobs = [
+            {"name": pkg['name'], "func": fetch_pypi_downloads, "args": (pkg['name'],), "deadline": 30}
+            for pkg in package_data
+        ]
+        downloads = dict(fetch_concurrently(jobs, max_workers=PYPISTATS_MAX_WORKERS))
+        for pkg in package_data:
+            pkg['downloads'] = downloads.get(pkg['name'])
     
     print(f"\n   Found {len(package_data)} packages")
     return package_data
@@ -81,28 +205,11 @@ def fetch_github_trending():
     print("\n🌟 Fetching trending AI repos from GitHub...")
     
     try:
-        # GitHub trending AI repositories
-        # Note: GitHub doesn't have official trending API, using search instead
-        response = requests.get(
-            "https://api.github.com/search/repositories?q=topic:artificial-intelligence+topic:machine-learning+stars:>1000&sort=stars&order=desc&per_page=20",
-            timeout=10
-        )
+        # GitHub has no official trending API: merge paginated topic searches instead
+        repos = search_trending_repositories()
         
-        repos = []
-        if response.status_code == 200:
-            data = response.json()
-            
-            for repo in data.get('items', [])[:10]:
-                repos.append({
-                    'name': repo['name'],
-                    'full_name': repo['full_name'],
-                    'description': repo.get('description', ''),
-                    'stars': repo['stargazers_count'],
-                    'url': repo['html_url'],
-                    'language': repo.get('language', ''),
-                    'topics': repo.get('topics', [])
-                })
-                print(f"   ✅ {repo['name']} ({repo['stargazers_count']} ⭐)")
+        for repo in repos[:10]:
+            print(f"   ✅ {repo['name']} ({repo['stars']} ⭐)")
         
         print(f"\n   Found {len(repos)} trending repos")
         return repos
@@ -138,6 +245,7 @@ def analyze_packages(pypi_packages, github_repos):
     for repo in github_repos:
         all_packages.append({
             'name': repo['name'],
+            'full_name': repo['full_name'],
             'description': repo['description'],
             'source': 'GitHub',
             'url': repo['url'],
@@ -147,6 +255,13 @@ def analyze_packages(pypi_packages, github_repos):
             'language': repo['language']
         })
     
+    # Add growth velocity from the daily snapshot history
+    with PackageTrendStore() as store:
+        store.record_snapshot(all_packages)
+        compute_trending_scores(all_packages, store)
+    for pkg in all_packages:
+        pkg['score'] += pkg['trending_score']
+    
     # Sort by score
     all_packages = sorted(all_packages, key=lambda x: x.get('score', 0), reverse=True)
     
@@ -215,6 +330,7 @@ if __name__ == "__main__":
         
         # Save
         save_packages(all_packages, package_of_day)
+        upsert_trending_scores(all_packages)
         
         print("\n" + "=" * 70)
         print("✅ SUCCESS: Package analysis complete!")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Persistent article store for cross-day novelty filtering
+Append-only SQLite table keyed by a hash of the canonical article URL
+"""
+import os
+import json
+import sqlite3
+import hashlib
+from datetime import datetime
+from pathlib import Path
+
+from dedup import canonicalize_url
+
+ARTICLE_DB = Path(os.environ.get("ARTICLE_DB", "data/articles.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    url_hash TEXT PRIMARY KEY,
+    canonical_url TEXT NOT NULL,
+    title TEXT,
+    source TEXT,
+    published_at TEXT,
+    first_seen TEXT NOT NULL,
+    covered_on TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_articles_first_seen ON articles(first_seen);
+CREATE INDEX IF NOT EXISTS idx_articles_covered ON articles(covered_on);
+"""
+
+
+def article_key(article):
+    """Stable 16-byte hex key for an article, derived from its canonical URL"""
+    canonical = article.get("canonical_url") or canonicalize_url(article.get("url", ""))
+    if not canonical:
+        # No link (e.g. Ask HN); fall back to the title
+        canonical = "title:" + article.get("title", "").strip().lower()
+    return hashlib.blake2b(canonical.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ArticleStore:
+    """
+    Append-only record of every article the pipeline has fetched.
+
+    Rows are only inserted, never rewritten, except to stamp ``covered_on``
+    once an episode has used the article. Coverage and novelty are answered
+    by SQL queries on ``covered_on`` and ``first_seen`` (``url_hash`` is the
+    primary key, so looking up a day's articles stays an index probe each).
+    """
+
+    # SQLite's default limit on bound parameters per statement is 999
+    QUERY_BATCH = 500
+
+    def __init__(self, path=ARTICLE_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def covered_keys(self, keys):
+        """The subset of article ``keys`` an earlier episode already used"""
+        keys = list(keys)
+        covered = set()
+        for i in range(0, len(keys), self.QUERY_BATCH):
+            batch = keys[i:i + self.QUERY_BATCH]
+            covered.update(row[0] for row in self.conn.execute(
+                f"SELECT url_hash FROM articles WHERE covered_on IS NOT NULL "
+                f"AND url_hash IN ({','.join('?' * len(batch))})",
+                batch,
+            ))
+        return covered
+
+    def is_covered(self, article):
+        """True if an earlier episode already used this article"""
+        return bool(self.covered_keys([article_key(article)]))
+
+    def add_articles(self, articles):
+        """Insert articles not seen before; returns how many were new"""
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                article_key(article),
+                article.get("canonical_url") or canonicalize_url(article.get("url", "")),
+                article.get("title", ""),
+                article.get("source", ""),
+                article.get("published_at", ""),
+                now,
+                json.dumps(article),
+            )
+            for article in articles
+        ]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO articles "
+                "(url_hash, canonical_url, title, source, published_at, first_seen, payload) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            return self.conn.total_changes - before
+
+    def filter_novel(self, articles):
+        """Drop articles an earlier episode already covered"""
+        keys = [article_key(article) for article in articles]
+        covered = self.covered_keys(keys)
+        return [article for article, key in zip(articles, keys) if key not in covered]
+
+    def last_episode(self):
+        """ISO timestamp of the most recent episode that covered articles, or None"""
+        row = self.conn.execute("SELECT MAX(covered_on) FROM articles").fetchone()
+        return row[0]
+
+    def uncovered(self, since=None):
+        """Articles no episode has used, first seen after ``since`` (ISO timestamp) if given, oldest first"""
+        rows = self.conn.execute(
+            "SELECT payload FROM articles "
+            "WHERE covered_on IS NULL AND first_seen > ? ORDER BY first_seen",
+            (since or "",),
+        )
+        return [json.loads(row[0]) for row in rows]
+
+    def new_since_last_episode(self):
+        """Articles first seen after the last episode and not yet covered"""
+        return self.uncovered(self.last_episode())
+
+    def mark_covered(self, articles, covered_on=None):
+        """Stamp articles as used by an episode so later runs skip them"""
+        covered_on = covered_on or datetime.now().isoformat()
+        keys = [article_key(article) for article in articles]
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE articles SET covered_on = ? WHERE url_hash = ? AND covered_on IS NULL",
+                [(covered_on, key) for key in keys],
+            )
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate detection for fetched news articles
+URL canonicalization plus a banded 64-bit SimHash index over title + summary
+"""
+import os
+import re
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Maximum Hamming distance between two SimHashes to call them duplicates.
+# Must stay below SIMHASH_BANDS so the banded index cannot miss a match.
+DEDUP_MAX_DISTANCE = int(os.environ.get("DEDUP_MAX_DISTANCE", "3"))
+SIMHASH_BITS = 64
+SIMHASH_BANDS = 4
+
+# Query parameters that only identify the referrer, never the content
+TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "igshid",
+    "ref", "ref_src", "referrer", "source", "src", "cmpid", "guccounter",
+    "_hsenc", "_hsmi", "yclid", "spm", "ncid", "sr_share",
+}
+
+ARXIV_ID = re.compile(r"/(?:abs|pdf|html)/(\d{4}\.\d{4,5}|[a-z\-\.]+/\d{7})(?:v\d+)?(?:\.pdf)?/?$")
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has",
+    "have", "in", "is", "it", "its", "of", "on", "or", "that", "the", "this",
+    "to", "was", "were", "will", "with", "new", "how", "why", "what",
+}
+
+WORD = re.compile(r"[a-z0-9]+")
+
+# token -> 64-character bit string of its hash
+_token_bit_cache = {}
+
+
+def canonicalize_url(url):
+    """Normalize a URL so trivially different links to the same page compare equal"""
+    if not url:
+        return ""
+
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    # arXiv abs/pdf/html links and versions all refer to one paper
+    if host.endswith("arxiv.org"):
+        match = ARXIV_ID.search(parts.path)
+        if match:
+            return f"https://arxiv.org/abs/{match.group(1)}"
+
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    ]
+    query.sort()
+
+    path = re.sub(r"/{2,}", "/", parts.path or "/")
+    if len(path) > 1:
+        path = path.rstrip("/")
+
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def _token_bits(token):
+    bits = _token_bit_cache.get(token)
+    if bits is None:
+        digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+        bits = format(int.from_bytes(digest, "big"), "064b")
+        _token_bit_cache[token] = bits
+    return bits
+
+
+def simhash(text):
+    """64-bit SimHash of word unigrams and bigrams (stopwords removed)"""
+    words = [w for w in WORD.findall(text.lower()) if w not in STOPWORDS]
+    features = words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+    if not features:
+        return 0
+
+    # Column-wise bit counts over the binary strings run in C, not per bit in Python
+    rows = [_token_bits(feature) for feature in features]
+    half = len(rows) / 2
+    bits = "".join("1" if column.count("1") > half else "0" for column in zip(*rows))
+    return int(bits, 2)
+
+
+class SimHashIndex:
+    """
+    Banded SimHash index.
+
+    The 64-bit signature is split into SIMHASH_BANDS bands; two signatures
+    within DEDUP_MAX_DISTANCE bits must agree on at least one whole band, so
+    only items sharing a band bucket are compared. Insert and lookup are
+    O(1) on average, keeping the whole pass linear in article count.
+    """
+
+    def __init__(self, max_distance=DEDUP_MAX_DISTANCE):
+        self.max_distance = max_distance
+        self.band_bits = SIMHASH_BITS // SIMHASH_BANDS
+        self.mask = (1 << self.band_bits) - 1
+        self.buckets = [{} for _ in range(SIMHASH_BANDS)]
+        self.signatures = []
+
+    def _bands(self, signature):
+        for band in range(SIMHASH_BANDS):
+            yield band, signature >> (band * self.band_bits) & self.mask
+
+    def find(self, signature):
+        """Return the id of an indexed near-duplicate, or None"""
+        for band, key in self._bands(signature):
+            for item_id in self.buckets[band].get(key, ()):
+                if bin(self.signatures[item_id] ^ signature).count("1") <= self.max_distance:
+                    return item_id
+        return None
+
+    def add(self, signature):
+        """Index a signature and return its id"""
+        item_id = len(self.signatures)
+        self.signatures.append(signature)
+        for band, key in self._bands(signature):
+            self.buckets[band].setdefault(key, []).append(item_id)
+        return item_id
+
+
+def deduplicate_articles(articles):
+    """
+    Drop exact (canonical URL) and near (SimHash) duplicates, keeping the first copy.
+
+    Each kept article gets a ``canonical_url``; when later copies are folded
+    into it their sources are listed in ``also_in`` and the highest
+    ``points`` value is kept, so cross-source coverage is not lost.
+    """
+    by_url = {}
+    index = SimHashIndex()
+    kept = []
+
+    for article in articles:
+        canonical = canonicalize_url(article.get("url", ""))
+        text = f"{article.get('title', '')} {article.get('summary', '')}"
+        signature = simhash(text)
+
+        original = by_url.get(canonical) if canonical else None
+        if original is None and signature:
+            item_id = index.find(signature)
+            if item_id is not None:
+                original = kept[item_id]
+
+        if original is not None:
+            if article.get("source") and article["source"] != original.get("source"):
+                also_in = original.setdefault("also_in", [])
+                if article["source"] not in also_in:
+                    also_in.append(article["source"])
+            if article.get("points", 0) > original.get("points", 0):
+                original["points"] = article["points"]
+            continue
+
+        article = {**article, "canonical_url": canonical}
+        index.add(signature)
+        kept.append(article)
+        if canonical:
+            by_url[canonical] = article
+
+    removed = len(articles) - len(kept)
+    print(f"   🧹 Removed {removed} duplicate articles ({len(kept)} unique)")
+    return kept
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Structured episode script artifact
+Sections -> paragraphs of spoken text, with [MM:SS] timings, [PAUSE] and other
+stage directions pulled out as cues, saved as versioned JSON so audio, video
+and subtitles never have to reparse the raw LLM output
+
+Usage:
+  python scripts/episode_script.py                          # validate and summarize output/episode_script.json
+  python scripts/episode_script.py --from-text script.txt   # convert a plain-text script
+"""
+import os
+import re
+import sys
+import json
+import argparse
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+
+SCHEMA_VERSION = 1
+
+EPISODE_SCRIPT_FILE = Path(os.environ.get("EPISODE_SCRIPT_FILE", "output/episode_script.json"))
+EPISODE_SCRIPT_TEXT = Path("output/episode_script.txt")
+
+CUE_KINDS = ("timing", "pause", "direction")
+
+# Seconds of silence for a bare [PAUSE]
+DEFAULT_PAUSE = 0.6
+
+TIMING = re.compile(r"\[(\d{1,2}):(\d{2})(?:\s*[-–]\s*\d{1,2}:\d{2})?\]")
+PAUSE = re.compile(r"\[(?:long\s+|short\s+)?pause(?:[:\s]+([\d.]+)\s*s(?:ec(?:onds?)?)?)?\]", re.IGNORECASE)
+# Only known production cues are directions; other bracketed words ("[Llama 3]") are spoken
+DIRECTION = re.compile(
+    r"\[((?:intro\s+|outro\s+|background\s+)?(?:sfx|sound(?:\s+effects?)?|music|jingle|transition|"
+    r"b-?roll|cut\s+to|graphics?|on[-\s]screen(?:\s+text)?|visuals?|scene|slide|title\s+card|"
+    r"lower\s+third|applause)\b[^\]\n]{0,60})\]",
+    re.IGNORECASE,
+)
+CUE = re.compile(f"{TIMING.pattern}|{PAUSE.pattern}|{DIRECTION.pattern}", re.IGNORECASE)
+SPEAKER = re.compile(r"^\s*(?:host|narrator|anchor|presenter)\s*:\s*", re.IGNORECASE)
+MARKDOWN = re.compile(r"(\*\*|__|`)")
+LINK = re.compile(r"\[([^\]\n]+)\]\([^)\s]*\)")
+HEADING = re.compile(r"^\s*(?:#+\s*.*|\d+\.\s*[A-Z][A-Z &'/-]+(?:\(.*\))?\s*|[A-Z][A-Z &'/-]{2,}(?:\(.*\))?:?\s*)$")
+SENTENCE = re.compile(r"(?<=[.!?…])\s+(?=[\"'A-Z0-9])")
+
+
+@dataclass
+class Cue:
+    """Stage direction at character offset ``at`` of its paragraph's spoken text"""
+
+    kind: str
+    at: int
+    value: float = None
+    label: str = None
+
+
+@dataclass
+class Paragraph:
+    text: str
+    cues: list = field(default_factory=list)
+
+    def sentences(self):
+        return [s.strip() for s in SENTENCE.split(self.text) if s.strip()]
+
+    def pause_seconds(self):
+        return sum(c.value or 0.0 for c in self.cues if c.kind == "pause")
+
+
+@dataclass
+class Section:
+    name: str
+    title: str
+    start_s: float
+    target_s: float
+    paragraphs: list = field(default_factory=list)
+
+    def text(self):
+        return "\n\n".join(p.text for p in self.paragraphs)
+
+
+def parse_clock(value):
+    """"06:00" -> 360.0"""
+    minutes, seconds = value.split(":")
+    return int(minutes) * 60 + float(seconds)
+
+
+def parse_duration(value):
+    """"2.5 minutes" / "30 seconds" -> seconds"""
+    amount, unit = value.split()[:2]
+    return float(amount) * (60 if unit.startswith("minute") else 1)
+
+
+def _cue(marker, at):
+    timing = TIMING.fullmatch(marker)
+    if timing:
+        minutes, seconds = timing.groups()
+        return Cue("timing", at, int(minutes) * 60 + int(seconds))
+    pause = PAUSE.fullmatch(marker)
+    if pause:
+        return Cue("pause", at, float(pause.group(1)) if pause.group(1) else DEFAULT_PAUSE)
+    return Cue("direction", at, label=marker[1:-1].strip())
+
+
+def extract_cues(line):
+    """Cues in ``line``, all at offset 0 (for marker-only and heading lines)"""
+    return [_cue(m.group(0), 0) for m in CUE.finditer(line)]
+
+
+def parse_paragraph(raw):
+    """Split raw LLM text into spoken text and cues; None if nothing is left to say"""
+    # "[LangChain](https://...)" is spoken as "LangChain", not as a cue plus a URL
+    raw = LINK.sub(r"\1", MARKDOWN.sub("", SPEAKER.sub("", raw.strip())))
+    words, cues, last = [], [], 0
+    for match in CUE.finditer(raw):
+        words += raw[last:match.start()].split()
+        last = match.end()
+        cues.append(_cue(match.group(0), len(" ".join(words))))
+    words += raw[last:].split()
+    # "word [PAUSE]." leaves "word ." behind
+    text = re.sub(r"\s+([,.;:!?…])", r"\1", " ".join(words))
+    # "[00:00] Host: Welcome" - the speaker label follows the marker
+    speaker = SPEAKER.match(text)
+    cut = speaker.end() if speaker else 0
+    text = text[cut:]
+    if not text or HEADING.match(text):
+        return None
+    for cue in cues:
+        cue.at = max(0, min(cue.at - cut, len(text)))
+    return Paragraph(text, cues)
+
+
+def parse_section(name, title, start_s, target_s, raw_text):
+    """Section from raw LLM text: blank-line paragraphs, headings dropped, cues extracted"""
+    paragraphs, pending = [], []
+    for block in re.split(r"\n\s*\n", raw_text.strip()):
+        kept, trailing = [], []
+        for line in block.splitlines():
+            if parse_paragraph(line) is not None:
+                kept.append(line)
+                pending, trailing = pending + trailing, []
+            elif kept:
+                trailing += extract_cues(line)
+            else:
+                # Headings and marker-only lines hand their cues to the next paragraph
+                pending += extract_cues(line)
+        if not kept:
+            continue
+        paragraph = parse_paragraph(" ".join(kept))
+        end = len(paragraph.text)
+        paragraph.cues = pending + paragraph.cues + [Cue(c.kind, end, c.value, c.label) for c in trailing]
+        pending = []
+        paragraphs.append(paragraph)
+    if pending and paragraphs:
+        last = paragraphs[-1]
+        last.cues += [Cue(c.kind, len(last.text), c.value, c.label) for c in pending]
+    return Section(name, title, float(start_s), float(target_s), paragraphs)
+
+
+class EpisodeScript:
+    """
+    Versioned, validated episode script.
+
+    ``load`` only reads the header; sections are built the first time they
+    are used, so a stage that needs just the date or title pays nothing.
+    """
+
+    def __init__(self, date, model=None, sections=None, raw_sections=None, created_at=None, language="en"):
+        self.version = SCHEMA_VERSION
+        self.date = date
+        self.model = model
+        self.language = language
+        self.created_at = created_at or datetime.now().isoformat()
+        if sections is not None:
+            self.__dict__["sections"] = sections
+        self._raw_sections = raw_sections or []
+
+    @cached_property
+    def sections(self):
+        return [_section_from_dict(s) for s in self._raw_sections]
+
+    @classmethod
+    def from_sections(cls, specs, texts, date, model=None, language="en"):
+        """
+        Build from section specs (name, title, start, duration) and their raw
+        texts. A section with nothing to speak (only headings and markers) is
+        left out with a warning rather than failing the whole script.
+        """
+        sections = []
+        for spec in specs:
+            if not texts.get(spec["name"]):
+                continue
+            section = parse_section(spec["name"], spec["title"], parse_clock(spec["start"]),
+                                    parse_duration(spec["duration"]), texts[spec["name"]])
+            if not section.paragraphs:
+                print(f"   ⚠️  Section {spec['name']} has no spoken paragraphs; left out of the structured script")
+                continue
+            sections.append(section)
+        return cls(date, model, sections=sections, language=language)
+
+    @classmethod
+    def from_text(cls, text, date=None, model=None):
+        """Wrap a legacy plain-text script as one untimed section"""
+        date = date or datetime.now().strftime("%Y-%m-%d")
+        return cls(date, model, sections=[parse_section("script", "SCRIPT", 0, 0, text)])
+
+    def spoken_text(self):
+        """Everything the narrator says, markers and headings removed"""
+        return "\n\n".join(s.text() for s in self.sections if s.paragraphs)
+
+    def validate(self):
+        """Raise ValueError listing every problem with the artifact"""
+        problems = []
+        if self.version != SCHEMA_VERSION:
+            problems.append(f"schema version {self.version} != {SCHEMA_VERSION}")
+        if not self.sections:
+            problems.append("no sections")
+        names = [s.name for s in self.sections]
+        if len(set(names)) != len(names):
+            problems.append(f"duplicate section names: {names}")
+        previous = -1.0
+        for section in self.sections:
+            if section.start_s < previous:
+                problems.append(f"{section.name}: starts before the previous section")
+            previous = section.start_s
+            if section.target_s < 0:
+                problems.append(f"{section.name}: negative target duration")
+            if not section.paragraphs:
+                problems.append(f"{section.name}: no spoken paragraphs")
+            for i, paragraph in enumerate(section.paragraphs):
+                if not paragraph.text.strip():
+                    problems.append(f"{section.name}[{i}]: empty paragraph")
+                for cue in paragraph.cues:
+                    if cue.kind not in CUE_KINDS:
+                        problems.append(f"{section.name}[{i}]: unknown cue kind {cue.kind!r}")
+                    if not 0 <= cue.at <= len(paragraph.text):
+                        problems.append(f"{section.name}[{i}]: cue offset {cue.at} out of range")
+                if TIMING.search(paragraph.text) or PAUSE.search(paragraph.text):
+                    problems.append(f"{section.name}[{i}]: marker left in spoken text")
+        if problems:
+            raise ValueError("Invalid episode script: " + "; ".join(problems))
+        return self
+
+    def to_dict(self):
+        return {
+            "version": self.version,
+            "date": self.date,
+            "model": self.model,
+            "language": self.language,
+            "created_at": self.created_at,
+            "sections": [asdict(s) for s in self.sections],
+        }
+
+    def save(self, path=EPISODE_SCRIPT_FILE):
+        """Validate, then write atomically"""
+        self.validate()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        tmp.replace(path)
+        return path
+
+    @classmethod
+    def load(cls, path=EPISODE_SCRIPT_FILE):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != SCHEMA_VERSION:
+            raise ValueError(f"{path}: schema version {data.get('version')}, expected {SCHEMA_VERSION}")
+        return cls(data["date"], data.get("model"), raw_sections=data["sections"],
+                   created_at=data.get("created_at"), language=data.get("language", "en"))
+
+
+def _section_from_dict(data):
+    return Section(
+        data["name"], data["title"], float(data["start_s"]), float(data["target_s"]),
+        [Paragraph(p["text"], [Cue(**c) for c in p.get("cues", [])]) for p in data["paragraphs"]],
+    )
+
+
+def load_episode_script(path=EPISODE_SCRIPT_FILE, text_path=EPISODE_SCRIPT_TEXT):
+    """The structured script, falling back to the plain-text one from older runs"""
+    path = Path(path)
+    if path.exists():
+        return EpisodeScript.load(path)
+    text_path = Path(text_path)
+    if text_path.exists():
+        return EpisodeScript.from_text(text_path.read_text())
+    raise FileNotFoundError(f"No episode script at {path} or {text_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Validate or convert an episode script")
+    parser.add_argument("--from-text", type=Path, help="Convert a plain-text script to the JSON artifact")
+    args = parser.parse_args()
+
+    try:
+        if args.from_text:
+            script = EpisodeScript.from_text(args.from_text.read_text())
+            print(f"💾 Saved: {script.save()}")
+        else:
+            script = load_episode_script().validate()
+        print(f"📜 Episode script v{script.version} for {script.date}")
+        for section in script.sections:
+            cues = sum(len(p.cues) for p in section.paragraphs)
+            print(f"   [{int(section.start_s) // 60:02d}:{int(section.start_s) % 60:02d}] {section.name:<12} "
+                  f"{len(section.paragraphs)} paragraphs, {len(section.text())} chars, {cues} cues")
+    except Exception as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
@@ -3,13 +3,22 @@
 Fetch latest AI/Tech news from various RSS feeds and APIs
 """
 import os
+import io
 import json
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
-import requests
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 import feedparser
-from bs4 import BeautifulSoup
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from http_client import cached_get, get_cache, fetch_concurrently, set_host_rate
+from dedup import deduplicate_articles
+from article_store import ArticleStore
+from ranking import rank_articles
+from html_text import extract_text
 
 # Output directories
 DATA_DIR = Path("data")
@@ -17,16 +26,21 @@ DATA_DIR.mkdir(exist_ok=True)
 
 
 # News sources configuration
+# Each entry needs a name, a url and a type matching a registered adapter.
+# Optional keys: limit (max articles), deadline (seconds), enabled.
+# Set NEWS_SOURCES_FILE to a YAML or JSON file to replace this list.
 NEWS_SOURCES = [
     {
-        "name": "Hacker News - AI",
+        "name": "Hacker News",
         "url": "https://hn.algolia.com/api/v1/search?tags=story&query=AI&hitsPerPage=20",
         "type": "api"
     },
     {
-        "name": "arXiv AI Papers",
-        "url": "http://export.arxiv.org/api/query?search_query=cat:cs.AI&sortBy=submittedDate&sortOrder=descending&max_results=10",
-        "type": "arxiv"
+        "name": "arXiv",
+        "url": "http://export.arxiv.org/api/query?search_query=cat:cs.AI+OR+cat:cs.LG+OR+cat:cs.CL&sortBy=submittedDate&sortOrder=descending",
+        "type": "arxiv",
+        "limit": 50,
+        "deadline": 30
     },
     {
         "name": "AI Weekly",
@@ -34,89 +48,165 @@ NEWS_SOURCES = [
         "type": "rss"
     },
     {
-        "name": "Tech Crunch AI",
+        "name": "TechCrunch AI",
         "url": "https://techcrunch.com/category/artificial-intelligence/feed/",
         "type": "rss"
     },
 ]
 
+# Per-host politeness overrides (requests per second, burst)
+# arXiv asks API clients for no more than one request every three seconds
+NEWS_HOST_LIMITS = {
+    "export.arxiv.org": {"rate": 1 / 3, "burst": 1},
+}
+
+# arXiv Atom paging
+ARXIV_PAGE_SIZE = int(os.environ.get("ARXIV_PAGE_SIZE", "100"))
+ATOM = "{http://www.w3.org/2005/Atom}"
+ATOM_ENTRY = ATOM + "entry"
+ATOM_TITLE = ATOM + "title"
+ATOM_SUMMARY = ATOM + "summary"
+ATOM_ID = ATOM + "id"
+ATOM_PUBLISHED = ATOM + "published"
+
+# Source type -> adapter function, filled by @register_source_type
+SOURCE_ADAPTERS = {}
+
+
+def register_source_type(source_type):
+    """Register an adapter for a source type (called as adapter(url, source_name, limit))"""
+    def decorator(func):
+        SOURCE_ADAPTERS[source_type] = func
+        return func
+    return decorator
+
+
+def load_news_sources():
+    """Load the source registry from NEWS_SOURCES_FILE, or fall back to NEWS_SOURCES"""
+    sources_file = os.environ.get("NEWS_SOURCES_FILE")
+    if not sources_file:
+        return NEWS_SOURCES, NEWS_HOST_LIMITS
+
+    with open(sources_file) as f:
+        if sources_file.endswith((".yaml", ".yml")):
+            import yaml
+            config = yaml.safe_load(f)
+        else:
+            config = json.load(f)
 
-def fetch_hackernews():
+    # Accept either a bare list of sources or {"sources": [...], "hosts": {...}}
+    if isinstance(config, list):
+        return config, NEWS_HOST_LIMITS
+    hosts = {**NEWS_HOST_LIMITS, **config.get("hosts", {})}
+    return config.get("sources", []), hosts
+
+
+@register_source_type("api")
+def fetch_hackernews(url, source_name="Hacker News", limit=10, timeout=10):
     """Fetch stories from Hacker News API"""
-    print("📰 Fetching from Hacker News...")
+    print(f"📰 Fetching from {source_name}...")
     try:
-        response = requests.get(
-            "https://hn.algolia.com/api/v1/search?tags=story&query=AI&hitsPerPage=20",
-            timeout=10
-        )
+        response = cached_get(url, timeout=timeout)
         data = response.json()
         
         articles = []
-        for hit in data.get('hits', [])[:10]:
+        for hit in data.get('hits', [])[:limit]:
             articles.append({
                 'title': hit.get('title', ''),
                 'url': hit.get('url', ''),
-                'summary': hit.get('story_text', '')[:200] if hit.get('story_text') else '',
-                'source': 'Hacker News',
+                'summary': extract_text(hit.get('story_text') or '', 200),
+                'source': source_name,
                 'published_at': hit.get('created_at', ''),
                 'points': hit.get('points', 0)
             })
         
-        print(f"   ✅ Found {len(articles)} articles from Hacker News")
+        print(f"   ✅ Found {len(articles)} articles from {source_name}")
         return articles
     except Exception as e:
-        print(f"   ❌ Error fetching Hacker News: {e}")
+        print(f"   ❌ Error fetching {source_name}: {e}")
         return []
 
 
-def fetch_arxiv():
-    """Fetch papers from arXiv API"""
-    print("🔬 Fetching from arXiv...")
+def iter_atom_entries(stream):
+    """
+    Yield arXiv Atom entries as dicts while parsing incrementally.
+
+    Each <entry> is cleared as soon as it has been read and detached from the
+    root, so memory stays flat however many entries a page holds.
+    """
+    from xml.etree import ElementTree as ET
+
+    root = None
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if root is None:
+            root = elem
+        if event != "end" or elem.tag != ATOM_ENTRY:
+            continue
+
+        yield {
+            'title': " ".join((elem.findtext(ATOM_TITLE) or "").split()),
+            'summary': " ".join((elem.findtext(ATOM_SUMMARY) or "").split()),
+            'url': (elem.findtext(ATOM_ID) or "").strip(),
+            'published_at': (elem.findtext(ATOM_PUBLISHED) or "").strip(),
+        }
+        elem.clear()
+        root.remove(elem)
+
+
+def _arxiv_page_url(url, start, max_results):
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("start", "max_results")]
+    query += [("start", str(start)), ("max_results", str(max_results))]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+@register_source_type("arxiv")
+def fetch_arxiv(url, source_name="arXiv", limit=10, timeout=10):
+    """Fetch papers from arXiv API, paging with start/max_results until limit"""
+    print(f"🔬 Fetching from {source_name}...")
+    articles = []
     try:
-        response = requests.get(
-            "http://export.arxiv.org/api/query?search_query=cat:cs.AI&sortBy=submittedDate&sortOrder=descending&max_results=10",
-            timeout=10
-        )
-        
-        from xml.etree import ElementTree as ET
-        root = ET.fromstring(response.content)
-        
-        articles = []
-        for entry in root.findall('{http://www.w3.org/2005/Atom}entry')[:5]:
-            title = entry.find('{http://www.w3.org/2005/Atom}title').text.strip()
-            summary = entry.find('{http://www.w3.org/2005/Atom}summary').text.strip()[:200]
-            link = entry.find('{http://www.w3.org/2005/Atom}id').text
-            published = entry.find('{http://www.w3.org/2005/Atom}published').text
+        start = 0
+        while len(articles) < limit:
+            page_size = min(ARXIV_PAGE_SIZE, limit - len(articles))
+            response = cached_get(_arxiv_page_url(url, start, page_size), timeout=timeout)
             
-            articles.append({
-                'title': title,
-                'url': link,
-                'summary': summary,
-                'source': 'arXiv',
-                'published_at': published,
-                'type': 'research_paper'
-            })
+            count = 0
+            for entry in iter_atom_entries(io.BytesIO(response.content)):
+                count += 1
+                articles.append({
+                    **entry,
+                    'summary': entry['summary'][:200],
+                    'source': source_name,
+                    'type': 'research_paper'
+                })
+            
+            # A short page means the query is exhausted
+            if count < page_size:
+                break
+            start += page_size
         
-        print(f"   ✅ Found {len(articles)} papers from arXiv")
+        print(f"   ✅ Found {len(articles)} papers from {source_name}")
         return articles
     except Exception as e:
-        print(f"   ❌ Error fetching arXiv: {e}")
-        return []
+        print(f"   ❌ Error fetching {source_name}: {e}")
+        # Keep the pages that did arrive
+        return articles
 
 
-def fetch_rss(url, source_name):
+@register_source_type("rss")
+def fetch_rss(url, source_name, limit=10, timeout=10):
     """Fetch articles from RSS feed"""
     print(f"📡 Fetching from {source_name}...")
     try:
-        feed = feedparser.parse(url)
+        # Download through the pooled, revalidating client; feedparser only parses
+        response = cached_get(url, timeout=timeout)
+        feed = feedparser.parse(response.content)
         
         articles = []
-        for entry in feed.entries[:10]:
+        for entry in feed.entries[:limit]:
             # Extract text from HTML summary if present
-            summary = entry.get('summary', '')
-            if summary:
-                soup = BeautifulSoup(summary, 'html.parser')
-                summary = soup.get_text()[:200]
+            summary = extract_text(entry.get('summary', ''), 200)
             
             articles.append({
                 'title': entry.get('title', ''),
@@ -141,24 +231,53 @@ def fetch_all_news():
     
     all_articles = []
     
-    # Fetch from each source
-    all_articles.extend(fetch_hackernews())
-    all_articles.extend(fetch_arxiv())
-    all_articles.extend(fetch_rss(
-        "https://www.artificialintelligence-news.com/feed/",
-        "AI Weekly"
-    ))
-    all_articles.extend(fetch_rss(
-        "https://techcrunch.com/category/artificial-intelligence/feed/",
-        "TechCrunch AI"
-    ))
+    sources, host_limits = load_news_sources()
+    for host, limit in host_limits.items():
+        set_host_rate(host, limit["rate"], limit.get("burst"))
+    
+    # Fetch all sources concurrently; each gets its own deadline so a
+    # stalled feed only drops that feed instead of blocking the stage,
+    # while per-host token buckets keep us polite to any single domain
+    jobs = []
+    for source in sources:
+        if not source.get("enabled", True):
+            continue
+        adapter = SOURCE_ADAPTERS.get(source["type"])
+        if adapter is None:
+            print(f"   ⚠️  Unknown source type '{source['type']}' for {source['name']}, skipping")
+            continue
+        job = {
+            "name": source["name"],
+            "func": adapter,
+            "args": (source["url"], source["name"]),
+            "kwargs": {"limit": source.get("limit", 10)},
+        }
+        if "deadline" in source:
+            job["deadline"] = source["deadline"]
+        jobs.append(job)
+    
+    for _, articles in fetch_concurrently(jobs):
+        all_articles.extend(articles)
+    
+    # The same story often arrives from several sources
+    all_articles = deduplicate_articles(all_articles)
+    
+    # Remember everything we fetched, but never hand an already-covered story to the LLM
+    with ArticleStore() as store:
+        new_count = store.add_articles(all_articles)
+        novel = store.filter_novel(all_articles)
+        pending = len(store.new_since_last_episode())
+    print(f"   🗃️  {new_count} new articles stored, {len(all_articles) - len(novel)} already covered, "
+          f"{pending} uncovered since the last episode")
+    all_articles = novel
+    
+    # Rank by topical relevance, popularity, coverage and recency
+    all_articles = rank_articles(all_articles)
     
-    # Sort by recency (if possible)
-    all_articles = sorted(
-        all_articles,
-        key=lambda x: x.get('points', 0) if 'points' in x else 0,
-        reverse=True
-    )
+    cache = get_cache()
+    if cache is not None:
+        stats = cache.stats()
+        print(f"   🗄️  HTTP cache: {stats['hits']} hits, {stats['misses']} misses")
     
     print("\n" + "=" * 70)
     print(f"✅ Total articles fetched: {len(all_articles)}")
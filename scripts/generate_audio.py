@@ -2,17 +2,45 @@
 """
 Generate audio from episode script using TTS
 Supports: ElevenLabs, OpenAI TTS, Google TTS
+The script is synthesized in parallel chunks and stitched in order (tts_engine.py)
 """
 import os
 import sys
+from functools import partial
 from pathlib import Path
 
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from episode_script import load_episode_script
+from tts_cache import TTSCache, tts_cache_enabled
+from tts_engine import TTS_CHUNK_CHARS, synthesize
+
 # Output directories
 OUTPUT_DIR = Path("output")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Most characters each provider accepts in one request
+PROVIDER_MAX_CHARS = {
+    "elevenlabs": 5000,
+    "openai": 4096,
+    "gtts": 5000,
+}
+
+
+def chunk_chars(provider):
+    """Chunk size for ``provider``: TTS_CHUNK_CHARS, capped at its input limit"""
+    return min(TTS_CHUNK_CHARS, PROVIDER_MAX_CHARS[provider])
+
+
+def report(stats, output_file):
+    retries = f", {stats['retries']} retried" if stats["retries"] else ""
+    cached = f", {stats['cached']} cached" if stats["cached"] else ""
+    pauses = f", {stats['pause_s']:.1f}s of pauses" if stats["pause_s"] else ""
+    print(f"✅ Audio saved: {output_file} ({stats['chunks']} chunks{cached}{pauses} in {stats['seconds']:.1f}s{retries})")
 
-def generate_audio_elevenlabs(script_text: str, output_file: str):
+
+def generate_audio_elevenlabs(sections, output_file: str, cache=None):
     """Generate audio using ElevenLabs API"""
     try:
         from elevenlabs import generate, save, Voice
@@ -25,14 +53,19 @@ def generate_audio_elevenlabs(script_text: str, output_file: str):
         
         print("🎤 Generating audio with ElevenLabs...")
         
-        audio = generate(
-            text=script_text,
-            voice=Voice(voice_id=voice_id),
-            model="eleven_multilingual_v2"
-        )
+        model = "eleven_multilingual_v2"
+        
+        def synth(text, path):
+            audio = generate(
+                text=text,
+                voice=Voice(voice_id=voice_id),
+                model=model
+            )
+            save(audio, path)
         
-        save(audio, output_file)
-        print(f"✅ Audio saved: {output_file}")
+        params = {"provider": "elevenlabs", "voice": voice_id, "model": model}
+        report(synthesize(sections, synth, output_file, max_chars=chunk_chars("elevenlabs"),
+                          cache=cache, params=params), output_file)
         return True
         
     except Exception as e:
@@ -40,7 +73,7 @@ def generate_audio_elevenlabs(script_text: str, output_file: str):
         return False
 
 
-def generate_audio_openai(script_text: str, output_file: str):
+def generate_audio_openai(sections, output_file: str, cache=None):
     """Generate audio using OpenAI TTS"""
     try:
         from openai import OpenAI
@@ -52,14 +85,17 @@ def generate_audio_openai(script_text: str, output_file: str):
         
         print(f"🎤 Generating audio with OpenAI TTS ({voice})...")
         
-        response = client.audio.speech.create(
-            model=model,
-            voice=voice,
-            input=script_text
-        )
-        
-        response.stream_to_file(output_file)
-        print(f"✅ Audio saved: {output_file}")
+        def synth(text, path):
+            response = client.audio.speech.create(
+                model=model,
+                voice=voice,
+                input=text
+            )
+            response.stream_to_file(path)
+        
+        params = {"provider": "openai", "voice": voice, "model": model}
+        report(synthesize(sections, synth, output_file, max_chars=chunk_chars("openai"),
+                          cache=cache, params=params), output_file)
         return True
         
     except Exception as e:
@@ -67,17 +103,19 @@ def generate_audio_openai(script_text: str, output_file: str):
         return False
 
 
-def generate_audio_gtts(script_text: str, output_file: str):
+def generate_audio_gtts(sections, output_file: str, language: str = "en", cache=None):
     """Generate audio using Google TTS (free fallback)"""
     try:
         from gtts import gTTS
         
         print("🎤 Generating audio with Google TTS (free)...")
         
-        tts = gTTS(text=script_text, lang='en', slow=False)
-        tts.save(output_file)
+        def synth(text, path):
+            gTTS(text=text, lang=language, slow=False).save(path)
         
-        print(f"✅ Audio saved: {output_file}")
+        params = {"provider": "gtts", "language": language}
+        report(synthesize(sections, synth, output_file, max_chars=chunk_chars("gtts"),
+                          cache=cache, params=params), output_file)
         return True
         
     except Exception as e:
@@ -91,16 +129,19 @@ def generate_audio():
     print("🎤 Audio Generation for TV.RUSLANMV.COM")
     print("=" * 70)
     
-    # Load script
-    script_file = OUTPUT_DIR / "episode_script.txt"
-    if not script_file.exists():
-        print(f"❌ Script not found: {script_file}")
+    # Load script (timing markers and stage directions are cues, not speech)
+    try:
+        script = load_episode_script()
+    except (OSError, ValueError) as e:
+        print(f"❌ Script not found: {e}")
         sys.exit(1)
     
-    with open(script_file, 'r') as f:
-        script_text = f.read()
+    # Each paragraph is synthesized (and cached) on its own; its [PAUSE] cues
+    # become silence after it, matching the subtitle timing
+    sections = [[(p.text, p.pause_seconds()) for p in section.paragraphs] for section in script.sections]
+    print(f"📝 Script: {len(script.sections)} sections, {len(script.spoken_text())} spoken characters")
     
-    print(f"📝 Script length: {len(script_text)} characters")
+    cache = TTSCache() if tts_cache_enabled() else None
     
     # Output file
     output_file = OUTPUT_DIR / "episode_audio.mp3"
@@ -109,7 +150,7 @@ def generate_audio():
     providers = [
         ("ElevenLabs", generate_audio_elevenlabs, os.getenv("ELEVENLABS_API_KEY")),
         ("OpenAI TTS", generate_audio_openai, os.getenv("OPENAI_API_KEY")),
-        ("Google TTS", generate_audio_gtts, True)  # Always available
+        ("Google TTS", partial(generate_audio_gtts, language=script.language), True)  # Always available
     ]
     
     success = False
@@ -119,10 +160,16 @@ def generate_audio():
             continue
         
         print(f"\n🎯 Trying {name}...")
-        if func(script_text, str(output_file)):
+        if func(sections, str(output_file), cache=cache):
             success = True
             break
     
+    if cache:
+        stats = cache.stats()
+        print(f"💾 TTS cache: {stats['hits']}/{stats['hits'] + stats['misses']} chunks reused "
+              f"({stats['hit_rate']:.0%}, {stats['saved_chars']} chars not synthesized), "
+              f"{stats['entries']} entries, {stats['bytes'] / 1024 / 1024:.1f} MB")
+    
     if success:
         # Get audio duration
         try:
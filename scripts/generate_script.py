@@ -3,16 +3,31 @@
 Generate TV Episode Script using CrewAI and LLM (Ollama or watsonx.ai)
 """
 import os
+import re
 import sys
 import json
+import time
+import argparse
+import difflib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
 # Add scripts directory to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from llm_client import get_llm, get_model_name, is_using_watsonx
-from crewai import Agent, Task, Crew, Process
+from llm_client import (
+    get_llm, get_model_name, get_router_models, is_using_ollama, is_using_watsonx,
+    llm_cache_enabled, llm_max_concurrency, llm_metrics_enabled, llm_record_dir,
+)
+from article_store import ArticleStore
+from episode_script import EPISODE_SCRIPT_FILE
+from prompt_compaction import compact_news, compact_packages
+from script_sections import (
+    BASE_LANGUAGE, DEFAULT_VARIANT, FORMATS, SECTION_NAMES, SECTION_PROMPT_VERSION, SectionStore,
+    entry_id, input_key, parse_section_names, parse_variants, section_description, section_key,
+    translation_description, translation_key, variant_id,
+)
 
 
 # Output directories
@@ -20,6 +35,9 @@ OUTPUT_DIR = Path("output")
 DATA_DIR = Path("data")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
+# Stories the news researcher picks for the episode ("TOP 3" in its task)
+TOP_STORIES = 3
+
 
 def load_news_data():
     """Load fetched news data"""
@@ -39,8 +57,25 @@ def load_package_data():
     return {"packages": []}
 
 
+def create_script_writer(llm):
+    """Script writer agent (one per section task, so sections can run concurrently)"""
+    from crewai import Agent
+    
+    return Agent(
+        role="TV Script Writer",
+        goal="Create engaging, informative TV scripts optimized for both humans and AI",
+        backstory="""You are a seasoned TV writer specializing in tech content. You know how to
+        structure content for maximum engagement in a 10-minute format. Your scripts are clear,
+        concise, and perfect for video narration.""",
+        llm=llm,
+        verbose=True,
+        allow_delegation=False
+    )
+
+
 def create_agents(llm):
     """Create specialized agents for episode generation"""
+    from crewai import Agent
     
     # News Researcher Agent
     news_researcher = Agent(
@@ -55,16 +90,7 @@ def create_agents(llm):
     )
     
     # Script Writer Agent
-    script_writer = Agent(
-        role="TV Script Writer",
-        goal="Create engaging, informative TV scripts optimized for both humans and AI",
-        backstory="""You are a seasoned TV writer specializing in tech content. You know how to
-        structure content for maximum engagement in a 10-minute format. Your scripts are clear,
-        concise, and perfect for video narration.""",
-        llm=llm,
-        verbose=True,
-        allow_delegation=False
-    )
+    script_writer = create_script_writer(llm)
     
     # Package Analyst Agent
     package_analyst = Agent(
@@ -80,22 +106,21 @@ def create_agents(llm):
     return news_researcher, script_writer, package_analyst
 
 
-def create_tasks(agents, news_data, package_data):
-    """Create tasks for episode generation"""
-    
-    news_researcher, script_writer, package_analyst = agents
-    today = datetime.now().strftime("%Y-%m-%d")
+def crew_parallel_enabled():
+    """False when NEWS_CREW_PARALLEL=off (generate_script.py --sequential sets it)"""
+    return os.environ.get("NEWS_CREW_PARALLEL", "on").lower() not in ("0", "off", "false", "no")
+
+
+def create_research_tasks(agents, news_summary, package_summary):
+    """
+    Create the research tasks, keyed "news" and "package".
     
-    # Convert data to string format for agents
-    news_summary = "\n".join([
-        f"- {article['title']}: {article.get('summary', article.get('description', ''))}"
-        for article in news_data.get('articles', [])[:10]
-    ])
+    ``news_summary`` and ``package_summary`` are the compacted context
+    blocks from prompt_compaction.py.
+    """
+    from crewai import Task
     
-    package_summary = "\n".join([
-        f"- {pkg['name']}: {pkg.get('description', '')}"
-        for pkg in package_data.get('packages', [])[:10]
-    ])
+    news_researcher, _, package_analyst = agents
     
     # Task 1: Analyze News
     analyze_task = Task(
@@ -119,7 +144,8 @@ def create_tasks(agents, news_data, package_data):
         ...
         """,
         expected_output="Top 3 AI/tech news stories with summaries and importance",
-        agent=news_researcher
+        agent=news_researcher,
+        context=[]
     )
     
     # Task 2: Analyze Package
@@ -142,60 +168,143 @@ def create_tasks(agents, news_data, package_data):
         Why it's trending: [1-2 sentences]
         """,
         expected_output="Package of the day with description and usage",
-        agent=package_analyst
+        agent=package_analyst,
+        context=[]
     )
     
-    # Task 3: Write Complete Script
-    script_task = Task(
-        description=f"""Write a complete 10-minute TV script for episode {today}.
-        
-        Structure (with timing):
-        1. OPENING (30 seconds)
-           - Welcome message
-           - Today's date
-           - Brief overview of topics
-        
-        2. NEWS HIGHLIGHTS (3 minutes)
-           - Cover the TOP 3 stories from the news researcher
-           - Keep each story to ~1 minute
-        
-        3. TECH DEEP DIVE (2.5 minutes)
-           - Expand on the most interesting story
-           - Add context and implications
-        
-        4. PACKAGE OF THE DAY (1 minute)
-           - Present the featured package
-           - Show why developers should care
-        
-        5. QUICK TAKES (2 minutes)
-           - 3-4 additional brief news items
-           - 30 seconds each
-        
-        6. CLOSING (1 minute)
-           - Recap main points
-           - Call to action (subscribe, visit website)
-           - Outro
-        
-        Guidelines:
-        - Write for spoken delivery (natural, conversational)
-        - Use short sentences and paragraphs
-        - Include timing markers [MM:SS]
-        - Add [PAUSE] for dramatic effect where appropriate
-        - Keep technical terms but explain them simply
-        - Make it engaging for both humans and AI
-        
-        The script should be ready for text-to-speech conversion.
-        """,
-        expected_output="Complete TV script with timing markers and clear structure",
-        agent=script_writer,
-        context=[analyze_task, package_task]
+    return {"news": analyze_task, "package": package_task}
+
+
+def create_section_tasks(llm, todo, inputs):
+    """One script-writing task per (section, revision) in ``todo``"""
+    from crewai import Task
+    
+    return [
+        Task(
+            description=section_description(section, inputs, revision),
+            expected_output=f"The {section['title']} section ({section['duration']}) with timing markers",
+            agent=create_script_writer(llm),
+            context=[]
+        )
+        for section, revision in todo
+    ]
+
+
+def create_translator(llm):
+    """Translator agent (one per translation task)"""
+    from crewai import Agent
+    
+    return Agent(
+        role="TV Script Translator",
+        goal="Translate TV scripts so they sound native when read aloud",
+        backstory="""You are a broadcast translator who adapts tech news scripts for
+        international audiences, keeping timing markers and technical names intact.""",
+        llm=llm,
+        verbose=True,
+        allow_delegation=False
+    )
+
+
+def create_translation_tasks(llm, todo):
+    """One translation task per (section, source text, language) in ``todo``"""
+    from crewai import Task
+    
+    return [
+        Task(
+            description=translation_description(section, source, language),
+            expected_output=f"The {section['title']} section translated, with its timing markers",
+            agent=create_translator(llm),
+            context=[]
+        )
+        for section, source, language in todo
+    ]
+
+
+def selected_stories(research, items, limit=TOP_STORIES):
+    """
+    The compacted news items the researcher chose, matched by the titles on
+    its "STORY n: [Title]" lines; the top ranked items if none match.
+    """
+    titles = {" ".join((item.get("title") or "").lower().split()): item for item in items}
+    chosen = []
+    for line in re.findall(r"^\W*STORY \d+\W*:\s*(.+)$", research or "", re.IGNORECASE | re.MULTILINE):
+        match = difflib.get_close_matches(" ".join(line.strip("[]*# ").lower().split()), titles, n=1, cutoff=0.6)
+        if match and titles[match[0]] not in chosen:
+            chosen.append(titles[match[0]])
+    return chosen[:limit] or items[:limit]
+
+
+def save_structured(episode, path):
+    """
+    Validate and save ``episode`` to ``path``; None if it is invalid. A stale
+    file from an earlier run is removed, so later stages fall back to the
+    plain-text script next to it instead of reading yesterday's episode.
+    """
+    try:
+        return episode.save(path)
+    except ValueError as e:
+        print(f"   ⚠️  {e}; later stages will use the plain-text script")
+        Path(path).unlink(missing_ok=True)
+        return None
+
+
+def _kickoff(tasks):
+    """Run ``tasks`` in order as one sequential crew"""
+    from crewai import Crew, Process
+    
+    agents = list({id(task.agent): task.agent for task in tasks}.values())
+    crew = Crew(
+        agents=agents,
+        tasks=tasks,
+        process=Process.sequential,
+        verbose=True
     )
+    crew.kickoff()
+
+
+def run_crew(tasks, parallel=False):
+    """
+    Run ``tasks`` and return the wall time.
     
-    return [analyze_task, package_task, script_task]
+    The tasks must be independent (``context=[]``, so crewai doesn't feed
+    earlier outputs into later tasks). With ``parallel`` each task is its own
+    single-task crew on a thread pool, so all of them start at once (the LLM
+    concurrency cap bounds how many calls reach the backend); otherwise they
+    run one after the other in a single crew.
+    """
+    start = time.perf_counter()
+    if parallel and len(tasks) > 1:
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="crew") as executor:
+            for future in [executor.submit(_kickoff, [task]) for task in tasks]:
+                future.result()
+    else:
+        _kickoff(tasks)
+    return time.perf_counter() - start
+
+
+def init_llm(warm_ollama=False):
+    """The crew's LLM; with Ollama, the model starts loading first so it overlaps agent setup"""
+    print("\n🤖 Initializing LLM...")
+    if warm_ollama:
+        from ollama_manager import warm_up_if_needed
+        
+        warm_up_if_needed()
+    return get_llm()
 
 
-def generate_script():
-    """Generate episode script using CrewAI"""
+def generate_script(sections=None, variants=None):
+    """
+    Generate episode script using CrewAI.
+    
+    Research outputs and the six script sections are stored with the
+    inputs they were made from (see script_sections.py); only stale ones,
+    plus the names in ``sections``, are regenerated before the script is
+    reassembled.
+    
+    ``variants`` (from parse_variants, default the full English episode)
+    share that research: each format is written once and each extra
+    language is a translation of it, under the same concurrency cap.
+    """
     
     print("=" * 70)
     print("📺 TV.RUSLANMV.COM - Episode Script Generation")
@@ -210,6 +319,9 @@ def generate_script():
     
     print("=" * 70)
     
+    # The Ollama model is only loaded once a task turns out to need it
+    warm_ollama = is_using_ollama() and not get_router_models()
+    
     # Load data
     print("\n📰 Loading news data...")
     news_data = load_news_data()
@@ -219,43 +331,174 @@ def generate_script():
     package_data = load_package_data()
     print(f"   Found {len(package_data.get('packages', []))} trending packages")
     
-    # Initialize LLM
-    print("\n🤖 Initializing LLM...")
-    llm = get_llm()
-    print("   ✅ LLM ready")
+    if llm_record_dir():
+        from llm_replay import record_inputs
+        
+        record_inputs(llm_record_dir(), [DATA_DIR / "latest_news.json", DATA_DIR / "trending_packages.json"])
     
-    # Create agents
-    print("\n👥 Creating AI agents...")
-    agents = create_agents(llm)
-    print("   ✅ Agents created: News Researcher, Script Writer, Package Analyst")
+    # Fit the ranked items into a fixed prompt budget
+    news_context = compact_news(news_data.get('articles', []))
+    package_context = compact_packages(package_data.get('packages', []))
+    for label, context in (("News", news_context), ("Package", package_context)):
+        print(f"   🗜️  {label} context: {len(context['items'])} items, "
+              f"{context['tokens']}/{context['budget']} tokens")
     
-    # Create tasks
-    print("\n📋 Setting up tasks...")
-    tasks = create_tasks(agents, news_data, package_data)
-    print("   ✅ Tasks created")
+    model = get_model_name()
+    today = datetime.now().strftime("%Y-%m-%d")
+    parallel = crew_parallel_enabled()
+    store = SectionStore()
+    # --no-cache means a completely fresh episode
+    fresh = not llm_cache_enabled()
+    variants = variants or parse_variants(os.environ.get("NEWS_SCRIPT_VARIANTS", DEFAULT_VARIANT))
+    forced = set(
+        [s["name"] for fmt in FORMATS.values() for s in fmt] if fresh else sections or ()
+    )
+    llm = agents = None
+    crew_seconds = 0.0
     
-    # Create and run crew
-    print("\n🚀 Starting episode generation...")
-    print("-" * 70)
+    # Research: reuse stored outputs made from the same context
+    research_inputs = {"news": news_context["text"], "package": package_context["text"]}
+    research_keys = {
+        name: input_key(SECTION_PROMPT_VERSION, name, text, model) for name, text in research_inputs.items()
+    }
+    research = {
+        name: None if fresh else store.get_research(name, key) for name, key in research_keys.items()
+    }
+    stale = [name for name, text in research.items() if text is None]
     
-    crew = Crew(
-        agents=list(agents),
-        tasks=tasks,
-        process=Process.sequential,
-        verbose=True
-    )
+    print("\n🔎 Research...")
+    for name in research:
+        if name not in stale:
+            print(f"   ♻️  Reusing stored {name} research")
+    if stale:
+        llm = init_llm(warm_ollama)
+        agents = create_agents(llm)
+        print("   ✅ Agents created: News Researcher, Script Writer, Package Analyst")
+        if parallel and len(stale) > 1:
+            print(f"   ⚡ News and package analysis run in parallel "
+                  f"(max {llm_max_concurrency()} concurrent LLM calls)")
+        
+        if warm_ollama:
+            from ollama_manager import ensure_ready
+            
+            ensure_ready()
+        
+        research_tasks = create_research_tasks(agents, news_context["text"], package_context["text"])
+        tasks = [research_tasks[name] for name in stale]
+        print("-" * 70)
+        crew_seconds += run_crew(tasks, parallel)
+        print("-" * 70)
+        for name, task in zip(stale, tasks):
+            research[name] = task.output.raw
+            store.put_research(name, research_keys[name], research[name])
+        store.save()
+    
+    # Writing: each format's sections whose inputs changed or that were asked for
+    inputs = {**research, "date": today, "headlines": news_context["text"]}
+    formats = list(dict.fromkeys(v["format"] for v in variants))
+    todo, planned = [], []
+    for fmt in formats:
+        base = {"format": fmt, "language": BASE_LANGUAGE}
+        for section in FORMATS[fmt]:
+            entry, key = entry_id(base, section["name"]), section_key(section, inputs, model)
+            if section["name"] in forced:
+                todo.append((section, store.revision(entry, key)))
+            elif store.get_section(entry, key) is None:
+                todo.append((section, 1))
+            else:
+                continue
+            planned.append((entry, key))
+    
+    # Translation: other languages are translated from the written sections
+    translations = [v for v in variants if v["language"] != BASE_LANGUAGE]
+    total = sum(len(FORMATS[fmt]) for fmt in formats) + sum(len(FORMATS[v["format"]]) for v in translations)
+    
+    if len(variants) > 1:
+        print(f"\n🌐 Variants: {', '.join(variant_id(v) for v in variants)} (one research pass)")
+    print(f"\n📑 Script sections: {len(todo)} to write"
+          + (f" ({', '.join(entry for entry, _ in planned)})" if planned else ""))
+    if todo:
+        if llm is None:
+            llm = init_llm(warm_ollama)
+            if warm_ollama:
+                from ollama_manager import ensure_ready
+                
+                ensure_ready()
+        
+        tasks = create_section_tasks(llm, todo, inputs)
+        print("-" * 70)
+        crew_seconds += run_crew(tasks, parallel)
+        print("-" * 70)
+        for (section, revision), (entry, key), task in zip(todo, planned, tasks):
+            store.put_section(entry, key, task.output.raw, revision, model)
+        store.save()
+    written = [entry for entry, _ in planned]
+    
+    todo, planned = [], []
+    for variant in translations:
+        base = {"format": variant["format"], "language": BASE_LANGUAGE}
+        for section in FORMATS[variant["format"]]:
+            source = store.sections[entry_id(base, section["name"])]["text"]
+            entry, key = entry_id(variant, section["name"]), translation_key(source, variant["language"], model)
+            if fresh or store.get_section(entry, key) is None:
+                todo.append((section, source, variant["language"]))
+                planned.append((entry, key))
+    if todo:
+        print(f"\n🌐 Translations: {len(todo)} to write ({', '.join(entry for entry, _ in planned)})")
+        if llm is None:
+            llm = init_llm(warm_ollama)
+            if warm_ollama:
+                from ollama_manager import ensure_ready
+                
+                ensure_ready()
+        
+        tasks = create_translation_tasks(llm, todo)
+        print("-" * 70)
+        crew_seconds += run_crew(tasks, parallel)
+        print("-" * 70)
+        for (entry, key), task in zip(planned, tasks):
+            store.put_section(entry, key, task.output.raw, 1, model)
+        store.save()
+    written += [entry for entry, _ in planned]
+    print(f"   ♻️  {total - len(written)} of {total} sections reused from {store.path}")
     
-    result = crew.kickoff()
+    # The first variant is the episode; the rest go to output/variants/<variant>/
+    primary = variants[0]
+    result = store.assemble(primary)
     
-    print("-" * 70)
-    print("\n✅ Episode generation complete!")
+    print(f"\n✅ Episode generation complete! ({crew_seconds:.1f}s)")
+    if llm_cache_enabled():
+        from llm_cache import print_cache_stats
+        
+        print_cache_stats()
+    if llm_metrics_enabled():
+        from llm_metrics import collector
+        
+        collector.print_summary()
+        print(f"   📄 LLM trace saved to: {collector.write_trace()}")
     
     # Save script
     script_file = OUTPUT_DIR / "episode_script.txt"
     with open(script_file, 'w') as f:
         f.write(str(result))
     
+    # Structured copy for the audio and video stages (validated on save)
+    episode = store.episode_script(today, model, primary)
+    episode_file = save_structured(episode, EPISODE_SCRIPT_FILE)
+    
     print(f"\n💾 Script saved to: {script_file}")
+    if episode_file:
+        print(f"   Structured: {episode_file} ({len(episode.sections)} sections, "
+              f"{sum(len(s.paragraphs) for s in episode.sections)} paragraphs)")
+    
+    variant_files = {variant_id(primary): str(episode_file or script_file)}
+    for variant in variants[1:]:
+        variant_dir = OUTPUT_DIR / "variants" / variant_id(variant)
+        variant_dir.mkdir(parents=True, exist_ok=True)
+        (variant_dir / "episode_script.txt").write_text(store.assemble(variant))
+        variant_file = save_structured(store.episode_script(today, model, variant), variant_dir / "episode_script.json")
+        variant_files[variant_id(variant)] = str(variant_file or variant_dir / "episode_script.txt")
+        print(f"   Variant {variant_id(variant)}: {variant_files[variant_id(variant)]}")
     print(f"   Length: {len(str(result))} characters")
     print(f"   Lines: {str(result).count(chr(10))} lines")
     
@@ -266,8 +509,24 @@ def generate_script():
         "news_count": len(news_data.get('articles', [])),
         "package_count": len(package_data.get('packages', [])),
         "script_length": len(str(result)),
+        "script_file": str(episode_file),
+        "prompt_context_tokens": {"news": news_context["tokens"], "packages": package_context["tokens"]},
+        "crew_seconds": round(crew_seconds, 2),
+        "crew_parallel": parallel,
+        "sections": {
+            name: {"revision": entry["revision"], "regenerated": name in written}
+            for name, entry in store.sections.items()
+            if any(name == entry_id(v, s["name"]) for v in variants for s in FORMATS[v["format"]])
+        },
+        "variants": variant_files,
         "generated_by": "CrewAI + " + ("watsonx.ai" if is_using_watsonx() else "Ollama")
     }
+    if llm_metrics_enabled():
+        metadata["llm_usage"] = {**collector.totals(), "by_agent": collector.summary()}
+    if warm_ollama:
+        from ollama_manager import load_warmup_metrics
+        
+        metadata["ollama_warmup"] = load_warmup_metrics()
     
     metadata_file = OUTPUT_DIR / "episode_metadata.json"
     with open(metadata_file, 'w') as f:
@@ -275,6 +534,11 @@ def generate_script():
     
     print(f"📊 Metadata saved to: {metadata_file}")
     
+    # The top stories used in this episode must not be covered again tomorrow;
+    # the rest of the prompt's headlines stay eligible
+    with ArticleStore() as articles:
+        articles.mark_covered(selected_stories(research["news"], news_context["items"]))
+    
     # Preview
     print("\n" + "=" * 70)
     print("📝 SCRIPT PREVIEW (first 500 characters)")
@@ -286,8 +550,26 @@ def generate_script():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate the episode script")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the LLM response cache for a fresh run")
+    parser.add_argument("--sequential", action="store_true", help="Run the crew tasks one after another")
+    parser.add_argument(
+        "--sections", type=parse_section_names, default=None,
+        help=f"Regenerate only these sections and reassemble (comma-separated: {','.join(SECTION_NAMES)})"
+    )
+    parser.add_argument(
+        "--variants", type=parse_variants, default=None,
+        help=f"Comma-separated format[:language] variants sharing one research pass, "
+             f"e.g. full,short,full:es (formats: {','.join(FORMATS)}; default: NEWS_SCRIPT_VARIANTS or full)"
+    )
+    args = parser.parse_args()
+    if args.no_cache:
+        os.environ["NEWS_LLM_CACHE"] = "off"
+    if args.sequential:
+        os.environ["NEWS_CREW_PARALLEL"] = "off"
+    
     try:
-        script = generate_script()
+        script = generate_script(sections=args.sections, variants=args.variants)
         print("\n✅ SUCCESS: Episode script generated!")
         sys.exit(0)
     except Exception as e:
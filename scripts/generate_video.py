@@ -10,32 +10,45 @@ from pathlib import Path
 from datetime import datetime
 import subprocess
 
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from episode_script import load_episode_script
+
 # Output directories
 OUTPUT_DIR = Path("output")
 ASSETS_DIR = Path("assets")
 OUTPUT_DIR.mkdir(exist_ok=True)
 
 
-def create_subtitle_file(script_text: str, duration: float) -> str:
-    """Create SRT subtitle file from script"""
+def create_subtitle_file(script, duration: float) -> str:
+    """Create SRT subtitle file from the structured script"""
     srt_file = OUTPUT_DIR / "episode_subtitles.srt"
     
-    # Simple subtitle generation (split by sentences)
-    sentences = script_text.replace('\n\n', '. ').split('. ')
-    time_per_sentence = duration / len(sentences)
+    # The audio stage inserts each paragraph's [PAUSE] seconds as silence after
+    # it; sentences share the rest of the audio in proportion to their length
+    paragraphs = [p for section in script.sections for p in section.paragraphs]
+    chars = sum(len(s) for p in paragraphs for s in p.sentences())
+    pause_seconds = sum(p.pause_seconds() for p in paragraphs)
+    if pause_seconds >= duration:
+        pause_seconds = 0.0
+    seconds_per_unit = (duration - pause_seconds) / chars if chars else 0.0
     
     with open(srt_file, 'w') as f:
-        for i, sentence in enumerate(sentences, 1):
-            start_time = i * time_per_sentence
-            end_time = (i + 1) * time_per_sentence
-            
-            # Format time as HH:MM:SS,mmm
-            start = format_srt_time(start_time)
-            end = format_srt_time(end_time)
-            
-            f.write(f"{i}\n")
-            f.write(f"{start} --> {end}\n")
-            f.write(f"{sentence.strip()}\n\n")
+        index = 0
+        position = 0.0
+        for paragraph in paragraphs:
+            for sentence in paragraph.sentences():
+                index += 1
+                end = position + len(sentence) * seconds_per_unit
+                
+                # Format time as HH:MM:SS,mmm
+                f.write(f"{index}\n")
+                f.write(f"{format_srt_time(position)} --> {format_srt_time(end)}\n")
+                f.write(f"{sentence}\n\n")
+                position = end
+            if pause_seconds:
+                position += paragraph.pause_seconds()
     
     return str(srt_file)
 
@@ -61,9 +74,7 @@ def generate_video():
         print(f"❌ Audio file not found: {audio_file}")
         sys.exit(1)
     
-    script_file = OUTPUT_DIR / "episode_script.txt"
-    with open(script_file, 'r') as f:
-        script_text = f.read()
+    script = load_episode_script()
     
     # Get audio duration
     print("\n📊 Analyzing audio...")
@@ -78,7 +89,7 @@ def generate_video():
     
     # Create subtitles
     print("\n📝 Generating subtitles...")
-    subtitle_file = create_subtitle_file(script_text, duration)
+    subtitle_file = create_subtitle_file(script, duration)
     print(f"   ✅ Subtitles created: {subtitle_file}")
     
     # Video configuration
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Rate-limit-aware GitHub search client
+Paginates several topic queries concurrently within the X-RateLimit budget,
+revalidates pages with conditional requests and merges results by full_name
+"""
+import os
+import sys
+import math
+import threading
+import time
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from http_client import cached_get, fetch_concurrently
+
+GITHUB_API_BASE = os.environ.get("GITHUB_API_BASE", "https://api.github.com")
+GITHUB_TOKEN = os.environ.get("GITHUB_TOKEN", "")
+
+# Topic queries merged into the trending list
+GITHUB_SEARCH_TOPICS = [
+    topic.strip() for topic in os.environ.get(
+        "GITHUB_SEARCH_TOPICS",
+        "artificial-intelligence,machine-learning,deep-learning,llm,generative-ai,ai-agents",
+    ).split(",") if topic.strip()
+]
+GITHUB_MIN_STARS = int(os.environ.get("GITHUB_MIN_STARS", "1000"))
+
+# The search API returns at most 1000 results per query (10 pages of 100);
+# anonymous runs get a third of the search budget, so they page less deeply
+GITHUB_PER_PAGE = 100
+GITHUB_MAX_PAGES = int(os.environ.get("GITHUB_MAX_PAGES", "10" if GITHUB_TOKEN else "3"))
+
+# Longest we wait for a rate-limit window to reset before skipping a page
+GITHUB_MAX_WAIT = float(os.environ.get("GITHUB_MAX_WAIT", "65"))
+
+# Search allows 30 requests/minute with a token, 10 without
+SEARCH_LIMIT_AUTHENTICATED = 30
+SEARCH_LIMIT_ANONYMOUS = 10
+
+
+class RateLimitBudget:
+    """
+    Client-side mirror of one GitHub rate-limit window.
+
+    Every request reserves a call before it is sent; response headers then
+    replace the estimate with the server's numbers. When the window is
+    spent, callers sleep until ``X-RateLimit-Reset`` instead of collecting
+    403s, or give up if that is further away than ``max_wait``.
+    """
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.remaining = limit
+        self.reset = None
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait=GITHUB_MAX_WAIT):
+        """Reserve one call, waiting for the window to reset if needed; False if out of budget"""
+        while True:
+            with self._lock:
+                now = time.time()
+                if self.reset is not None and now >= self.reset:
+                    self.remaining = self.limit
+                    self.reset = None
+                if self.remaining > 0:
+                    self.remaining -= 1
+                    return True
+                # Unknown reset: GitHub search windows are one minute long
+                wait_for = (self.reset or now + 60) - now + 1
+            if wait_for > max_wait:
+                return False
+            print(f"   ⏳ GitHub rate limit reached, waiting {wait_for:.0f}s for reset")
+            time.sleep(wait_for)
+
+    def update(self, headers):
+        """Sync with X-RateLimit-* response headers"""
+        try:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset = float(headers["X-RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return
+        limit = headers.get("X-RateLimit-Limit")
+
+        with self._lock:
+            if limit and limit.isdigit():
+                self.limit = int(limit)
+            if self.reset is None or reset > self.reset:
+                # New window: the server's count is authoritative
+                self.reset = reset
+                self.remaining = remaining
+            elif reset == self.reset:
+                # Same window: responses arrive out of order, keep the lowest count
+                self.remaining = min(self.remaining, remaining)
+
+    def exhaust(self, retry_after=None):
+        """Mark the window as spent after a 403/429 from the server"""
+        with self._lock:
+            self.remaining = 0
+            if retry_after:
+                self.reset = time.time() + retry_after
+
+
+class GitHubSearchClient:
+    """Concurrent, budgeted search over several queries"""
+
+    def __init__(self, token=GITHUB_TOKEN, api_base=GITHUB_API_BASE, max_wait=GITHUB_MAX_WAIT):
+        self.api_base = api_base.rstrip("/")
+        self.max_wait = max_wait
+        self.headers = {"Accept": "application/vnd.github+json"}
+        if token:
+            self.headers["Authorization"] = f"Bearer {token}"
+        self.budget = RateLimitBudget(
+            SEARCH_LIMIT_AUTHENTICATED if token else SEARCH_LIMIT_ANONYMOUS
+        )
+        self.requests = 0
+        self.not_modified = 0
+
+    def search_page(self, query, page, per_page=GITHUB_PER_PAGE):
+        """Fetch one page of repository search results; returns the JSON payload or None"""
+        params = {"q": query, "sort": "stars", "order": "desc", "per_page": per_page, "page": page}
+
+        for attempt in range(2):
+            if not self.budget.acquire(self.max_wait):
+                print(f"   ⏭️  GitHub budget spent, skipping '{query}' page {page}")
+                return None
+
+            response = cached_get(
+                f"{self.api_base}/search/repositories",
+                timeout=10, headers=self.headers, params=params,
+            )
+            self.requests += 1
+            self.budget.update(response.headers)
+
+            if response.status_code == 200:
+                # Revalidated pages (304 upstream) do not count against the limit
+                if response.from_cache:
+                    self.not_modified += 1
+                return response.json()
+
+            if response.status_code in (403, 429) and attempt == 0:
+                retry_after = response.headers.get("Retry-After")
+                self.budget.exhaust(float(retry_after) if retry_after else None)
+                continue
+
+            print(f"   ❌ GitHub search '{query}' page {page}: HTTP {response.status_code}")
+            return None
+        return None
+
+    def search(self, queries, max_pages=GITHUB_MAX_PAGES, per_page=GITHUB_PER_PAGE):
+        """
+        Run every query, page 1 first to learn ``total_count``, then the
+        remaining pages of all queries at once. Pages are queued shallow
+        first, so when the budget runs out it is the deep pages that drop.
+
+        Returns:
+            dict mapping query to the list of repository items found
+        """
+        deadline = self.max_wait + 15
+        first_pages = fetch_concurrently([
+            {"name": query, "func": self.search_page, "args": (query, 1, per_page), "deadline": deadline}
+            for query in queries
+        ])
+
+        items = {query: [] for query in queries}
+        page_counts = {}
+        for query, payload in first_pages:
+            if not payload:
+                continue
+            items[query].extend(payload.get("items", []))
+            total = min(payload.get("total_count", 0), 1000)
+            page_counts[query] = min(max_pages, math.ceil(total / per_page))
+
+        jobs = [
+            {"name": f"{query} p{page}", "func": self.search_page,
+             "args": (query, page, per_page), "deadline": deadline, "query": query}
+            for page in range(2, max_pages + 1)
+            for query in queries
+            if page <= page_counts.get(query, 0)
+        ]
+        query_of = {job["name"]: job["query"] for job in jobs}
+        for name, payload in fetch_concurrently(jobs):
+            if payload:
+                items[query_of[name]].extend(payload.get("items", []))
+
+        return items
+
+
+def merge_repositories(results):
+    """Dedup items from several queries by full_name, keeping the highest star count"""
+    merged = {}
+    for query, items in results.items():
+        for item in items:
+            key = item["full_name"].lower()
+            repo = merged.get(key)
+            if repo is None:
+                merged[key] = repo = {
+                    'name': item['name'],
+                    'full_name': item['full_name'],
+                    'description': item.get('description') or '',
+                    'stars': item.get('stargazers_count', 0),
+                    'url': item['html_url'],
+                    'language': item.get('language') or '',
+                    'topics': list(item.get('topics') or []),
+                    'queries': [],
+                }
+            else:
+                repo['stars'] = max(repo['stars'], item.get('stargazers_count', 0))
+                repo['topics'] += [t for t in item.get('topics') or [] if t not in repo['topics']]
+            if query not in repo['queries']:
+                repo['queries'].append(query)
+
+    return sorted(merged.values(), key=lambda repo: repo['stars'], reverse=True)
+
+
+def search_trending_repositories(topics=None, min_stars=GITHUB_MIN_STARS, max_pages=GITHUB_MAX_PAGES):
+    """Search each topic for repos above ``min_stars`` and return the merged list"""
+    topics = topics or GITHUB_SEARCH_TOPICS
+    queries = [f"topic:{topic} stars:>{min_stars}" for topic in topics]
+
+    client = GitHubSearchClient()
+    repos = merge_repositories(client.search(queries, max_pages=max_pages))
+
+    remaining = client.budget.remaining
+    print(
+        f"   📡 {client.requests} GitHub requests ({client.not_modified} not modified), "
+        f"{remaining} left in the current window"
+    )
+    return repos
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Disk-backed conditional-GET cache for the content pipeline
+Stores bodies with their ETag/Last-Modified validators and evicts least-recently-used entries
+"""
+import os
+import json
+import hashlib
+import threading
+import time
+from pathlib import Path
+
+# Cache location and size bound
+HTTP_CACHE_DIR = Path(os.environ.get("HTTP_CACHE_DIR", "data/http_cache"))
+HTTP_CACHE_MAX_BYTES = int(float(os.environ.get("HTTP_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+
+class HttpCache:
+    """
+    Validator cache keyed by request URL.
+
+    Each entry is two files: ``<key>.body`` with the raw response bytes and
+    ``<key>.json`` with the validators and a few response headers. The meta
+    file's mtime doubles as the LRU access time, so eviction needs no index.
+    """
+
+    def __init__(self, cache_dir=HTTP_CACHE_DIR, max_bytes=HTTP_CACHE_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}.json", self.cache_dir / f"{key}.body"
+
+    def validators(self, url):
+        """Return conditional request headers for a cached URL (empty if unknown)"""
+        meta = self._load_meta(url)
+        if meta is None:
+            return {}
+
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def _load_meta(self, url):
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url or not body_path.exists():
+            return None
+        return meta
+
+    def get(self, url):
+        """Return (meta, body) for a cached URL and mark it recently used, or None"""
+        meta = self._load_meta(url)
+        if meta is None:
+            return None
+
+        meta_path, body_path = self._paths(url)
+        try:
+            body = body_path.read_bytes()
+            os.utime(meta_path)
+        except OSError:
+            return None
+        return meta, body
+
+    def put(self, url, headers, body):
+        """Store a 200 response if it carries a validator, then enforce the size bound"""
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": headers.get("Content-Type", ""),
+            "size": len(body),
+            "stored_at": time.time(),
+        }
+
+        meta_path, body_path = self._paths(url)
+        with self._lock:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write body first so a reader never sees meta without its body
+            tmp_body = body_path.with_suffix(".body.tmp")
+            tmp_body.write_bytes(body)
+            os.replace(tmp_body, body_path)
+            tmp_meta = meta_path.with_suffix(".json.tmp")
+            with open(tmp_meta, "w") as f:
+                json.dump(meta, f)
+            os.replace(tmp_meta, meta_path)
+            self._evict()
+
+    def _evict(self):
+        entries = []
+        total = 0
+        for meta_path in self.cache_dir.glob("*.json"):
+            body_path = meta_path.with_suffix(".body")
+            try:
+                size = body_path.stat().st_size
+                atime = meta_path.stat().st_mtime
+            except OSError:
+                continue
+            entries.append((atime, size, meta_path, body_path))
+            total += size
+
+        if total <= self.max_bytes:
+            return
+
+        # Oldest access first
+        for _, size, meta_path, body_path in sorted(entries):
+            for path in (meta_path, body_path):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def record(self, hit):
+        """Count a lookup as a hit (served from disk) or a miss (body downloaded)"""
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """Return hit/miss counters for this process"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
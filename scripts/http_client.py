@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP client for the TV.RUSLANMV.COM content pipeline
+One pooled keep-alive session plus a thread-pool fetch engine with per-source deadlines
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import HttpCache
+
+USER_AGENT = "TV.RUSLANMV.COM/2.0 (+https://tv.ruslanmv.com)"
+
+# Default per-source deadline in seconds (covers connect + download + parse)
+DEFAULT_DEADLINE = float(os.environ.get("FETCH_DEADLINE", "15"))
+
+# Upper bound on concurrent fetches (and pooled connections per host)
+MAX_WORKERS = int(os.environ.get("FETCH_MAX_WORKERS", "16"))
+
+# Per-host politeness: sustained requests per second and burst size
+DEFAULT_HOST_RATE = float(os.environ.get("FETCH_HOST_RATE", "2"))
+DEFAULT_HOST_BURST = int(os.environ.get("FETCH_HOST_BURST", "4"))
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the process-wide pooled requests session (created on first use)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=MAX_WORKERS,
+                    pool_maxsize=MAX_WORKERS,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({
+                    "User-Agent": USER_AGENT,
+                    "Accept-Encoding": "gzip, deflate",
+                })
+                _session = session
+    return _session
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` requests per second with bursts up to ``capacity``"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = max(1.0, float(capacity))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_for = (1 - self.tokens) / self.rate
+            time.sleep(wait_for)
+
+
+_host_buckets = {}
+_host_lock = threading.Lock()
+
+
+def set_host_rate(host, rate, burst=None):
+    """Override the politeness limit for one host (requests per second)"""
+    with _host_lock:
+        _host_buckets[host] = TokenBucket(rate, burst or DEFAULT_HOST_BURST)
+
+
+def throttle(url):
+    """Wait for the per-host token bucket of ``url`` before issuing a request"""
+    host = urlsplit(url).hostname or ""
+    bucket = _host_buckets.get(host)
+    if bucket is None:
+        with _host_lock:
+            bucket = _host_buckets.setdefault(
+                host, TokenBucket(DEFAULT_HOST_RATE, DEFAULT_HOST_BURST)
+            )
+    bucket.acquire()
+
+
+def fetch_concurrently(jobs, max_workers=None):
+    """
+    Run fetch jobs on a shared thread pool and collect whatever finishes in time.
+
+    Each job is a dict with:
+      - name: label used in the result and log lines
+      - func: callable returning the job result
+      - args / kwargs: optional arguments for func
+      - deadline: optional seconds before the job is abandoned (DEFAULT_DEADLINE)
+
+    A job's deadline starts when a worker picks it up, so hundreds of queued
+    sources do not time out while waiting for a free worker. Jobs that raise
+    or miss their deadline are reported and skipped, so the caller always
+    gets partial results.
+
+    Returns:
+        list of (name, result) tuples for completed jobs, in submission order
+    """
+    if not jobs:
+        return []
+
+    workers = max(1, min(max_workers or MAX_WORKERS, len(jobs)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fetch")
+
+    started = {}
+
+    def run(index, job):
+        started[index] = time.monotonic()
+        return job["func"](*job.get("args", ()), **job.get("kwargs", {}))
+
+    start = time.monotonic()
+    futures = {}
+    for index, job in enumerate(jobs):
+        futures[executor.submit(run, index, job)] = (index, job)
+
+    def deadline_of(future):
+        index, job = futures[future]
+        if index not in started:
+            return None
+        return started[index] + job.get("deadline", DEFAULT_DEADLINE)
+
+    results = {}
+    pending = set(futures)
+    try:
+        while pending:
+            now = time.monotonic()
+
+            # Abandon running jobs whose deadline has passed
+            for future in list(pending):
+                deadline = deadline_of(future)
+                if deadline is not None and deadline <= now and not future.done():
+                    pending.discard(future)
+                    print(f"   ⏱️  {futures[future][1]['name']} missed its deadline, continuing without it")
+
+            if not pending:
+                break
+
+            # Wake at the nearest deadline, or soon if jobs are still queued
+            deadlines = [d for d in map(deadline_of, pending) if d is not None]
+            timeout = min(deadlines) - now if deadlines else 0.1
+            done, pending = wait(
+                pending,
+                timeout=min(max(0.0, timeout), 0.5),
+                return_when=FIRST_COMPLETED,
+            )
+
+            for future in done:
+                index, job = futures[future]
+                try:
+                    results[index] = (job["name"], future.result())
+                except Exception as e:
+                    print(f"   ❌ Error fetching {job['name']}: {e}")
+    finally:
+        # Do not block on stalled sources; their sockets time out on their own
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    elapsed = time.monotonic() - start
+    print(f"   ⚡ {len(results)}/{len(jobs)} sources completed in {elapsed:.1f}s")
+
+    return [results[i] for i in sorted(results)]
+
+
+_cache = None
+
+
+def get_cache():
+    """Return the shared conditional-GET cache (disabled with HTTP_CACHE=off)"""
+    global _cache
+    if os.environ.get("HTTP_CACHE", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    if _cache is None:
+        with _session_lock:
+            if _cache is None:
+                _cache = HttpCache()
+    return _cache
+
+
+def _response_from_cache(url, meta, body):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.headers["Content-Type"] = meta.get("content_type", "")
+    if meta.get("etag"):
+        response.headers["ETag"] = meta["etag"]
+    if meta.get("last_modified"):
+        response.headers["Last-Modified"] = meta["last_modified"]
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    response.from_cache = True
+    return response
+
+
+def _read_until(response, until):
+    """Stream the body until ``until(chunk)`` returns how much of that chunk ends the wanted prefix"""
+    body = bytearray()
+    try:
+        for chunk in response.iter_content(chunk_size=16384):
+            end = until(chunk)
+            if end is not None:
+                body += chunk[:end]
+                break
+            body += chunk
+    finally:
+        response.close()
+    response._content = bytes(body)
+    response._content_consumed = True
+
+
+def cached_get(url, timeout=10, headers=None, params=None, until=None):
+    """
+    GET through the pooled session, revalidating against the disk cache.
+
+    Sends If-None-Match / If-Modified-Since for URLs seen before and serves
+    the stored body on 304, so unchanged sources cost a round trip but no
+    download. Always returns a requests.Response; ``from_cache`` is True
+    when the body came from disk.
+
+    With ``until``, the body is streamed and reading stops as soon as
+    ``until(chunk)`` returns an offset into the chunk: only that prefix is
+    downloaded, kept and cached (under its own key, so a full GET of the
+    same URL never gets the truncated body).
+    """
+    cache = get_cache()
+    if params:
+        url = requests.Request("GET", url, params=params).prepare().url
+    cache_key = f"{url}#prefix" if until else url
+
+    def get(request_headers):
+        throttle(url)
+        response = get_session().get(url, timeout=timeout, headers=request_headers, stream=bool(until))
+        response.from_cache = False
+        if until and response.status_code == 200:
+            _read_until(response, until)
+        return response
+
+    request_headers = dict(headers or {})
+    if cache is not None:
+        request_headers.update(cache.validators(cache_key))
+
+    response = get(request_headers)
+
+    if cache is None:
+        return response
+
+    if response.status_code == 304:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cache.record(hit=True)
+            fresh = _response_from_cache(url, *cached)
+            # Keep live headers (rate limits, dates) from the revalidation
+            for name, value in response.headers.items():
+                fresh.headers.setdefault(name, value)
+            return fresh
+        # Validator outlived its body: refetch unconditionally
+        response = get(headers)
+
+    cache.record(hit=False)
+    if response.status_code == 200:
+        cache.put(cache_key, response.headers, response.content)
+    return response
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Content-addressed LLM response cache
+Completions are stored on disk under a hash of the model, sampling parameters
+and prompt, so identical reruns of the script stage skip the model entirely
+"""
+import os
+import json
+import hashlib
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from llm_delegate import DelegatingLLM
+from llm_metrics import note
+
+# Cache location, size bound and entry lifetime
+LLM_CACHE_DIR = Path(os.environ.get("LLM_CACHE_DIR", "data/llm_cache"))
+LLM_CACHE_MAX_BYTES = int(float(os.environ.get("LLM_CACHE_MAX_MB", "100")) * 1024 * 1024)
+LLM_CACHE_TTL = float(os.environ.get("LLM_CACHE_TTL_HOURS", "168")) * 3600
+
+# Sampling parameters that change the completion (credentials and endpoints do not)
+KEY_FIELDS = (
+    "model", "provider", "temperature", "top_p", "max_tokens", "seed",
+    "frequency_penalty", "presence_penalty", "n", "stop", "additional_params",
+)
+
+
+def _normalize_messages(messages):
+    if isinstance(messages, str):
+        return [{"role": "user", "content": messages}]
+    return [{"role": m.get("role"), "content": m.get("content")} for m in messages]
+
+
+def cache_key(llm, messages, tools=None, response_model=None, stop=None):
+    """
+    SHA-256 over the model parameters, the full message list and tool
+    schemas; ``stop`` is the call's stop list when it differs from ``llm.stop``.
+    """
+    params = {field: getattr(llm, field, None) for field in KEY_FIELDS}
+    if stop is not None:
+        params["stop"] = list(stop)
+    payload = {
+        "params": params,
+        "messages": _normalize_messages(messages),
+        "tools": tools,
+        "response_model": response_model.__name__ if response_model else None,
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    One JSON file per completion, named by its cache key.
+
+    Entries older than ``ttl`` seconds are treated as misses and removed;
+    the file mtime doubles as the LRU access time for size eviction.
+    """
+
+    def __init__(self, cache_dir=LLM_CACHE_DIR, max_bytes=LLM_CACHE_MAX_BYTES, ttl=LLM_CACHE_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key):
+        """Return the cached completion for ``key``, or None"""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.record(hit=False)
+            return None
+
+        if time.time() - entry.get("created", 0) > self.ttl:
+            path.unlink(missing_ok=True)
+            self.record(hit=False)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.record(hit=True)
+        return entry["response"]
+
+    def put(self, key, response, model=None):
+        """Store a completion, then enforce the size bound"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump({"created": time.time(), "model": model, "response": response}, f)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _evict(self):
+        """Drop expired entries, then least-recently-used ones until under max_bytes"""
+        with self._lock:
+            now = time.time()
+            entries = []
+            total = 0
+            for path in self.cache_dir.glob("*.json"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if now - stat.st_mtime > self.ttl:
+                    path.unlink(missing_ok=True)
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def record(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """Hit/miss counters plus current entry count and size on disk"""
+        files = list(self.cache_dir.glob("*.json")) if self.cache_dir.exists() else []
+        size = 0
+        for path in files:
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(files),
+            "bytes": size,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache():
+    """Return the shared response cache"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMResponseCache()
+    return _cache
+
+
+def backend_llm(llm):
+    """The client at the bottom of a chain of delegating wrappers (``inner``)"""
+    while getattr(llm, "inner", None) is not None:
+        llm = llm.inner
+    return llm
+
+
+class CachedLLM(DelegatingLLM):
+    """
+    Delegating LLM that answers repeated prompts from the response cache.
+
+    Calls that execute tools (``available_functions``) or return structured
+    objects always go to the wrapped model, since replaying them would
+    skip side effects or lose types.
+    """
+
+    response_cache: Any = None
+
+    @classmethod
+    def wrap(cls, llm, cache=None):
+        return super().wrap(llm, response_cache=cache or get_llm_cache())
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        arguments = dict(
+            tools=tools, callbacks=callbacks, available_functions=available_functions,
+            from_task=from_task, from_agent=from_agent, response_model=response_model,
+        )
+        if available_functions or response_model:
+            return self.call_inner(messages, **arguments)
+
+        # Key on the backend client (wrappers in between don't copy every sampling
+        # parameter) and on the stop words the agent set for this call
+        key = cache_key(backend_llm(self.inner), messages, tools, response_model, stop=self.stop_sequences)
+        cached = self.response_cache.get(key)
+        if cached is not None:
+            note(cached=True)
+            return cached
+
+        response = self.call_inner(messages, **arguments)
+        if isinstance(response, str) and response:
+            self.response_cache.put(key, response, model=self.model)
+        return response
+
+
+def print_cache_stats():
+    """One-line summary of cache effectiveness for the stage log"""
+    stats = get_llm_cache().stats()
+    print(
+        f"   🗄️  LLM cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KB"
+    )
@@ -4,7 +4,32 @@ LLM Client for TV.RUSLANMV.COM
 Supports Ollama (default), watsonx.ai (optional), OpenAI, and Anthropic
 """
 import os
-from crewai import LLM
+import threading
+
+# Built clients keyed by (model, temperature, base_url, wrappers); crewai is imported
+# on first construction so importing this module stays cheap
+_llm_cache = {}
+_llm_lock = threading.Lock()
+
+
+def llm_cache_enabled():
+    """False when NEWS_LLM_CACHE=off (generate_script.py --no-cache sets it)"""
+    return os.environ.get("NEWS_LLM_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+
+def llm_metrics_enabled():
+    """False when NEWS_LLM_METRICS=off"""
+    return os.environ.get("NEWS_LLM_METRICS", "on").lower() not in ("0", "off", "false", "no")
+
+
+def llm_record_dir():
+    """Fixture directory when NEWS_LLM_RECORD is set (see llm_replay.py), else None"""
+    return os.environ.get("NEWS_LLM_RECORD") or None
+
+
+def llm_max_concurrency():
+    """Cap on concurrent calls per backend (LLM_MAX_CONCURRENCY, else OLLAMA_NUM_PARALLEL); 0 disables"""
+    return int(os.environ.get("LLM_MAX_CONCURRENCY") or os.environ.get("OLLAMA_NUM_PARALLEL") or "2")
 
 
 def get_llm(force_provider: str = None):
@@ -33,6 +58,20 @@ def get_llm(force_provider: str = None):
     Args:
         force_provider: Optional provider to force (e.g., "watsonx", "ollama")
     
+    Setting NEWS_LLM_PROVIDERS to a comma-separated list of models instead
+    returns a router that sends each call to the fastest healthy provider
+    (see llm_router.py).
+    
+    Clients are built on first use and memoized per (model, temperature,
+    base_url), so repeated calls in one process share a single instance.
+    Unless NEWS_LLM_CACHE=off, the client answers repeated prompts from the
+    on-disk response cache (see llm_cache.py), and unless NEWS_LLM_METRICS=off
+    every call is timed and token-counted (see llm_metrics.py). Calls that
+    reach the backend are capped at llm_max_concurrency() in flight so
+    parallel crew tasks match the server's parallelism (see llm_concurrency.py).
+    With NEWS_LLM_RECORD=<dir> every completion is also written to a replay
+    fixture (see llm_replay.py).
+    
     Returns:
         LLM: Configured CrewAI LLM instance
     """
@@ -53,9 +92,70 @@ def get_llm(force_provider: str = None):
     temperature = float(os.environ.get("NEWS_LLM_TEMPERATURE", "0.7"))
     max_tokens = int(os.environ.get("NEWS_LLM_MAX_TOKENS", "2000"))
     
+    use_cache = llm_cache_enabled()
+    use_metrics = llm_metrics_enabled()
+    max_concurrency = llm_max_concurrency()
+    record_dir = llm_record_dir()
+    router_models = [] if force_provider else get_router_models()
+    if router_models:
+        key = ("router", tuple(router_models), temperature, use_cache, use_metrics, max_concurrency, record_dir)
+    else:
+        kwargs, banner = _provider_settings(model, temperature, max_tokens)
+        key = (model, temperature, kwargs.get("base_url"), use_cache, use_metrics, max_concurrency, record_dir)
+    
+    with _llm_lock:
+        llm = _llm_cache.get(key)
+        if llm is None:
+            if router_models:
+                llm = _build_router(router_models, temperature, max_tokens, max_concurrency)
+            else:
+                from crewai import LLM
+                
+                for line in banner:
+                    print(line)
+                llm = LLM(
+                    model=model,
+                    **kwargs,
+                )
+            if max_concurrency > 0 and not router_models:
+                # Innermost, so cache hits never wait for a backend slot
+                from llm_concurrency import ConcurrencyLimitedLLM
+                
+                llm = ConcurrencyLimitedLLM.wrap(llm, max_concurrency)
+            if use_cache:
+                from llm_cache import CachedLLM
+                
+                llm = CachedLLM.wrap(llm)
+                print(f"   🗄️  Response cache enabled (NEWS_LLM_CACHE=off to bypass)")
+            if record_dir:
+                from llm_replay import RecordingLLM
+                
+                llm = RecordingLLM.wrap(llm, record_dir)
+                print(f"   📼 Recording LLM calls to {record_dir}")
+            if use_metrics:
+                from llm_metrics import InstrumentedLLM
+                
+                llm = InstrumentedLLM.wrap(llm)
+            _llm_cache[key] = llm
+    
+    return llm
+
+
+def _provider_settings(model, temperature, max_tokens):
+    """
+    Return (kwargs, banner) for building ``model``: connection settings for
+    crewai.LLM and the lines describing the provider.
+    
+    Raises ValueError when a remote provider's API key is missing.
+    """
     kwargs = {
         "temperature": temperature,
     }
+    # Opt-in: streaming lets llm_metrics measure time to first token, at the
+    # cost of per-chunk overhead on every call
+    if os.environ.get("NEWS_LLM_STREAM", "off").lower() in ("1", "on", "true", "yes"):
+        kwargs["stream"] = True
+    banner = []
     
     # Local Ollama (DEFAULT - used in CI and local development)
     if model.startswith("ollama/"):
@@ -65,9 +165,9 @@ def get_llm(force_provider: str = None):
             or "http://127.0.0.1:11434"
         )
         kwargs["base_url"] = base_url
-        print(f"🤖 Using Ollama model '{model}' at {base_url}")
-        print(f"   Temperature: {temperature}")
-        print(f"   💡 Tip: For better quality, set NEWS_LLM_MODEL=watsonx/ibm/granite-13b-chat-v2")
+        banner.append(f"🤖 Using Ollama model '{model}' at {base_url}")
+        banner.append(f"   Temperature: {temperature}")
+        banner.append(f"   💡 Tip: For better quality, set NEWS_LLM_MODEL=watsonx/ibm/granite-13b-chat-v2")
     
     # IBM watsonx.ai (OPTIONAL - for better results)
     elif model.startswith("watsonx/"):
@@ -88,10 +188,10 @@ def get_llm(force_provider: str = None):
         if project_id:
             kwargs["project_id"] = project_id
         
-        print(f"🤖 Using watsonx.ai model '{model}' at {base_url}")
-        print(f"   Temperature: {temperature}")
-        print(f"   Max tokens: {max_tokens}")
-        print(f"   ✨ Using IBM watsonx.ai for enhanced quality")
+        banner.append(f"🤖 Using watsonx.ai model '{model}' at {base_url}")
+        banner.append(f"   Temperature: {temperature}")
+        banner.append(f"   Max tokens: {max_tokens}")
+        banner.append(f"   ✨ Using IBM watsonx.ai for enhanced quality")
     
     # OpenAI (alternative remote provider)
     elif model.startswith("openai/"):
@@ -101,8 +201,8 @@ def get_llm(force_provider: str = None):
                 "OPENAI_API_KEY environment variable is required for OpenAI. "
                 "Set NEWS_LLM_MODEL=ollama/gemma:2b to use local Ollama instead."
             )
-        print(f"🤖 Using OpenAI model '{model}' via LiteLLM")
-        print(f"   Temperature: {temperature}")
+        banner.append(f"🤖 Using OpenAI model '{model}' via LiteLLM")
+        banner.append(f"   Temperature: {temperature}")
     
     # Anthropic Claude (alternative remote provider)
     elif model.startswith("anthropic/"):
@@ -112,20 +212,53 @@ def get_llm(force_provider: str = None):
                 "ANTHROPIC_API_KEY environment variable is required for Anthropic. "
                 "Set NEWS_LLM_MODEL=ollama/gemma:2b to use local Ollama instead."
             )
-        print(f"🤖 Using Anthropic model '{model}' via LiteLLM")
-        print(f"   Temperature: {temperature}")
+        banner.append(f"🤖 Using Anthropic model '{model}' via LiteLLM")
+        banner.append(f"   Temperature: {temperature}")
     
     else:
         # Generic remote provider handled by LiteLLM via CrewAI
-        print(f"🤖 Using remote provider model '{model}' via LiteLLM defaults")
-        print(f"   Temperature: {temperature}")
+        banner.append(f"🤖 Using remote provider model '{model}' via LiteLLM defaults")
+        banner.append(f"   Temperature: {temperature}")
     
-    llm = LLM(
-        model=model,
-        **kwargs,
-    )
+    return kwargs, banner
+
+
+def get_router_models():
+    """Models listed in NEWS_LLM_PROVIDERS, in priority order (empty: no routing)"""
+    return [m.strip() for m in os.environ.get("NEWS_LLM_PROVIDERS", "").split(",") if m.strip()]
+
+
+def _build_router(models, temperature, max_tokens, max_concurrency=0):
+    """
+    Build one client per configured provider and route between them.
     
-    return llm
+    Each provider gets its own backend concurrency cap, so hedged requests
+    count against the backend they are sent to.
+    """
+    from crewai import LLM
+    from llm_router import LLMRouter
+    
+    providers = []
+    for model in models:
+        try:
+            kwargs, banner = _provider_settings(model, temperature, max_tokens)
+        except ValueError as e:
+            print(f"   ⚠️  Skipping {model}: {e}")
+            continue
+        for line in banner:
+            print(line)
+        provider = LLM(model=model, **kwargs)
+        if max_concurrency > 0:
+            from llm_concurrency import ConcurrencyLimitedLLM
+            
+            provider = ConcurrencyLimitedLLM.wrap(provider, max_concurrency)
+        providers.append(provider)
+    
+    if not providers:
+        raise ValueError("None of the NEWS_LLM_PROVIDERS models could be configured")
+    
+    print(f"🔀 Routing between {len(providers)} providers: {', '.join(p.model for p in providers)}")
+    return LLMRouter.over(providers)
 
 
 def get_model_name():
@@ -147,8 +280,11 @@ def is_using_ollama():
     return get_model_name().startswith("ollama/")
 
 
-# Singleton instance to import in other scripts
-llm = get_llm()
+def __getattr__(name):
+    """Keep ``from llm_client import llm`` working without building it at import time"""
+    if name == "llm":
+        return get_llm()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 if __name__ == "__main__":
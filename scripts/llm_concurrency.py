@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Concurrency cap for LLM calls
+Lets independent CrewAI tasks run side by side without sending the backend
+more requests than it serves in parallel (Ollama's OLLAMA_NUM_PARALLEL)
+"""
+import threading
+import time
+from typing import Any
+
+from llm_delegate import DelegatingLLM
+from llm_metrics import note
+
+# One semaphore per backend, shared by every client that talks to it
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def backend_slots(backend, limit):
+    """Semaphore bounding concurrent calls to ``backend`` (a base URL or model)"""
+    with _slots_lock:
+        if backend not in _slots:
+            _slots[backend] = threading.BoundedSemaphore(max(1, limit))
+        return _slots[backend]
+
+
+class ConcurrencyLimitedLLM(DelegatingLLM):
+    """Delegating LLM that waits for a free backend slot before each call"""
+
+    slots: Any = None
+
+    @classmethod
+    def wrap(cls, llm, limit):
+        """``limit`` comes from llm_client.llm_max_concurrency()"""
+        return super().wrap(llm, slots=backend_slots(llm.base_url or llm.model, limit))
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        start = time.perf_counter()
+        with self.slots:
+            queued = time.perf_counter() - start
+            if queued >= 0.01:
+                note(queued_s=round(queued, 4))
+            return self.call_inner(
+                messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                from_task=from_task, from_agent=from_agent, response_model=response_model,
+            )
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Delegating LLM base
+The metrics, recording, cache and concurrency wrappers each sit in front of
+another client (``inner``); this is the delegation they share
+"""
+from typing import Any
+
+from crewai import BaseLLM
+from crewai.llms.base_llm import call_stop_override
+
+
+class DelegatingLLM(BaseLLM):
+    """
+    BaseLLM that forwards to ``inner``.
+
+    Stop words reach the inner client as crewai's call-scoped override, never
+    by assigning ``inner.stop``: the inner client is memoized and shared by
+    every agent and thread, so one call's stop words would leak into another.
+    """
+
+    inner: Any = None
+
+    @classmethod
+    def wrap(cls, llm, **fields):
+        """Wrap ``llm`` with its model and sampling settings; ``fields`` are the subclass's own"""
+        return cls(
+            model=llm.model,
+            provider=llm.provider,
+            temperature=llm.temperature,
+            top_p=llm.top_p,
+            max_tokens=llm.max_tokens,
+            seed=llm.seed,
+            stop=list(llm.stop),
+            base_url=llm.base_url,
+            inner=llm,
+            **fields,
+        )
+
+    def call_inner(self, messages, tools=None, callbacks=None, available_functions=None,
+                   from_task=None, from_agent=None, response_model=None):
+        """``inner.call`` with the stop words of this call"""
+        with call_stop_override(self.inner, list(self.stop_sequences)):
+            return self.inner.call(
+                messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                from_task=from_task, from_agent=from_agent, response_model=response_model,
+            )
+
+    def supports_function_calling(self):
+        # Not part of the BaseLLM interface; only some providers define it
+        supported = getattr(self.inner, "supports_function_calling", None)
+        return bool(supported and supported())
+
+    def supports_stop_words(self):
+        return self.inner.supports_stop_words()
+
+    def get_context_window_size(self):
+        return self.inner.get_context_window_size()
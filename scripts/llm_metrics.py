@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Per-call LLM instrumentation
+Records prompt/completion tokens, time to first token, tokens per second and
+wall time for every call, attributed to the CrewAI agent and task that made it
+"""
+import os
+import json
+import time
+import threading
+import contextvars
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from crewai.events import crewai_event_bus
+from crewai.events.types.llm_events import LLMCallCompletedEvent, LLMStreamChunkEvent
+
+from llm_delegate import DelegatingLLM
+
+LLM_TRACE_FILE = Path(os.environ.get("LLM_TRACE_FILE", "output/llm_trace.json"))
+
+# The call being timed in this context; provider events find their record through it
+_current_call = contextvars.ContextVar("llm_metrics_call", default=None)
+
+
+def _estimate_tokens(text):
+    # Fallback when the provider reports no usage: ~4 characters per token
+    return max(1, len(text) // 4) if text else 0
+
+
+def _message_text(messages):
+    if isinstance(messages, str):
+        return messages
+    return "\n".join(str(m.get("content", "")) for m in messages)
+
+
+def _task_label(task):
+    if task is None:
+        return None
+    name = getattr(task, "name", None)
+    if name:
+        return name
+    description = (getattr(task, "description", "") or "").strip()
+    return description.splitlines()[0][:60] if description else None
+
+
+def note(**fields):
+    """Attach extra fields (e.g. cached=True) to the call being recorded, if any"""
+    record = _current_call.get()
+    if record is not None:
+        record.update(fields)
+
+
+class MetricsCollector:
+    """Thread-safe list of call records with per-agent/task aggregation"""
+
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        with self._lock:
+            self.calls.append(record)
+
+    def reset(self):
+        with self._lock:
+            self.calls = []
+
+    def summary(self):
+        """Totals per (agent, task), in first-call order"""
+        groups = {}
+        for call in list(self.calls):
+            group = groups.setdefault((call["agent"], call["task"]), {
+                "agent": call["agent"], "task": call["task"], "calls": 0, "cached": 0, "errors": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "wall_s": 0.0, "ttft": [],
+                "generated": 0, "generating_s": 0.0,
+            })
+            group["calls"] += 1
+            group["cached"] += bool(call.get("cached"))
+            group["errors"] += bool(call.get("error"))
+            group["prompt_tokens"] += call["prompt_tokens"]
+            group["completion_tokens"] += call["completion_tokens"]
+            group["wall_s"] += call["wall_s"]
+            if not call.get("cached"):
+                # Cache hits would inflate the speed and deflate first-token latency
+                group["generated"] += call["completion_tokens"]
+                group["generating_s"] += call["wall_s"]
+                if call.get("ttft_s") is not None:
+                    group["ttft"].append(call["ttft_s"])
+
+        rows = []
+        for group in groups.values():
+            ttft = group.pop("ttft")
+            generated, generating_s = group.pop("generated"), group.pop("generating_s")
+            group["mean_ttft_s"] = sum(ttft) / len(ttft) if ttft else None
+            group["tokens_per_s"] = generated / generating_s if generating_s else None
+            group["wall_s"] = round(group["wall_s"], 3)
+            rows.append(group)
+        return rows
+
+    def totals(self):
+        calls = list(self.calls)
+        return {
+            "calls": len(calls),
+            "cached_calls": sum(bool(c.get("cached")) for c in calls),
+            "prompt_tokens": sum(c["prompt_tokens"] for c in calls),
+            "completion_tokens": sum(c["completion_tokens"] for c in calls),
+            "wall_s": round(sum(c["wall_s"] for c in calls), 3),
+        }
+
+    def write_trace(self, path=LLM_TRACE_FILE):
+        """Write every call plus the per-agent summary as JSON"""
+        # Usage arrives through asynchronous completion events
+        crewai_event_bus.flush()
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "generated_at": datetime.now().isoformat(),
+                "totals": self.totals(),
+                "by_agent": self.summary(),
+                "calls": list(self.calls),
+            }, f, indent=2)
+        return path
+
+    def print_summary(self):
+        crewai_event_bus.flush()
+        rows = self.summary()
+        if not rows:
+            return
+        print("\n📈 LLM usage by agent")
+        print("-" * 70)
+        print(f"{'agent':<26}{'calls':>6}{'cached':>7}{'prompt':>8}{'output':>8}{'wall s':>8}{'ttft s':>7}")
+        for row in rows:
+            ttft = f"{row['mean_ttft_s']:.2f}" if row["mean_ttft_s"] is not None else "-"
+            speed = f"  {row['tokens_per_s']:.1f} tok/s" if row["tokens_per_s"] else ""
+            print(f"{(row['agent'] or '-')[:25]:<26}{row['calls']:>6}{row['cached']:>7}{row['prompt_tokens']:>8}"
+                  f"{row['completion_tokens']:>8}{row['wall_s']:>8.1f}{ttft:>7}{speed}")
+        print("-" * 70)
+
+
+collector = MetricsCollector()
+
+
+def _on_stream_chunk(source, event):
+    # Stream chunk handlers run synchronously in the calling context; time to
+    # first token is only meaningful for a provider that streams (NEWS_LLM_STREAM)
+    if not getattr(source, "stream", False):
+        return
+    record = _current_call.get()
+    if record is not None and "_start" in record and record.get("ttft_s") is None and event.chunk:
+        record["ttft_s"] = round(time.perf_counter() - record["_start"], 4)
+
+
+def _on_call_completed(source, event):
+    record = _current_call.get()
+    if record is None or not event.usage:
+        return
+    record["prompt_tokens"] = event.usage.get("prompt_tokens", record["prompt_tokens"])
+    record["completion_tokens"] = event.usage.get("completion_tokens", record["completion_tokens"])
+    record["usage_source"] = "provider"
+    if "wall_s" in record:
+        _update_speed(record)
+
+
+def _update_speed(record):
+    generating = record["wall_s"] - (record.get("ttft_s") or 0.0)
+    if record["completion_tokens"] and generating > 0 and not record.get("cached"):
+        record["tokens_per_s"] = round(record["completion_tokens"] / generating, 2)
+
+
+crewai_event_bus.on(LLMStreamChunkEvent)(_on_stream_chunk)
+crewai_event_bus.on(LLMCallCompletedEvent)(_on_call_completed)
+
+
+class InstrumentedLLM(DelegatingLLM):
+    """Delegating LLM that records one metrics entry per call"""
+
+    metrics: Any = None
+
+    @classmethod
+    def wrap(cls, llm, metrics=None):
+        return super().wrap(llm, metrics=metrics or collector)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        record = {
+            "agent": getattr(from_agent, "role", None),
+            "task": _task_label(from_task),
+            "model": self.model,
+            "started_at": datetime.now().isoformat(),
+            "prompt_tokens": _estimate_tokens(_message_text(messages)),
+            "completion_tokens": 0,
+            "ttft_s": None,
+            "tokens_per_s": None,
+            "usage_source": "estimate",
+            "_start": time.perf_counter(),
+        }
+        token = _current_call.set(record)
+        try:
+            response = self.call_inner(
+                messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+                from_task=from_task, from_agent=from_agent, response_model=response_model,
+            )
+        except Exception as e:
+            record["error"] = str(e)[:200]
+            raise
+        finally:
+            _current_call.reset(token)
+            record["wall_s"] = round(time.perf_counter() - record.pop("_start"), 4)
+            self.metrics.add(record)
+
+        if record["usage_source"] == "estimate":
+            record["completion_tokens"] = _estimate_tokens(response if isinstance(response, str) else str(response))
+        _update_speed(record)
+        return response
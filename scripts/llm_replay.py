@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+LLM call recording for offline replay
+With NEWS_LLM_RECORD=<dir>, every completion is appended to <dir>/calls.jsonl
+and the stage inputs are copied to <dir>/data, so the run can be replayed
+by benchmarks/llm_stub_server.py --fixtures <dir> without a model
+"""
+import json
+import time
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from llm_delegate import DelegatingLLM
+
+FIXTURE_CALLS = "calls.jsonl"
+FIXTURE_DATA = "data"
+
+
+def record_inputs(record_dir, files):
+    """Copy the input files a recorded run read into ``record_dir``/data"""
+    data_dir = Path(record_dir) / FIXTURE_DATA
+    data_dir.mkdir(parents=True, exist_ok=True)
+    for path in map(Path, files):
+        if path.exists():
+            shutil.copy2(path, data_dir / path.name)
+
+
+class RecordingLLM(DelegatingLLM):
+    """Delegating LLM that appends every text completion to a fixture file"""
+
+    path: Any = None
+    lock: Any = None
+
+    @classmethod
+    def wrap(cls, llm, record_dir):
+        path = Path(record_dir) / FIXTURE_CALLS
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return super().wrap(llm, path=path, lock=threading.Lock())
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        start = time.perf_counter()
+        response = self.call_inner(
+            messages, tools=tools, callbacks=callbacks, available_functions=available_functions,
+            from_task=from_task, from_agent=from_agent, response_model=response_model,
+        )
+        if isinstance(response, str):
+            if isinstance(messages, str):
+                messages = [{"role": "user", "content": messages}]
+            line = json.dumps({
+                "messages": [{"role": m.get("role"), "content": m.get("content")} for m in messages],
+                "response": response,
+                "model": self.model,
+                "agent": getattr(from_agent, "role", None),
+                "wall_s": round(time.perf_counter() - start, 4),
+                "recorded_at": datetime.now().isoformat(),
+            })
+            with self.lock, open(self.path, "a") as f:
+                f.write(line + "\n")
+        return response
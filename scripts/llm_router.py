@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Latency-aware router over several LLM providers
+Tracks rolling latency and errors per provider, sends each call to the fastest
+healthy one, hedges slow calls with a second provider and fails over on errors
+"""
+import os
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any
+
+from crewai import BaseLLM
+from crewai.llms.base_llm import call_stop_override
+
+# Calls remembered per provider for latency percentiles and error rates
+ROUTER_WINDOW = int(os.environ.get("LLM_ROUTER_WINDOW", "50"))
+
+# Hedging: after the primary's p95 a second provider gets the same request;
+# HEDGE_AFTER caps the delay and applies until there is enough history
+LLM_ROUTER_HEDGE = os.environ.get("LLM_ROUTER_HEDGE", "on").lower() not in ("0", "off", "false", "no")
+HEDGE_AFTER = float(os.environ.get("LLM_ROUTER_HEDGE_AFTER", "60"))
+HEDGE_MIN_SAMPLES = 5
+
+# Circuit breaker: consecutive failures before a provider is skipped, and
+# seconds before it gets a trial call again
+BREAKER_FAILURES = int(os.environ.get("LLM_ROUTER_FAILURES", "3"))
+BREAKER_COOLDOWN = float(os.environ.get("LLM_ROUTER_COOLDOWN", "120"))
+
+
+class CircuitBreaker:
+    """Closed -> open after repeated failures -> half-open trial after a cooldown"""
+
+    def __init__(self, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.max_failures = failures
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self):
+        """True if a call may go to this provider (one trial call when half-open)"""
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half-open" and not self.trial_running:
+                self.trial_running = True
+                return True
+            return False
+
+    def available(self):
+        """Like allow() but without claiming the half-open trial"""
+        state = self.state
+        return state == "closed" or (state == "half-open" and not self.trial_running)
+
+    def record(self, ok):
+        with self._lock:
+            self.trial_running = False
+            if ok:
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.max_failures:
+                # Failed trial re-opens for a full cooldown
+                self.opened_at = time.monotonic()
+
+
+class ProviderStats:
+    """Rolling window of (latency, ok) for one provider"""
+
+    def __init__(self, window=ROUTER_WINDOW):
+        self.calls = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency, ok):
+        with self._lock:
+            self.calls.append((latency, ok))
+
+    def latencies(self):
+        with self._lock:
+            return sorted(latency for latency, ok in self.calls if ok)
+
+    def percentile(self, fraction):
+        latencies = self.latencies()
+        if not latencies:
+            return None
+        return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+    def error_rate(self):
+        with self._lock:
+            if not self.calls:
+                return 0.0
+            return sum(1 for _, ok in self.calls if not ok) / len(self.calls)
+
+    def summary(self):
+        p50, p95 = self.percentile(0.5), self.percentile(0.95)
+        return {
+            "calls": len(self.calls),
+            "p50_s": round(p50, 3) if p50 is not None else None,
+            "p95_s": round(p95, 3) if p95 is not None else None,
+            "error_rate": round(self.error_rate(), 3),
+        }
+
+
+def provider_labels(providers):
+    """Display names: the model, plus the endpoint (or position) where models repeat"""
+    models = [p.model for p in providers]
+    labels = [
+        f"{p.model}@{p.base_url}" if models.count(p.model) > 1 and p.base_url else p.model
+        for p in providers
+    ]
+    return [label if labels.count(label) == 1 else f"{label}#{i + 1}" for i, label in enumerate(labels)]
+
+
+class LLMRouter(BaseLLM):
+    """
+    BaseLLM that fans calls out over provider LLMs.
+
+    Providers are ranked by median latency inflated by their error rate;
+    ones without history keep their configured order behind measured ones.
+    A call goes to the best provider whose breaker is closed. If it fails,
+    the next one is tried; if it runs past the hedge delay, the next one
+    is started too and the first answer wins.
+    """
+
+    providers: list = []
+    labels: list = []
+    hedge: bool = LLM_ROUTER_HEDGE
+    hedge_after: float = HEDGE_AFTER
+    stats: list = []
+    breakers: list = []
+    executor: Any = None
+
+    @classmethod
+    def over(cls, providers, hedge=LLM_ROUTER_HEDGE, hedge_after=HEDGE_AFTER):
+        primary = providers[0]
+        return cls(
+            model="router/" + "+".join(p.model for p in providers),
+            provider="router",
+            temperature=primary.temperature,
+            max_tokens=primary.max_tokens,
+            stop=list(primary.stop),
+            providers=list(providers),
+            labels=provider_labels(providers),
+            hedge=hedge and len(providers) > 1,
+            hedge_after=hedge_after,
+            # Per provider position: the same model may be served from several endpoints
+            stats=[ProviderStats() for _ in providers],
+            breakers=[CircuitBreaker() for _ in providers],
+            executor=ThreadPoolExecutor(max_workers=4 * len(providers), thread_name_prefix="llm-route"),
+        )
+
+    def ranked(self):
+        """Indexes of the providers whose breaker admits calls, best first"""
+        def expected_latency(index):
+            stats = self.stats[index]
+            median = stats.percentile(0.5)
+            if median is None:
+                return (1, index, 0.0)
+            return (0, median * (1 + 4 * stats.error_rate()), index)
+
+        candidates = [i for i in range(len(self.providers)) if self.breakers[i].available()]
+        return sorted(candidates, key=expected_latency)
+
+    def hedge_delay(self, index):
+        stats = self.stats[index]
+        if len(stats.latencies()) >= HEDGE_MIN_SAMPLES:
+            return min(stats.percentile(0.95), self.hedge_after)
+        return self.hedge_after
+
+    def _timed_call(self, index, messages, arguments):
+        start = time.monotonic()
+        try:
+            result = self.providers[index].call(messages, **arguments)
+        except Exception:
+            self.stats[index].record(time.monotonic() - start, False)
+            self.breakers[index].record(False)
+            raise
+        self.stats[index].record(time.monotonic() - start, True)
+        self.breakers[index].record(True)
+        return result
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None, response_model=None):
+        arguments = dict(
+            tools=tools, callbacks=callbacks, available_functions=available_functions,
+            from_task=from_task, from_agent=from_agent, response_model=response_model,
+        )
+        # Tool-executing calls have side effects and must not run twice
+        hedge = self.hedge and not available_functions
+
+        queue = self.ranked()
+        if not queue:
+            raise RuntimeError("All LLM providers are circuit-broken; retry after the cooldown")
+
+        pending = {}
+        launched_at = {}
+        errors = []
+
+        def launch():
+            while queue:
+                index = queue.pop(0)
+                if self.breakers[index].allow():
+                    # Carry crewai's call id, metrics context and this call's stop
+                    # words (scoped, not set on the shared provider) into the worker thread
+                    with call_stop_override(self.providers[index], list(self.stop_sequences)):
+                        context = contextvars.copy_context()
+                    future = self.executor.submit(context.run, self._timed_call, index, messages, arguments)
+                    pending[future] = index
+                    launched_at[index] = time.monotonic()
+                    return index
+            return None
+
+        primary = launch()
+        hedged = False
+        while pending:
+            timeout = None
+            if hedge and not hedged and queue and primary is not None:
+                elapsed = time.monotonic() - launched_at[primary]
+                timeout = max(0.0, self.hedge_delay(primary) - elapsed)
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                hedged = True
+                backup = launch()
+                if backup is not None:
+                    print(f"   🔀 {self.labels[primary]} is slow, hedging with {self.labels[backup]}")
+                continue
+
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    errors.append(f"{self.labels[index]}: {e}")
+                    print(f"   ⚠️  {self.labels[index]} failed ({e}), failing over")
+                    if not pending:
+                        primary = launch()
+                        hedged = False
+
+        if not errors:
+            # Every breaker turned the call away (e.g. another call holds the half-open trial)
+            raise RuntimeError("No LLM provider was available; all are circuit-broken or in a trial call")
+        raise RuntimeError("All LLM providers failed: " + "; ".join(errors))
+
+    def supports_function_calling(self):
+        return all(
+            getattr(p, "supports_function_calling", lambda: False)() for p in self.providers
+        )
+
+    def supports_stop_words(self):
+        return all(p.supports_stop_words() for p in self.providers)
+
+    def get_context_window_size(self):
+        return min(p.get_context_window_size() for p in self.providers)
+
+    def report(self):
+        """Per-provider latency, error rate and breaker state"""
+        return {
+            label: {**self.stats[i].summary(), "breaker": self.breakers[i].state}
+            for i, label in enumerate(self.labels)
+        }
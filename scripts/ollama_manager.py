@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Ollama warm-up manager
+Preloads the configured model once per run with a long keep_alive, probes
+readiness with a tiny generation and records load-time / first-token metrics
+
+The crew's completions go through Ollama's OpenAI-compatible endpoint, which
+takes no keep_alive: each one resets the model's expiry to the server's own
+default (5 minutes). Start the server with OLLAMA_KEEP_ALIVE set, as the daily
+workflow does (OLLAMA_KEEP_ALIVE=2h ollama serve), or the model is unloaded
+between stages whatever the preload asked for.
+
+Usage:
+  python scripts/ollama_manager.py warm              # preload + probe, blocking
+  python scripts/ollama_manager.py warm --background # detach, for CI before the fetch stages
+  python scripts/ollama_manager.py wait              # block until the model is resident
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+# Add scripts directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from http_client import get_session
+from llm_client import get_model_name
+
+# How long Ollama keeps the model in memory after the preload and probe (Go
+# duration, or -1 for forever); set the same variable on `ollama serve` so the
+# crew's completions keep it too
+OLLAMA_KEEP_ALIVE = os.environ.get("OLLAMA_KEEP_ALIVE", "2h")
+
+# Seconds to wait for the server to come up and for the model to load
+OLLAMA_WARMUP_TIMEOUT = float(os.environ.get("OLLAMA_WARMUP_TIMEOUT", "600"))
+
+WARMUP_METRICS_FILE = Path(os.environ.get("OLLAMA_WARMUP_METRICS", "data/ollama_warmup.json"))
+
+PROBE_PROMPT = "Reply with the single word OK."
+
+
+def ollama_base_url():
+    """Native Ollama API root (same resolution as llm_client, without /v1)"""
+    base_url = (
+        os.environ.get("OLLAMA_API_BASE")
+        or os.environ.get("OLLAMA_HOST")
+        or "http://127.0.0.1:11434"
+    )
+    base_url = base_url.rstrip("/")
+    return base_url[:-3] if base_url.endswith("/v1") else base_url
+
+
+def ollama_model(model=None):
+    """Ollama tag for ``model`` (default: the configured NEWS_LLM_MODEL)"""
+    model = model or get_model_name()
+    return model.split("/", 1)[1] if model.startswith("ollama/") else model
+
+
+def wait_for_server(timeout=OLLAMA_WARMUP_TIMEOUT):
+    """Poll /api/tags until the server answers; returns seconds waited"""
+    start = time.monotonic()
+    while True:
+        try:
+            if get_session().get(f"{ollama_base_url()}/api/tags", timeout=5).ok:
+                return time.monotonic() - start
+        except Exception:
+            pass
+        if time.monotonic() - start > timeout:
+            raise TimeoutError(f"Ollama did not come up at {ollama_base_url()} within {timeout:.0f}s")
+        time.sleep(1)
+
+
+def loaded_models():
+    """Models currently resident in memory, from /api/ps"""
+    response = get_session().get(f"{ollama_base_url()}/api/ps", timeout=5)
+    response.raise_for_status()
+    return {m.get("name") or m.get("model"): m for m in response.json().get("models", [])}
+
+
+def is_loaded(model=None):
+    model = ollama_model(model)
+    try:
+        names = loaded_models()
+    except Exception:
+        return False
+    # "gemma:2b" is listed as-is; an untagged name is listed as "name:latest"
+    return model in names or f"{model}:latest" in names
+
+
+def preload(model=None, keep_alive=OLLAMA_KEEP_ALIVE, timeout=OLLAMA_WARMUP_TIMEOUT):
+    """
+    Load the model into memory without generating anything.
+
+    An empty prompt makes Ollama load the weights and return; ``keep_alive``
+    keeps them resident for the whole run. Returns the reported load time.
+    """
+    start = time.monotonic()
+    response = get_session().post(
+        f"{ollama_base_url()}/api/generate",
+        json={"model": ollama_model(model), "prompt": "", "keep_alive": keep_alive, "stream": False},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    data = response.json()
+    return {
+        "load_s": data.get("load_duration", 0) / 1e9,
+        "preload_wall_s": time.monotonic() - start,
+    }
+
+
+def probe(model=None, keep_alive=OLLAMA_KEEP_ALIVE, timeout=OLLAMA_WARMUP_TIMEOUT):
+    """
+    Readiness probe: stream a few tokens and time the first one.
+
+    Returns time to first token, generation speed and any load time the
+    probe itself paid (non-zero means the model was not resident).
+    """
+    start = time.monotonic()
+    first_token = None
+    final = {}
+    with get_session().post(
+        f"{ollama_base_url()}/api/generate",
+        json={
+            "model": ollama_model(model),
+            "prompt": PROBE_PROMPT,
+            "keep_alive": keep_alive,
+            "stream": True,
+            "options": {"num_predict": 8},
+        },
+        timeout=timeout,
+        stream=True,
+    ) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if first_token is None and chunk.get("response"):
+                first_token = time.monotonic() - start
+            if chunk.get("done"):
+                final = chunk
+                break
+
+    eval_seconds = final.get("eval_duration", 0) / 1e9
+    return {
+        "ttft_s": first_token if first_token is not None else time.monotonic() - start,
+        "probe_wall_s": time.monotonic() - start,
+        "probe_load_s": final.get("load_duration", 0) / 1e9,
+        "tokens_per_s": final.get("eval_count", 0) / eval_seconds if eval_seconds else None,
+    }
+
+
+def warm_up(model=None, keep_alive=OLLAMA_KEEP_ALIVE, save=True):
+    """Wait for the server, preload the model, probe it and record the metrics"""
+    model = ollama_model(model)
+    print(f"🔥 Warming up Ollama model '{model}' (keep_alive={keep_alive})")
+
+    metrics = {"model": model, "keep_alive": keep_alive, "started_at": datetime.now().isoformat()}
+    metrics["server_wait_s"] = wait_for_server()
+    metrics["already_loaded"] = is_loaded(model)
+    metrics.update(preload(model, keep_alive))
+    metrics.update(probe(model, keep_alive))
+    metrics["ready_at"] = datetime.now().isoformat()
+
+    tokens_per_s = metrics["tokens_per_s"]
+    print(f"   ✅ Model ready: load {metrics['load_s']:.1f}s, first token {metrics['ttft_s'] * 1000:.0f} ms"
+          + (f", {tokens_per_s:.1f} tok/s" if tokens_per_s else ""))
+
+    if save:
+        WARMUP_METRICS_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(WARMUP_METRICS_FILE, "w") as f:
+            json.dump(metrics, f, indent=2)
+    return metrics
+
+
+_warmup_thread = None
+_warmup_lock = threading.Lock()
+
+
+def start_warm_up(model=None):
+    """Warm up on a daemon thread (once per process) so callers can keep working"""
+    global _warmup_thread
+    with _warmup_lock:
+        if _warmup_thread is None:
+            def run():
+                try:
+                    warm_up(model)
+                except Exception as e:
+                    print(f"   ⚠️  Ollama warm-up failed: {e}")
+
+            _warmup_thread = threading.Thread(target=run, name="ollama-warmup", daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def warm_up_if_needed(model=None):
+    """
+    Start a background warm-up unless the model is already resident, e.g.
+    from the workflow's `warm --background`, whose metrics are then kept.
+    """
+    if is_loaded(model):
+        return None
+    return start_warm_up(model)
+
+
+def ensure_ready(model=None, timeout=OLLAMA_WARMUP_TIMEOUT):
+    """
+    Return once the model is resident. Cheap when a background warm-up
+    (this process or `ollama_manager.py warm --background`) already
+    finished; otherwise joins or runs the warm-up here.
+    """
+    if is_loaded(model):
+        return True
+    thread = start_warm_up(model)
+    thread.join(timeout)
+    return is_loaded(model)
+
+
+def load_warmup_metrics():
+    """Metrics recorded by the last warm-up, or {}"""
+    try:
+        with open(WARMUP_METRICS_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preload and probe the Ollama model")
+    parser.add_argument("command", choices=["warm", "wait", "status"])
+    parser.add_argument("--model", default=None, help="Ollama model (default: NEWS_LLM_MODEL)")
+    parser.add_argument("--keep-alive", default=OLLAMA_KEEP_ALIVE)
+    parser.add_argument("--background", action="store_true", help="Detach and warm up in a child process")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "warm" and args.background:
+            log = open("ollama_warmup.log", "w")
+            command = [sys.executable, __file__, "warm", "--keep-alive", args.keep_alive]
+            if args.model:
+                command += ["--model", args.model]
+            subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT, start_new_session=True)
+            print("🔥 Ollama warm-up started in the background (log: ollama_warmup.log)")
+        elif args.command == "warm":
+            warm_up(args.model, args.keep_alive)
+        elif args.command == "wait":
+            if not ensure_ready(args.model):
+                print("❌ Ollama model is not loaded")
+                sys.exit(1)
+            print(f"✅ Ollama model '{ollama_model(args.model)}' is resident")
+        else:
+            print(json.dumps({"loaded": list(loaded_models()), "last_warmup": load_warmup_metrics()}, indent=2))
+        sys.exit(0)
+    except Exception as e:
+        print(f"❌ ERROR: {e}")
+        sys.exit(1)
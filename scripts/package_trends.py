@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+Package trend store and velocity scoring
+Daily snapshots of stars/downloads/versions in SQLite, growth velocity and
+acceleration computed for all tracked packages in one NumPy pass
+"""
+import os
+import sqlite3
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+PACKAGE_TRENDS_DB = Path(os.environ.get("PACKAGE_TRENDS_DB", "data/package_trends.db"))
+
+# Days of history used for velocity/acceleration
+TREND_WINDOW_DAYS = int(os.environ.get("TREND_WINDOW_DAYS", "14"))
+
+# Score mix: growth of downloads and stars, their acceleration, and release activity
+VELOCITY_WEIGHT = 0.6
+ACCELERATION_WEIGHT = 0.3
+RELEASE_WEIGHT = 0.1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    day TEXT NOT NULL,
+    package TEXT NOT NULL,
+    stars INTEGER,
+    downloads INTEGER,
+    version TEXT,
+    PRIMARY KEY (package, day)
+) WITHOUT ROWID;
+"""
+
+
+def package_key(pkg):
+    """Store key: PyPI name, or owner/repo for GitHub so names never collide"""
+    if pkg.get('source') == 'GitHub':
+        return "github:" + (pkg.get('full_name') or pkg['name'])
+    return "pypi:" + pkg['name']
+
+
+class PackageTrendStore:
+    """One row per package per day; re-running a day overwrites that day's row"""
+
+    def __init__(self, path=PACKAGE_TRENDS_DB):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def record_snapshot(self, packages, day=None):
+        """Store today's stars/downloads/version for every package"""
+        day = (day or date.today()).isoformat()
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO snapshots (day, package, stars, downloads, version) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (day, package_key(pkg), pkg.get('stars'), pkg.get('downloads'), pkg.get('version'))
+                    for pkg in packages
+                ],
+            )
+
+    def load_series(self, keys, days=TREND_WINDOW_DAYS, end=None):
+        """
+        Return (stars, downloads, releases) as arrays shaped (len(keys), days).
+
+        Missing observations are NaN; ``releases`` is 1 where the version
+        differs from the previous observed day.
+        """
+        end = end or date.today()
+        start = end - timedelta(days=days - 1)
+        row_of = {key: i for i, key in enumerate(keys)}
+
+        stars = np.full((len(keys), days), np.nan)
+        downloads = np.full((len(keys), days), np.nan)
+        releases = np.zeros((len(keys), days))
+        last_version = {}
+
+        rows = self.conn.execute(
+            "SELECT package, day, stars, downloads, version FROM snapshots "
+            "WHERE day BETWEEN ? AND ? ORDER BY package, day",
+            (start.isoformat(), end.isoformat()),
+        )
+        for package, day, star_count, download_count, version in rows:
+            i = row_of.get(package)
+            if i is None:
+                continue
+            j = (date.fromisoformat(day) - start).days
+            if star_count is not None:
+                stars[i, j] = star_count
+            if download_count is not None:
+                downloads[i, j] = download_count
+            previous = last_version.get(package)
+            if previous is not None and version and version != previous:
+                releases[i, j] = 1
+            if version:
+                last_version[package] = version
+
+        return stars, downloads, releases
+
+
+def _masked_slope(y):
+    """Least-squares slope per row over non-NaN points (0 where fewer than 2 points)"""
+    x = np.broadcast_to(np.arange(y.shape[1], dtype=float), y.shape)
+    mask = ~np.isnan(y)
+    n = mask.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+
+    y0 = np.where(mask, y, 0.0)
+    x0 = np.where(mask, x, 0.0)
+    x_mean = x0.sum(axis=1) / safe_n
+    y_mean = y0.sum(axis=1) / safe_n
+
+    dx = np.where(mask, x - x_mean[:, None], 0.0)
+    dy = np.where(mask, y - y_mean[:, None], 0.0)
+    denominator = (dx * dx).sum(axis=1)
+    slope = np.divide((dx * dy).sum(axis=1), denominator, out=np.zeros(len(y)), where=denominator > 0)
+    return np.where(n >= 2, slope, 0.0)
+
+
+def growth_metrics(series):
+    """
+    Velocity and acceleration of log-scaled series, all rows at once.
+
+    Working on log1p values makes the slope a relative growth rate, so a
+    small library gaining 50% ranks above a giant gaining 0.1%.
+    Acceleration is the slope over the recent half minus the older half.
+    """
+    logged = np.log1p(np.clip(series, 0, None))
+    half = series.shape[1] // 2
+    velocity = _masked_slope(logged)
+    acceleration = _masked_slope(logged[:, half:]) - _masked_slope(logged[:, :half])
+    return velocity, acceleration
+
+
+def compute_trending_scores(packages, store, days=TREND_WINDOW_DAYS):
+    """
+    Attach ``velocity``, ``acceleration`` and a 0-100 ``trending_score`` to
+    every package from its stored history, in a single vectorized pass.
+    """
+    if not packages:
+        return packages
+
+    keys = [package_key(pkg) for pkg in packages]
+    stars, downloads, releases = store.load_series(keys, days)
+
+    star_velocity, star_acceleration = growth_metrics(stars)
+    download_velocity, download_acceleration = growth_metrics(downloads)
+
+    # Use whichever signal the package has (PyPI: downloads, GitHub: stars)
+    velocity = np.maximum(star_velocity, download_velocity)
+    acceleration = np.where(
+        np.abs(download_velocity) >= np.abs(star_velocity), download_acceleration, star_acceleration
+    )
+    release_activity = releases.sum(axis=1)
+
+    def normalize(values):
+        top = np.abs(values).max()
+        return values / top if top > 0 else values
+
+    raw = (
+        VELOCITY_WEIGHT * normalize(np.clip(velocity, 0, None))
+        + ACCELERATION_WEIGHT * normalize(np.clip(acceleration, 0, None))
+        + RELEASE_WEIGHT * normalize(release_activity)
+    )
+    scores = 100 * raw
+
+    for i, pkg in enumerate(packages):
+        pkg['velocity'] = round(float(velocity[i]), 6)
+        pkg['acceleration'] = round(float(acceleration[i]), 6)
+        pkg['trending_score'] = round(float(scores[i]), 2)
+    return packages
+
+
+def upsert_trending_scores(packages, database_url=None):
+    """
+    Bulk upsert packages into the PostgreSQL ``packages`` table.
+
+    One INSERT ... ON CONFLICT statement per batch keeps ``trending_score``
+    (and ``idx_packages_trending``) current. Skipped with a warning when
+    DATABASE_URL is unset, psycopg2 is not installed or the database is
+    unreachable, since the JSON output does not depend on it.
+    """
+    database_url = database_url or os.environ.get("DATABASE_URL")
+    if not database_url:
+        print("   ⏭️  DATABASE_URL not set, skipping packages table upsert")
+        return 0
+
+    try:
+        import psycopg2
+        from psycopg2.extras import execute_values
+    except ImportError:
+        print("   ⏭️  psycopg2 not installed, skipping packages table upsert")
+        return 0
+
+    rows = [
+        (
+            package_key(pkg).split(":", 1)[1],
+            (pkg.get('version') or '')[:50],
+            pkg.get('description') or '',
+            pkg.get('source'),
+            (pkg.get('url') or pkg.get('home_page') or '')[:500],
+            pkg.get('stars'),
+            pkg.get('downloads'),
+            pkg.get('trending_score', 0.0),
+        )
+        for pkg in packages
+    ]
+
+    try:
+        conn = psycopg2.connect(database_url)
+    except psycopg2.Error as e:
+        print(f"   ⚠️  Database unreachable, skipping packages table upsert: {e}")
+        return 0
+    try:
+        with conn, conn.cursor() as cur:
+            execute_values(
+                cur,
+                """
+                INSERT INTO packages (name, version, description, source, url, stars, downloads, trending_score)
+                VALUES %s
+                ON CONFLICT (name) DO UPDATE SET
+                    version = EXCLUDED.version,
+                    description = EXCLUDED.description,
+                    source = EXCLUDED.source,
+                    url = EXCLUDED.url,
+                    stars = COALESCE(EXCLUDED.stars, packages.stars),
+                    downloads = COALESCE(EXCLUDED.downloads, packages.downloads),
+                    trending_score = EXCLUDED.trending_score,
+                    updated_at = CURRENT_TIMESTAMP
+                """,
+                rows,
+                page_size=500,
+            )
+    except psycopg2.Error as e:
+        print(f"   ⚠️  Packages table upsert failed: {e}")
+        return 0
+    finally:
+        conn.close()
+
+    print(f"   💾 Upserted {len(rows)} packages into the packages table")
+    return len(rows)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted prompt context for the episode crew
+Shortens each news item / package extractively, drops boilerplate and empty
+fields, and fills the prompt in rank order until the token budget is spent
+"""
+import os
+import re
+import sys
+import json
+from pathlib import Path
+
+# Prompt budgets in tokens for the news and package context blocks
+NEWS_PROMPT_TOKENS = int(os.environ.get("NEWS_PROMPT_TOKENS", "600"))
+PACKAGE_PROMPT_TOKENS = int(os.environ.get("PACKAGE_PROMPT_TOKENS", "300"))
+
+# Most tokens a single item may use, and most items per block
+PROMPT_ITEM_TOKENS = int(os.environ.get("PROMPT_ITEM_TOKENS", "70"))
+PROMPT_MAX_ITEMS = int(os.environ.get("PROMPT_MAX_ITEMS", "10"))
+
+# Feed furniture that carries no news value
+BOILERPLATE = re.compile(
+    r"(read more|continue reading|click here|subscribe|sign up|appeared first on|"
+    r"article url:|comments url:|points:|# comments|the post .+ appeared|"
+    r"^arxiv:\S+ announce type: \S+ abstract:)",
+    re.IGNORECASE,
+)
+ARXIV_PREFIX = re.compile(r"^arXiv:\S+\s+Announce Type:\s*\S+\s+Abstract:\s*", re.IGNORECASE)
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+WORD = re.compile(r"[a-z0-9]+")
+PIECE = re.compile(r"[A-Za-z]+|\d|[^\sA-Za-z\d]")
+
+_encoder = None
+
+
+def count_tokens(text):
+    """
+    Token count for ``text``.
+
+    Uses tiktoken's cl100k_base when it is installed; otherwise a BPE-like
+    estimate (letters in ~4-character pieces, each digit and symbol one
+    token) that tracks gemma/llama tokenizers within ~15% on English news.
+    """
+    global _encoder
+    if not text:
+        return 0
+    if _encoder is None:
+        try:
+            import tiktoken
+
+            _encoder = tiktoken.get_encoding("cl100k_base")
+        except ImportError:
+            _encoder = False
+    if _encoder:
+        return len(_encoder.encode(text))
+    return sum((len(p) + 3) // 4 if p[0].isalpha() else 1 for p in PIECE.findall(text))
+
+
+def clean_fragment(text):
+    """Collapse whitespace, strip feed prefixes and trim a mid-word cut"""
+    text = ARXIV_PREFIX.sub("", " ".join((text or "").split()))
+    if not text or text[-1] in ".!?\"')":
+        return text
+    # Sliced summary: end at the last sentence, or at the last whole word
+    sentence_end = max(text.rfind(". "), text.rfind("! "), text.rfind("? "))
+    if sentence_end >= len(text) // 2:
+        return text[:sentence_end + 1]
+    cut = text.rfind(" ")
+    return (text[:cut] if cut > 0 else text).rstrip(",;:-–— ") + "…"
+
+
+def shorten(text, title="", max_tokens=PROMPT_ITEM_TOKENS):
+    """
+    Extractive summary of ``text`` within ``max_tokens``.
+
+    Sentences are scored by overlap with the title plus a lead bonus,
+    boilerplate and title repeats are dropped, and the best ones are kept
+    in their original order.
+    """
+    text = clean_fragment(text)
+    if not text or max_tokens <= 0:
+        return ""
+    if count_tokens(text) <= max_tokens and not BOILERPLATE.search(text):
+        return text
+
+    title_words = set(WORD.findall(title.lower()))
+    sentences = [s for s in SENTENCE_END.split(text) if s and not BOILERPLATE.search(s)]
+    scored = []
+    for position, sentence in enumerate(sentences):
+        words = set(WORD.findall(sentence.lower()))
+        if not words or words <= title_words:
+            continue
+        overlap = len(words & title_words) / len(words)
+        scored.append((overlap + 1 / (1 + position), position, sentence))
+
+    kept, used = [], 0
+    for _, position, sentence in sorted(scored, key=lambda s: (-s[0], s[1])):
+        tokens = count_tokens(sentence)
+        if used + tokens <= max_tokens:
+            kept.append((position, sentence))
+            used += tokens
+    if not kept and scored:
+        # A single long sentence: keep its opening words
+        words = min(scored, key=lambda s: s[1])[2].split()
+        while words and count_tokens(" ".join(words)) > max_tokens - 1:
+            words = words[: max(1, len(words) * 3 // 4)] if len(words) > 1 else []
+        return " ".join(words) + "…" if words else ""
+    return " ".join(sentence for _, sentence in sorted(kept))
+
+
+def _fill(lines, budget, max_items):
+    """Greedy fill in rank order; items that don't fit fall back to their short form"""
+    included, text_lines, used = [], [], 0
+    for item, full, short in lines:
+        if len(included) >= max_items:
+            break
+        for line in (full, short):
+            tokens = count_tokens(line) + 1  # newline
+            if used + tokens <= budget:
+                text_lines.append(line)
+                included.append(item)
+                used += tokens
+                break
+    return {"text": "\n".join(text_lines), "items": included, "tokens": used, "budget": budget}
+
+
+def compact_news(articles, budget=NEWS_PROMPT_TOKENS, max_items=PROMPT_MAX_ITEMS,
+                 item_tokens=PROMPT_ITEM_TOKENS):
+    """
+    News context block for the researcher: one "- title: summary" line per
+    article (already ranked), within ``budget`` tokens.
+
+    Returns {"text", "items", "tokens", "budget"}; ``items`` are the
+    articles that made it in.
+    """
+    lines = []
+    for article in articles:
+        title = " ".join((article.get("title") or "").split())
+        if not title:
+            continue
+        summary = shorten(article.get("summary") or article.get("description") or "", title, item_tokens)
+        lines.append((article, f"- {title}: {summary}" if summary else f"- {title}", f"- {title}"))
+    return _fill(lines, budget, max_items)
+
+
+def compact_packages(packages, budget=PACKAGE_PROMPT_TOKENS, max_items=PROMPT_MAX_ITEMS,
+                     item_tokens=PROMPT_ITEM_TOKENS // 2):
+    """Package context block: "- name: description" per package, within ``budget`` tokens"""
+    lines = []
+    for package in packages:
+        name = package.get("name")
+        if not name:
+            continue
+        description = shorten(package.get("description") or "", name, item_tokens)
+        lines.append((package, f"- {name}: {description}" if description else f"- {name}", f"- {name}"))
+    return _fill(lines, budget, max_items)
+
+
+if __name__ == "__main__":
+    """Compare the old fixed 10-item prompt blocks with the compacted ones"""
+    data_dir = Path(sys.argv[1]) if len(sys.argv) > 1 else Path("data")
+    news = json.loads((data_dir / "latest_news.json").read_text()).get("articles", [])
+    packages = json.loads((data_dir / "trending_packages.json").read_text()).get("packages", [])
+
+    raw_news = "\n".join(f"- {a['title']}: {a.get('summary', a.get('description', ''))}" for a in news[:10])
+    raw_packages = "\n".join(f"- {p['name']}: {p.get('description', '')}" for p in packages[:10])
+
+    print("=" * 70)
+    print("🗜️  Prompt compaction")
+    print("=" * 70)
+    for label, raw, compacted in (
+        ("news", raw_news, compact_news(news)),
+        ("packages", raw_packages, compact_packages(packages)),
+    ):
+        print(f"   {label:>8}: {count_tokens(raw)} → {compacted['tokens']} tokens "
+              f"({len(compacted['items'])} items, budget {compacted['budget']})")
+    print("-" * 70)
+    print(compact_news(news)["text"])
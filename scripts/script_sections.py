@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Episode script sections
+The 10-minute script as six separately generated sections, each stored with
+a hash of the inputs it was written from, so a section is only regenerated
+when its inputs change or it is explicitly asked for
+
+Usage:
+  python scripts/script_sections.py            # list stored sections
+  python scripts/script_sections.py --assemble # rebuild episode_script.txt/.json from the store
+"""
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime
+from pathlib import Path
+
+SECTIONS_FILE = Path(os.environ.get("SCRIPT_SECTIONS_FILE", "data/script_sections.json"))
+
+# Bump when the prompts change so stored sections are not reused
+SECTION_PROMPT_VERSION = 1
+
+# Inputs: "news" / "package" are the research outputs, "headlines" the
+# compacted news list, "date" the episode date
+SECTIONS = [
+    {
+        "name": "opening",
+        "title": "OPENING",
+        "start": "00:00",
+        "duration": "30 seconds",
+        "brief": "- Welcome message\n- Today's date\n- Brief overview of topics",
+        "inputs": ("date", "news", "package"),
+    },
+    {
+        "name": "news",
+        "title": "NEWS HIGHLIGHTS",
+        "start": "00:30",
+        "duration": "3 minutes",
+        "brief": "- Cover the TOP 3 stories from the news researcher\n- Keep each story to ~1 minute",
+        "inputs": ("news",),
+    },
+    {
+        "name": "deep_dive",
+        "title": "TECH DEEP DIVE",
+        "start": "03:30",
+        "duration": "2.5 minutes",
+        "brief": "- Expand on the most interesting story\n- Add context and implications",
+        "inputs": ("news",),
+    },
+    {
+        "name": "package",
+        "title": "PACKAGE OF THE DAY",
+        "start": "06:00",
+        "duration": "1 minute",
+        "brief": "- Present the featured package\n- Show why developers should care",
+        "inputs": ("package",),
+    },
+    {
+        "name": "quick_takes",
+        "title": "QUICK TAKES",
+        "start": "07:00",
+        "duration": "2 minutes",
+        "brief": "- 3-4 additional brief news items (not the top 3)\n- 30 seconds each",
+        "inputs": ("news", "headlines"),
+    },
+    {
+        "name": "closing",
+        "title": "CLOSING",
+        "start": "09:00",
+        "duration": "1 minute",
+        "brief": "- Recap main points\n- Call to action (subscribe, visit website)\n- Outro",
+        "inputs": ("news", "package"),
+    },
+]
+SECTION_NAMES = [s["name"] for s in SECTIONS]
+
+# One-minute cut for short-form platforms, written from the same research
+SHORT_SECTIONS = [
+    {
+        "name": "short",
+        "title": "SHORT-FORM EPISODE",
+        "start": "00:00",
+        "duration": "60 seconds",
+        "brief": (
+            "- Hook the viewer in the first sentence\n"
+            "- The top story in two or three sentences\n"
+            "- The package of the day in one sentence\n"
+            "- Close with a call to watch the full episode"
+        ),
+        "inputs": ("date", "news", "package"),
+    },
+]
+
+# Variant formats; a variant is a format plus a language ("full", "short:es")
+FORMATS = {"full": SECTIONS, "short": SHORT_SECTIONS}
+DEFAULT_VARIANT = "full"
+BASE_LANGUAGE = "en"
+LANGUAGE_NAMES = {
+    "en": "English", "es": "Spanish", "fr": "French", "de": "German", "it": "Italian",
+    "pt": "Portuguese", "nl": "Dutch", "ru": "Russian", "ja": "Japanese", "ko": "Korean",
+    "zh": "Chinese", "hi": "Hindi", "ar": "Arabic",
+}
+
+INPUT_LABELS = {
+    "date": "Episode date",
+    "news": "Top stories from the news researcher",
+    "package": "Package of the day from the developer tools analyst",
+    "headlines": "Today's other headlines",
+}
+
+
+def input_key(*parts):
+    """Stable hash of a section's or research step's inputs"""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def section_key(section, inputs, model):
+    """Hash of everything that shapes a section: its spec, the inputs it reads and the model"""
+    return input_key(SECTION_PROMPT_VERSION, section, {k: inputs.get(k) for k in section["inputs"]}, model)
+
+
+def section_description(section, inputs, revision=1):
+    """Task description for writing one section"""
+    context = "\n\n".join(
+        f"{INPUT_LABELS[name]}:\n{inputs.get(name) or '(none)'}" for name in section["inputs"]
+    )
+    retry = (
+        f"\nThis is revision {revision}; an earlier draft was rejected, so write a fresh take.\n"
+        if revision > 1 else ""
+    )
+    return f"""Write the {section['title']} section of today's 10-minute TV script.
+        It runs {section['duration']}, starting at [{section['start']}].
+
+        {section['brief']}
+
+        {context}
+        {retry}
+        Guidelines:
+        - Write ONLY this section; the other sections are written separately
+        - Start with the timing marker [{section['start']}]
+        - Write for spoken delivery (natural, conversational)
+        - Use short sentences and paragraphs
+        - Add [PAUSE] for dramatic effect where appropriate
+        - Keep technical terms but explain them simply
+
+        The section should be ready for text-to-speech conversion.
+        """
+
+
+def translation_key(source_text, language, model):
+    """Hash of a translated section's inputs: the written text, the language and the model"""
+    return input_key(SECTION_PROMPT_VERSION, "translate", language, source_text, model)
+
+
+def translation_description(section, source_text, language):
+    """Task description for translating one written section"""
+    return f"""Translate the {section['title']} section of today's TV script into {LANGUAGE_NAMES[language]}.
+
+        {source_text}
+
+        Guidelines:
+        - Keep every timing marker like [{section['start']}] and every [PAUSE] exactly where it is
+        - Keep product, package and company names untranslated
+        - Keep it natural for spoken delivery, not a word-for-word translation
+        - Reply with the translated section only
+        """
+
+
+def variant_id(variant):
+    """"full", "short", "full-es": the name used for stored entries and output folders"""
+    return variant["format"] if variant["language"] == BASE_LANGUAGE else f"{variant['format']}-{variant['language']}"
+
+
+def entry_id(variant, name):
+    """Store key for one section of one variant (the default variant keeps bare names)"""
+    vid = variant_id(variant)
+    return name if vid == DEFAULT_VARIANT else f"{vid}/{name}"
+
+
+def parse_variants(value):
+    """Validate a comma-separated --variants value ("full,short,full:es")"""
+    variants = []
+    for item in (v.strip().lower() for v in value.split(",")):
+        if not item:
+            continue
+        fmt, _, language = item.partition(":")
+        language = language or BASE_LANGUAGE
+        if fmt not in FORMATS:
+            raise argparse.ArgumentTypeError(f"unknown format {fmt!r}; choose from {', '.join(FORMATS)}")
+        if language not in LANGUAGE_NAMES:
+            raise argparse.ArgumentTypeError(
+                f"unknown language {language!r}; choose from {', '.join(LANGUAGE_NAMES)}"
+            )
+        variant = {"format": fmt, "language": language}
+        if variant not in variants:
+            variants.append(variant)
+    if not variants:
+        raise argparse.ArgumentTypeError("no variants given")
+    return variants
+
+
+class SectionStore:
+    """JSON file of research outputs and sections with the input keys they were made from"""
+
+    def __init__(self, path=SECTIONS_FILE):
+        self.path = Path(path)
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.research = data.get("research", {})
+        self.sections = data.get("sections", {})
+
+    def get_research(self, name, key):
+        entry = self.research.get(name)
+        return entry["text"] if entry and entry["key"] == key else None
+
+    def put_research(self, name, key, text):
+        self.research[name] = {"key": key, "text": text, "generated_at": datetime.now().isoformat()}
+
+    def get_section(self, name, key):
+        entry = self.sections.get(name)
+        return entry["text"] if entry and entry["key"] == key else None
+
+    def revision(self, name, key):
+        """Next revision number for a forced regeneration of unchanged inputs"""
+        entry = self.sections.get(name)
+        return entry.get("revision", 1) + 1 if entry and entry["key"] == key else 1
+
+    def put_section(self, name, key, text, revision=1, model=None):
+        self.sections[name] = {
+            "key": key, "text": text, "revision": revision, "model": model,
+            "generated_at": datetime.now().isoformat(),
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            json.dump({"research": self.research, "sections": self.sections}, f, indent=2)
+        tmp.replace(self.path)
+
+    def variant_texts(self, variant):
+        """{section name: text} of the stored sections of ``variant``"""
+        texts = {}
+        for section in FORMATS[variant["format"]]:
+            entry = self.sections.get(entry_id(variant, section["name"]))
+            if entry:
+                texts[section["name"]] = entry["text"]
+        return texts
+
+    def episode_script(self, date, model=None, variant=None):
+        """The stored sections of ``variant`` (default: the full English script) as an EpisodeScript"""
+        from episode_script import EpisodeScript
+
+        variant = variant or parse_variants(DEFAULT_VARIANT)[0]
+        return EpisodeScript.from_sections(
+            FORMATS[variant["format"]], self.variant_texts(variant), date, model, language=variant["language"]
+        )
+
+    def assemble(self, variant=None):
+        """Script text in section order (sections not generated yet are skipped)"""
+        variant = variant or parse_variants(DEFAULT_VARIANT)[0]
+        texts = self.variant_texts(variant)
+        return "\n\n".join(
+            texts[s["name"]].strip() for s in FORMATS[variant["format"]] if s["name"] in texts
+        )
+
+
+def parse_section_names(value):
+    """Validate a comma-separated --sections value"""
+    known = [s["name"] for sections in FORMATS.values() for s in sections]
+    names = [n.strip().lower().replace("-", "_") for n in value.split(",") if n.strip()]
+    unknown = [n for n in names if n not in known]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown section(s) {', '.join(unknown)}; choose from {', '.join(known)}"
+        )
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inspect stored script sections")
+    parser.add_argument("--assemble", action="store_true", help="Write output/episode_script.txt and .json from the store")
+    args = parser.parse_args()
+
+    store = SectionStore()
+    if args.assemble:
+        from episode_script import EPISODE_SCRIPT_FILE, EPISODE_SCRIPT_TEXT
+
+        script = store.assemble()
+        if not script:
+            print(f"❌ No sections stored in {store.path}")
+            sys.exit(1)
+        # Where the audio and video stages read the script, not next to the store
+        script_file = EPISODE_SCRIPT_TEXT
+        script_file.parent.mkdir(parents=True, exist_ok=True)
+        script_file.write_text(script)
+        print(f"💾 Script assembled from {len(store.sections)} sections: {script_file}")
+        try:
+            structured = store.episode_script(datetime.now().strftime("%Y-%m-%d"))
+            print(f"💾 Structured script: {structured.save(EPISODE_SCRIPT_FILE)}")
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        sys.exit(0)
+
+    print(f"📑 Sections in {store.path}")
+    for name, entry in store.sections.items():
+        print(f"   {name:<20} rev {entry['revision']}, {len(entry['text'])} chars, {entry['generated_at'][:19]}")
+    missing = [s["name"] for s in SECTIONS if s["name"] not in store.sections]
+    if missing:
+        print(f"   Not generated: {', '.join(missing)}")
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Content-addressed TTS audio cache
+Synthesized chunks are stored on disk under a hash of the provider, voice,
+model and normalized text, so recurring lines (openings, closings, calls to
+action) and reruns of the audio stage cost no API calls
+
+Usage:
+  python scripts/tts_cache.py           # show cache size
+  python scripts/tts_cache.py --clear   # empty the cache
+"""
+import os
+import re
+import sys
+import json
+import shutil
+import hashlib
+import threading
+import unicodedata
+from pathlib import Path
+
+# Cache location and size bound (least recently used chunks are evicted first)
+TTS_CACHE_DIR = Path(os.environ.get("TTS_CACHE_DIR", "data/tts_cache"))
+TTS_CACHE_MAX_BYTES = int(float(os.environ.get("TTS_CACHE_MAX_MB", "500")) * 1024 * 1024)
+
+
+def tts_cache_enabled():
+    """False when TTS_CACHE=off"""
+    return os.environ.get("TTS_CACHE", "on").lower() not in ("0", "off", "false", "no")
+
+
+def normalize_text(text):
+    """Unicode- and whitespace-normalized text; differences here don't change the audio"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+def tts_key(params, text):
+    """SHA-256 over the synthesis parameters (provider, voice, model, ...) and the normalized text"""
+    payload = {"params": params, "text": normalize_text(text)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """
+    One audio file per chunk, named by its key.
+
+    The file mtime doubles as the LRU access time for size eviction; audio
+    does not go stale, so there is no TTL.
+    """
+
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES, suffix=".mp3"):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.saved_chars = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.cache_dir / key[:2] / f"{key}{self.suffix}"
+
+    def get(self, key, dest, chars=0):
+        """Copy the cached audio for ``key`` to ``dest``; False on a miss"""
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, dest)
+            os.utime(path)
+        except OSError:
+            self.record(hit=False)
+            return False
+        self.record(hit=True, chars=chars)
+        return True
+
+    def put(self, key, source):
+        """Store the audio file ``source`` under ``key``, then enforce the size bound"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def _files(self):
+        return list(self.cache_dir.glob(f"*/*{self.suffix}")) if self.cache_dir.exists() else []
+
+    def _evict(self):
+        """Drop least-recently-used entries until under max_bytes"""
+        with self._lock:
+            entries = []
+            total = 0
+            for path in self._files():
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+    def record(self, hit, chars=0):
+        with self._lock:
+            if hit:
+                self.hits += 1
+                self.saved_chars += chars
+            else:
+                self.misses += 1
+
+    def stats(self):
+        """Hit/miss counters, characters not sent to the provider, entry count and size on disk"""
+        size = 0
+        files = self._files()
+        for path in files:
+            try:
+                size += path.stat().st_size
+            except OSError:
+                pass
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "saved_chars": self.saved_chars,
+            "entries": len(files),
+            "bytes": size,
+        }
+
+    def clear(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    cache = TTSCache()
+    if "--clear" in sys.argv[1:]:
+        cache.clear()
+        print(f"🗑️  Cleared {cache.cache_dir}")
+        sys.exit(0)
+    stats = cache.stats()
+    print(f"💾 TTS cache {cache.cache_dir}: {stats['entries']} chunks, "
+          f"{stats['bytes'] / 1024 / 1024:.1f} of {cache.max_bytes / 1024 / 1024:.0f} MB")
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Chunked, parallel text-to-speech
+Splits the script into paragraph chunks under the provider's input limit,
+synthesizes them on a bounded worker pool with per-chunk retries, and stitches
+the MP3 frames back together in order without re-encoding; chunks already in
+the TTS cache (tts_cache.py) are not sent to the provider
+"""
+import os
+import re
+import time
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from tts_cache import tts_key
+
+# Largest chunk in characters (capped by the provider's input limit); chunks
+# are paragraphs, so this only splits unusually long ones
+TTS_CHUNK_CHARS = int(os.environ.get("TTS_CHUNK_CHARS", "1500"))
+
+# Concurrent synthesis requests and retries per chunk
+TTS_WORKERS = int(os.environ.get("TTS_WORKERS", "4"))
+TTS_RETRIES = int(os.environ.get("TTS_RETRIES", "2"))
+TTS_RETRY_DELAY = 1.0
+
+SENTENCE_END = re.compile(r"(?<=[.!?…])\s+")
+
+# MPEG audio Layer III frame header tables (kbit/s, Hz)
+MP3_BITRATES = {
+    1: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+
+def _split_long(text, max_chars):
+    """Pieces of one paragraph under ``max_chars``: by sentence, then by word"""
+    pieces = []
+    for sentence in SENTENCE_END.split(text):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars + 1)
+            cut = cut if cut > 0 else max_chars
+            pieces.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            pieces.append(sentence)
+    return pieces
+
+
+def split_text(paragraphs, max_chars=TTS_CHUNK_CHARS):
+    """
+    One chunk per paragraph; a paragraph over ``max_chars`` is packed into
+    several at sentence ends (mid-sentence only for a sentence longer than
+    a chunk).
+
+    Paragraphs are never merged, so a recurring line (the standard opening,
+    the call to action) keeps the same chunk, and the same cache key, from
+    one episode to the next whatever the paragraphs around it say.
+    """
+    chunks = []
+    for paragraph in (p.strip() for p in paragraphs):
+        if not paragraph:
+            continue
+        if len(paragraph) <= max_chars:
+            chunks.append(paragraph)
+            continue
+        current = ""
+        for piece in _split_long(paragraph, max_chars):
+            if current and len(current) + 1 + len(piece) <= max_chars:
+                current += " " + piece
+            else:
+                if current:
+                    chunks.append(current)
+                current = piece
+        if current:
+            chunks.append(current)
+    return chunks
+
+
+def _frame_length(header):
+    """Byte length of the MP3 frame starting with ``header``, or None if it is not one"""
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version, layer = (header[1] >> 3) & 3, (header[1] >> 1) & 3
+    bitrate_index, rate_index = header[2] >> 4, (header[2] >> 2) & 3
+    if version == 1 or layer != 1 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    bitrate = MP3_BITRATES[1 if version == 3 else 2][bitrate_index] * 1000
+    sample_rate = MP3_SAMPLE_RATES[version][rate_index]
+    padding = (header[2] >> 1) & 1
+    return (144 if version == 3 else 72) * bitrate // sample_rate + padding
+
+
+def mp3_frames(data):
+    """
+    The audio frames of an MP3 file: ID3 tags and the Xing/Info/VBRI header
+    frame are dropped, so files from the same encoder concatenate cleanly.
+    """
+    if data[:3] == b"ID3" and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        data = data[10 + size + (10 if data[5] & 0x10 else 0):]
+    if data[-128:-125] == b"TAG":
+        data = data[:-128]
+    length = _frame_length(data[:4])
+    if length:
+        mono = data[3] >> 6 == 3
+        side_info = (17 if mono else 32) if (data[1] >> 3) & 3 == 3 else (9 if mono else 17)
+        if data[4 + side_info:8 + side_info] in (b"Xing", b"Info") or data[36:40] == b"VBRI":
+            data = data[length:]
+    return data
+
+
+def silence_frames(frames, seconds):
+    """
+    ``seconds`` of silence as MP3 frames in the format of ``frames``: a frame
+    with zeroed side info and main data decodes to silence, so pauses are
+    added without re-encoding anything.
+    """
+    if seconds <= 0 or _frame_length(frames[:4]) is None:
+        return b""
+    # Same version/layer/rate/channels; no CRC, no padding
+    header = bytes([frames[0], frames[1] | 0x01, frames[2] & ~0x02, frames[3]])
+    version = (header[1] >> 3) & 3
+    sample_rate = MP3_SAMPLE_RATES[version][(header[2] >> 2) & 3]
+    frame_seconds = (1152 if version == 3 else 576) / sample_rate
+    frame = header + bytes(_frame_length(header) - 4)
+    return frame * round(seconds / frame_seconds)
+
+
+def stitch_mp3(parts, output_file, pauses=None):
+    """
+    Concatenate MP3 files frame by frame (no decode/re-encode, so no
+    generation loss), with ``pauses[i]`` seconds of silence after part i.
+    """
+    output_file = Path(output_file)
+    pauses = pauses or [0.0] * len(parts)
+    tmp = output_file.with_suffix(".tmp")
+    with open(tmp, "wb") as out:
+        for part, pause in zip(parts, pauses):
+            frames = mp3_frames(Path(part).read_bytes())
+            out.write(frames)
+            out.write(silence_frames(frames, pause))
+    tmp.replace(output_file)
+    return output_file
+
+
+def _synthesize_chunk(synth, text, path, retries):
+    """Run ``synth(text, path)`` with retries; returns the attempts it took"""
+    for attempt in range(retries + 1):
+        try:
+            synth(text, str(path))
+            if path.exists() and path.stat().st_size > 0:
+                return attempt + 1
+            raise RuntimeError("provider returned no audio")
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(TTS_RETRY_DELAY * 2 ** attempt)
+
+
+def split_sections(sections, max_chars=TTS_CHUNK_CHARS):
+    """
+    (chunk, pause after it in seconds) for a script given as sections of
+    paragraphs. A paragraph is its text or (text, pause seconds); its pause
+    follows its last chunk, where the subtitles put it too.
+    """
+    chunks = []
+    for paragraphs in sections:
+        for paragraph in paragraphs:
+            text, pause = (paragraph, 0.0) if isinstance(paragraph, str) else paragraph
+            pieces = split_text([text], max_chars)
+            chunks += [(piece, pause if i == len(pieces) - 1 else 0.0) for i, piece in enumerate(pieces)]
+    return chunks
+
+
+def synthesize(sections, synth, output_file, max_chars=TTS_CHUNK_CHARS, workers=TTS_WORKERS,
+               retries=TTS_RETRIES, cache=None, params=None):
+    """
+    Speak ``sections`` (lists of paragraphs, see split_sections) into
+    ``output_file`` with ``synth(text, path)``, one chunk per call,
+    ``workers`` calls at a time; paragraph pauses become silence.
+
+    With a ``cache`` (tts_cache.TTSCache), chunks already synthesized with the
+    same ``params`` (provider, voice, model, ...) are reused and new ones are
+    stored. A chunk that still fails after ``retries`` retries aborts the run
+    with a RuntimeError naming it; the chunks that succeeded stay cached.
+
+    Returns {"chunks", "chars", "cached", "pause_s", "workers", "retries", "seconds"}.
+    """
+    split = split_sections(sections, max_chars)
+    if not split:
+        raise ValueError("nothing to synthesize")
+    chunks = [chunk for chunk, _ in split]
+    pauses = [pause for _, pause in split]
+    output_file = Path(output_file)
+    work_dir = Path(tempfile.mkdtemp(prefix=".tts-", dir=output_file.parent))
+    paths = [work_dir / f"{i:04d}.mp3" for i in range(len(chunks))]
+
+    start = time.perf_counter()
+    keys = [tts_key(params or {}, text) for text in chunks] if cache else [None] * len(chunks)
+    todo = [i for i in range(len(chunks)) if not (cache and cache.get(keys[i], paths[i], len(chunks[i])))]
+    workers = max(1, min(workers, len(todo)))
+    cached = len(chunks) - len(todo)
+    reused = f", {cached} from cache" if cached else ""
+    parallel = f", {workers} in parallel" if todo else ""
+    print(f"   🧩 {len(chunks)} chunks of ≤{max_chars} chars{reused}{parallel}")
+
+    def run(index):
+        attempts = _synthesize_chunk(synth, chunks[index], paths[index], retries)
+        if cache:
+            cache.put(keys[index], paths[index])
+        return attempts
+
+    retried = 0
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts")
+    try:
+        futures = {executor.submit(run, i): i for i in todo}
+        for done, future in enumerate(as_completed(futures), 1):
+            index = futures[future]
+            try:
+                attempts = future.result()
+            except Exception as e:
+                raise RuntimeError(f"chunk {index + 1}/{len(chunks)} failed after {retries + 1} attempts: {e}") from e
+            retried += attempts - 1
+            note = f", {attempts} attempts" if attempts > 1 else ""
+            print(f"   🔊 {done}/{len(todo)} chunks ({len(chunks[index])} chars{note})")
+        stitch_mp3(paths, output_file, pauses)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    seconds = time.perf_counter() - start
+    return {
+        "chunks": len(chunks),
+        "chars": sum(map(len, chunks)),
+        "cached": cached,
+        "pause_s": round(sum(pauses), 2),
+        "workers": workers,
+        "retries": retried,
+        "seconds": round(seconds, 2),
+    }